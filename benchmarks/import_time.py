@@ -0,0 +1,68 @@
+# benchmarks/import_time.py
+"""Measure cold-start import time of the pipeline entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+its cumulative import time is compared with a target; the heaviest
+dependencies are listed so regressions are easy to attribute.
+
+    python benchmarks/import_time.py [--top 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cold-start targets in milliseconds (cumulative import time of the module)
+TARGETS_MS = {
+    "src.prefect_flows": 50,
+    "src.triggers.folder_watcher": 100,
+    "src.local_web_app.upload_app": 800,
+    "run_pipeline": 900,
+}
+
+# Heavy dependencies that entry points should only load on first use
+HEAVY_MODULES = ["prefect", "pandas", "pyarrow", "great_expectations"]
+
+
+def import_profile(module: str = None) -> dict:
+    """Cumulative import time (us) for every module loaded while importing ``module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        cwd=project_root, capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        profile[name] = int(cumulative)
+    return profile
+
+
+def run(top: int) -> bool:
+    # Modules the bare interpreter loads at startup are not attributed to entry points
+    startup_modules = set(import_profile())
+    all_within_target = True
+    for module, target_ms in TARGETS_MS.items():
+        profile = import_profile(module)
+        total_ms = profile[module] / 1000
+        within_target = total_ms <= target_ms
+        all_within_target &= within_target
+        loaded_heavy = [name for name in HEAVY_MODULES if name in profile]
+
+        print(f"{module:<32}{total_ms:>9.1f} ms  target {target_ms} ms  {'OK' if within_target else 'OVER'}")
+        print(f"    heavy modules loaded: {', '.join(loaded_heavy) or 'none'}")
+        top_level = sorted(((ms, name) for name, ms in profile.items()
+                            if "." not in name and name != module and name not in startup_modules),
+                           reverse=True)[:top]
+        for cumulative, name in top_level:
+            print(f"    {name:<28}{cumulative / 1000:>9.1f} ms")
+    return all_within_target
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=5, help="heaviest top-level imports to list")
+    sys.exit(0 if run(parser.parse_args().top) else 1)
@@ -0,0 +1,83 @@
+# benchmarks/parquet_skip_ratio.py
+"""Compare how much data typical predictive-maintenance queries can skip
+with default Parquet output versus the tuned writer used by save_data.
+
+    python benchmarks/parquet_skip_ratio.py --rows 2000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Add the project root to Python path
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(project_root)
+
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.parquet_dataset import write_table
+
+QUERIES = {
+    "failures": [("fail", "==", 1)],
+    "overheating": [("Temperature", ">", 45)],
+    "failures while warm": [("fail", "==", 1), ("Temperature", ">=", 30), ("Temperature", "<=", 40)],
+    "cold band": [("Temperature", ">=", 0), ("Temperature", "<", 5)],
+}
+
+
+def synthetic_sensor_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Sensor-shaped data with a ~5% failure rate, in arrival (unsorted) order."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "footfall": rng.integers(0, 1000, rows),
+        "tempMode": rng.integers(0, 8, rows),
+        "AQ": rng.integers(1, 8, rows),
+        "USS": rng.integers(1, 8, rows),
+        "CS": rng.integers(1, 8, rows),
+        "VOC": rng.integers(0, 7, rows),
+        "RP": rng.integers(0, 100, rows),
+        "IP": rng.integers(1, 8, rows),
+        "Temperature": rng.normal(25, 10, rows).round(1).clip(0, 50),
+        "fail": (rng.random(rows) < 0.05).astype("int64"),
+    })
+
+
+def row_groups_read(path: str, filters) -> tuple:
+    """(row groups that survive statistics pruning, total row groups)."""
+    fragment = next(ds.dataset(path, format="parquet").get_fragments())
+    total = fragment.metadata.num_row_groups
+    kept = len(fragment.split_by_row_group(filter=pq.filters_to_expression(filters)))
+    return kept, total
+
+
+def run(rows: int):
+    df = synthetic_sensor_frame(rows)
+    tuned_config = load_config()["parquet"]
+    # Same row group size for both files so only sorting/statistics differ
+    default_config = {"row_group_size": tuned_config["row_group_size"]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            "default": write_table(df, os.path.join(tmp, "default.parquet"), default_config),
+            "tuned": write_table(df, os.path.join(tmp, "tuned.parquet"), tuned_config),
+        }
+
+        print(f"{rows:,} rows, row groups of {tuned_config['row_group_size']:,} rows")
+        print(f"{'query':<22}{'layout':<10}{'row groups read':>17}{'skip ratio':>12}{'scan ms':>10}")
+        for name, filters in QUERIES.items():
+            for layout, path in paths.items():
+                kept, total = row_groups_read(path, filters)
+                started = time.perf_counter()
+                ds.dataset(path, format="parquet").to_table(filter=pq.filters_to_expression(filters))
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(f"{name:<22}{layout:<10}{f'{kept}/{total}':>17}{1 - kept / total:>12.1%}{elapsed_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    run(parser.parse_args().rows)
@@ -2,8 +2,7 @@
 import os
 import time
 import uvicorn
-from watchdog.observers import Observer
-from src.triggers.folder_watcher import NewFileHandler
+from src.triggers.folder_watcher import NewFileHandler, watch_landing
 from src.local_web_app.upload_app import app
 
 def run_simple_pipeline():
@@ -20,10 +19,7 @@ def run_simple_pipeline():
     # Start folder watcher
     print("👀 Starting folder watcher...")
     watch_path = "./data/landing"
-    event_handler = NewFileHandler()
-    observer = Observer()
-    observer.schedule(event_handler, watch_path, recursive=False)
-    observer.start()
+    observer = watch_landing(NewFileHandler(), watch_path)
     print(f"✅ Folder watcher started on: {os.path.abspath(watch_path)}")
     
     print("\n🔧 Starting upload app...")
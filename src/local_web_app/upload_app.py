@@ -1,8 +1,14 @@
 import sys
 import os
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Body, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 import shutil
+import threading
+import uuid
 import uvicorn
 
 # Add the project root to Python path
@@ -10,6 +16,18 @@ project_root = os.path.join(os.path.dirname(__file__), '..', '..')
 if project_root not in sys.path:
     sys.path.append(project_root)
 
+from src.prefect_flows.utils.batch_upload import BatchLimitExceeded, is_archive, stage_batch, land_batch
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.file_formats import SUPPORTED_EXTENSIONS, is_supported
+from src.prefect_flows.utils.job_store import JOB_STATUSES, FINAL_STATUSES, get_job_store, job_store_config
+from src.prefect_flows.utils.metadata_probe import probe_file, find_rejection_reason
+from src.prefect_flows.utils.report_renderer import REPORTS_DIR, load_report, render_html_report
+from src.prefect_flows.utils.report_sink import get_report_sink
+from src.prefect_flows.utils.sites import LANDING_DIR, DEFAULT_SITE, BATCHES_DIR, is_valid_site, site_config, site_dir
+from src.triggers.scheduler import (
+    PRIORITIES, DEFAULT_PRIORITY, scheduler_config, load_status, find_job, estimate_start, save_priority_hint
+)
+
 #try:
  #   from src.prefect_flows.flows.data_ingestion_flow import data_ingestion_flow
  #   print("Successfully imported data_ingestion_flow")
@@ -24,6 +42,38 @@ app = FastAPI(title="Sensor Data Upload API", debug=True)
 # Ensure raw directory exists
 os.makedirs("./data/raw", exist_ok=True)
 
+# Uploads are written here first and only moved into landing once they pass the probe
+STAGING_DIR = "./data/staging"
+os.makedirs(STAGING_DIR, exist_ok=True)
+
+config = load_config()
+scheduler_settings = scheduler_config(config)
+job_store = get_job_store(config)
+
+# Records posted to /ingest skip the file-drop path and are flushed in micro-batches.
+# The batcher pulls in pandas and the validation stack, so it is created on first use.
+micro_batcher = None
+_micro_batcher_lock = threading.Lock()
+
+def get_micro_batcher():
+    global micro_batcher
+    with _micro_batcher_lock:
+        if micro_batcher is None:
+            from src.triggers.micro_batch import MicroBatcher
+            micro_batcher = MicroBatcher(**config["micro_batch"], config=site_config(config, DEFAULT_SITE))
+            micro_batcher.start()
+    return micro_batcher
+
+@app.on_event("startup")
+async def configure_storage_io():
+    from src.prefect_flows.utils.storage import configure_io
+    configure_io(config)
+
+@app.on_event("shutdown")
+async def stop_micro_batcher():
+    if micro_batcher is not None:
+        micro_batcher.stop()
+
 @app.get("/", response_class=HTMLResponse)
 async def upload_form():
     """Simple HTML form for file upload."""
@@ -43,29 +93,95 @@ async def upload_form():
             </style>
         </head>
         <body>
-            <h2>📤 Upload Sensor Data CSV</h2>
+            <h2>📤 Upload Sensor Data (CSV, Parquet or Arrow)</h2>
             <form action="/upload" method="post" enctype="multipart/form-data">
-                <input type="file" name="file" accept=".csv" required>
+                <input type="file" name="file" accept=".csv,.parquet,.arrow,.feather,.ipc" required>
+                <br>
+                <input type="text" name="site" placeholder="Site (optional)">
+                <br>
+                <select name="priority">
+                    <option value="">Priority: by file size</option>
+                    <option value="high">High</option>
+                    <option value="normal">Normal</option>
+                    <option value="low">Low</option>
+                </select>
                 <br>
                 <input type="submit" value="Upload and Process">
             </form>
+            <h2>📦 Bulk Upload (data files or zip/tar.gz archives)</h2>
+            <form action="/upload/batch" method="post" enctype="multipart/form-data">
+                <input type="file" name="files" accept=".csv,.parquet,.arrow,.feather,.ipc,.zip,.tar.gz,.tgz" multiple required>
+                <br>
+                <input type="text" name="site" placeholder="Site (optional)">
+                <br>
+                <input type="submit" value="Upload Batch">
+            </form>
             <p>📁 Files will be processed and saved in the cleansed directory</p>
         </body>
     </html>
     """
 
+def check_site_and_priority(site: Optional[str], priority: Optional[str]) -> tuple:
+    """Site and priority form fields with their defaults applied; 400 if invalid."""
+    site = site or DEFAULT_SITE
+    if not is_valid_site(site):
+        raise HTTPException(status_code=400, detail="Site names may only contain letters, digits, '-' and '_'")
+    priority = priority or None
+    if priority is not None and priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"Priority must be one of {list(PRIORITIES)}")
+    return site, priority
+
+def probe_upload(file_path: str, schema_registry: dict = None) -> tuple:
+    """Probe of an uploaded file and why it is rejected, if it is; unreadable files are rejected too."""
+    try:
+        probe = probe_file(file_path)
+    except ValueError as e:
+        # Undecodable CSV header, or a Parquet/Arrow file without a valid footer
+        return None, f"Unreadable file: {e}"
+    return probe, find_rejection_reason(probe, schema_registry)
+
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
-    """Handle file upload and trigger processing."""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+def upload_file(file: UploadFile = File(...), site: Optional[str] = Form(None),
+                priority: Optional[str] = Form(None)):
+    """Handle file upload and trigger processing.
+    
+    ``site`` lands the file in that site's landing sub-folder, so its rule set applies.
+    ``priority`` ("high", "normal" or "low") overrides size-based scheduling.
+    The response includes the job id, to follow at ``/jobs/{id}`` or
+    ``/jobs/events``, and the expected queue position and start time.
+    Declared sync: staging, probing and the job store all block, so they
+    run on the threadpool instead of the event loop.
+    """
+    if is_archive(file.filename):
+        raise HTTPException(status_code=400, detail="Upload archives to /upload/batch")
+    if not is_supported(file.filename):
+        raise HTTPException(status_code=400, detail=f"Only {', '.join(SUPPORTED_EXTENSIONS)} files are allowed")
+    site, priority = check_site_and_priority(site, priority)
     
+    staging_location = os.path.join(STAGING_DIR, file.filename)
     try:
-        # Save file to raw directory
-        file_location = f"./data/landing/{file.filename}"
-        with open(file_location, "wb") as buffer:
+        # Stage the upload outside the watched folder
+        with open(staging_location, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         
+        # Probe header and row count; reject before the watcher ever sees the file
+        probe, rejection = probe_upload(staging_location, site_config(config, site).get("schema_registry"))
+        if rejection:
+            os.remove(staging_location)
+            raise HTTPException(status_code=400, detail=f"File rejected: {rejection}")
+        
+        # Move the complete file into the landing zone in one step
+        file_location = os.path.join(site_dir(LANDING_DIR, site), file.filename)
+        os.makedirs(os.path.dirname(file_location), exist_ok=True)
+        if priority is not None:
+            # Recorded before the file lands so the watcher's pool sees it with the file
+            save_priority_hint(file_location, priority, scheduler_settings["priority_hints_path"])
+        queue = estimate_start(load_status(scheduler_settings["status_path"]),
+                               probe["file_size_bytes"], priority or DEFAULT_PRIORITY)
+        # Created before the move so the watcher picks this job up instead of opening a new one
+        job_id = job_store.create(file_location, site=site, priority=priority)
+        shutil.move(staging_location, file_location)
+        
         print(f"File saved: {file_location}")
         
         # Trigger processing
@@ -73,18 +189,214 @@ async def upload_file(file: UploadFile = File(...)):
         #result = data_ingestion_flow(file_location)
         
         response_data = {
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}",
             "filename": file.filename,
+            "site": site,
             "saved_location": file_location,
-            "message": "File uploaded successfully to landing zone. Watchdog will trigger processing automatically."
+            "row_count": probe["row_count"],
+            "columns": probe["columns"],
+            "priority": priority or "by size",
+            "queue_position": queue["position"],
+            "estimated_start": queue["estimated_start"],
+            "message": "File uploaded successfully to landing zone. Watchdog will trigger processing automatically; "
+                       f"follow it at /jobs/{job_id}."
         }
         
         return JSONResponse(content=response_data)
         
+    except HTTPException:
+        raise
     except Exception as e:
         error_msg = f"Error processing file: {str(e)}"
         print(f"{error_msg}")
         raise HTTPException(status_code=500, detail=error_msg)
 
+@app.post("/upload/batch")
+def upload_batch(files: List[UploadFile] = File(...), site: Optional[str] = Form(None),
+                 priority: Optional[str] = Form(None)):
+    """Upload many CSV files, or zip/tar.gz archives of them, as one batch job.
+    
+    Archives are extracted member by member straight into staging. Every
+    file is probed on its own: rejected files are listed in the response
+    and the rest land together with a batch manifest, so the watcher
+    queues them all from a single event. Progress is tracked by the batch
+    job (``/jobs/{batch_id}``) and per file (``/jobs?batch_id=``).
+    Declared sync so extraction runs in the threadpool, not on the event loop.
+    """
+    site, priority = check_site_and_priority(site, priority)
+    schema_registry = site_config(config, site).get("schema_registry")
+    batch_id = uuid.uuid4().hex
+    staging_dir = os.path.join(STAGING_DIR, batch_id)
+    
+    try:
+        staged, skipped = stage_batch([(upload.filename, upload.file) for upload in files], staging_dir, config)
+        accepted = []
+        for path in staged:
+            probe, rejection = probe_upload(path, schema_registry)
+            if rejection:
+                os.remove(path)
+                skipped.append((os.path.basename(path), f"File rejected: {rejection}"))
+            else:
+                accepted.append((os.path.basename(path), probe))
+        rejected = [{"file": name, "reason": reason} for name, reason in skipped]
+        if not accepted:
+            raise HTTPException(status_code=400, detail={"message": "No files accepted", "rejected": rejected})
+        
+        # Jobs are recorded before the files land so the watcher picks them up
+        batches_dir = os.path.join(site_dir(LANDING_DIR, site), BATCHES_DIR)
+        job_store.create(os.path.join(batches_dir, f"{batch_id}.json"), job_id=batch_id, site=site,
+                         mode="batch", priority=priority)
+        entries = [{
+            "file_name": name,
+            "job_id": job_store.create(os.path.join(batches_dir, batch_id, name), site=site,
+                                       priority=priority, batch_id=batch_id),
+            "row_count": probe["row_count"]
+        } for name, probe in accepted]
+        land_batch(staging_dir, site_dir(LANDING_DIR, site),
+                   {"batch_id": batch_id, "site": site, "priority": priority, "files": entries})
+        print(f"Batch landed: {len(entries)} files ({batch_id})")
+        
+        return {
+            "batch_id": batch_id,
+            "status_url": f"/jobs/{batch_id}",
+            "site": site,
+            "priority": priority or "by size",
+            "files": entries,
+            "rejected": rejected,
+            "message": f"{len(entries)} files uploaded as one batch; follow it at /jobs/{batch_id}."
+        }
+    
+    except BatchLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_msg = f"Error processing batch: {str(e)}"
+        print(f"{error_msg}")
+        raise HTTPException(status_code=500, detail=error_msg)
+    finally:
+        # Gone once landed; otherwise drop whatever was staged
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+@app.post("/ingest")
+def ingest_records(records: List[dict] = Body(...)):
+    """Buffer sensor records for near-real-time micro-batch ingestion.
+    
+    Declared sync so a size-triggered flush runs in the threadpool, not on the event loop.
+    """
+    if not records:
+        raise HTTPException(status_code=400, detail="No records supplied")
+    buffered = get_micro_batcher().submit(records)
+    return {"accepted": len(records), "buffered_records": buffered}
+
+@app.get("/ingest/metrics")
+def ingest_metrics():
+    """Micro-batch counters and achieved end-to-end latency."""
+    return get_micro_batcher().metrics()
+
+@app.get("/queue")
+def queue_status():
+    """Running and queued ingestion jobs as last published by the worker pool."""
+    status = load_status(scheduler_settings["status_path"])
+    if status is None:
+        return {"running": [], "queued": [], "message": "No worker pool is publishing queue status"}
+    return status
+
+@app.get("/queue/{file_name}")
+def file_queue_status(file_name: str, site: Optional[str] = None):
+    """Queue position and estimated start time (or running state) of an uploaded file."""
+    site = site or DEFAULT_SITE
+    if not is_valid_site(site):
+        raise HTTPException(status_code=400, detail="Invalid site name")
+    file_location = os.path.join(site_dir(LANDING_DIR, site), os.path.basename(file_name))
+    job = find_job(load_status(scheduler_settings["status_path"]), file_location)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"{file_name} is not queued or running")
+    return job
+
+@app.get("/jobs")
+def list_jobs(status: Optional[str] = None, site: Optional[str] = None, batch_id: Optional[str] = None,
+              limit: int = 100):
+    """Most recently updated jobs, optionally filtered by status, site and batch."""
+    if status is not None and status not in JOB_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Status must be one of {list(JOB_STATUSES)}")
+    return {"jobs": job_store.list(status=status, site=site, batch_id=batch_id, limit=min(limit, 1000))}
+
+@app.get("/jobs/events")
+async def job_events(request: Request, job_id: Optional[str] = None,
+                     last_event_id: Optional[str] = Header(None)):
+    """Server-sent events for job status changes, so clients need not poll ``/jobs``.
+    
+    Each event is one status change; the final one (succeeded/failed) also
+    carries the job record with its output and report paths. Reconnecting
+    clients resume from the ``Last-Event-ID`` header; new clients only get
+    later changes.
+    With ``job_id`` the stream replays that job's history and ends once it
+    has finished.
+    """
+    if last_event_id and last_event_id.isdigit():
+        seq = int(last_event_id)
+    else:
+        seq = 0 if job_id is not None else await run_in_threadpool(job_store.last_seq)
+    poll_interval = job_store_config(config)["poll_interval_seconds"]
+    
+    async def stream():
+        nonlocal seq
+        idle = 0.0
+        while not await request.is_disconnected():
+            events = await run_in_threadpool(job_store.events_since, seq, job_id)
+            for event in events:
+                seq = event["seq"]
+                if event["status"] in FINAL_STATUSES:
+                    event["job"] = await run_in_threadpool(job_store.get, event["job_id"])
+                yield f"id: {seq}\nevent: job\ndata: {json.dumps(event)}\n\n"
+                if job_id is not None and event["status"] in FINAL_STATUSES:
+                    return
+            idle = 0.0 if events else idle + poll_interval
+            if idle >= 15:
+                # Keep-alive comment for proxies that drop quiet connections
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(poll_interval)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """One job's status, stage, output and report paths; queued jobs include their queue estimate."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job["status"] in ("queued", "running"):
+        queued = find_job(load_status(scheduler_settings["status_path"]), job["file_path"])
+        if queued is not None and queued.get("job_id") == job_id:
+            job["queue"] = {key: queued.get(key) for key in ("position", "estimated_start", "estimated_finish")
+                            if key in queued}
+    return job
+
+@app.get("/reports")
+def list_reports():
+    """Ids of the stored validation reports, newest first.
+    
+    Declared sync: the report sink is a database (or, with the files backend,
+    a storage zone that may be an object store).
+    """
+    report_files = sorted(get_report_sink(config).list(REPORTS_DIR, ".json"), key=lambda entry: entry[1], reverse=True)
+    return {"reports": [os.path.splitext(os.path.basename(path))[0] for path, _ in report_files]}
+
+@app.get("/reports/{report_id}", response_class=HTMLResponse)
+def show_report(report_id: str):
+    """Render a stored validation report as HTML, streamed as it is generated.
+    
+    Declared sync, like ``list_reports``; the stream is also rendered on the threadpool.
+    """
+    report = load_report(report_id, config=config)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Report not found: {report_id}")
+    return StreamingResponse(render_html_report(report), media_type="text/html")
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
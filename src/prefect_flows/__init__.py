@@ -0,0 +1,33 @@
+# Flows and tasks are resolved lazily (PEP 562) so that importing the package
+# does not pull in Prefect, pandas, pyarrow or great_expectations until a
+# stage is actually used, e.g. ``from src.prefect_flows import data_ingestion_flow``.
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    "data_ingestion_flow": "src.prefect_flows.flows.data_ingestion_flow",
+    "incremental_ingestion_flow": "src.prefect_flows.flows.incremental_ingestion_flow",
+    "chunked_ingestion_flow": "src.prefect_flows.flows.chunked_ingestion_flow",
+    "get_config": "src.prefect_flows.tasks.get_config",
+    "extract_metadata": "src.prefect_flows.tasks.extract_metadata",
+    "cleanse_data": "src.prefect_flows.tasks.cleanse_data",
+    "validate_sensor_data": "src.prefect_flows.tasks.Validate",
+    "save_validation_report": "src.prefect_flows.tasks.Validate",
+    "validate_data": "src.prefect_flows.tasks.validate_data",
+    "save_data": "src.prefect_flows.tasks.save_data",
+    "update_rollups": "src.prefect_flows.tasks.update_rollups",
+    "load_config": "src.prefect_flows.utils.config",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
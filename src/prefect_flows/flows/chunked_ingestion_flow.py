@@ -0,0 +1,248 @@
+import os
+import shutil
+from collections import Counter
+from functools import reduce
+from typing import Optional
+import pandas as pd
+from prefect import flow, get_run_logger
+
+from src.prefect_flows.tasks.get_config import get_config
+from src.prefect_flows.tasks.cleanse_data import cleanse_frame
+from src.prefect_flows.tasks.extract_metadata import record_metadata
+from src.prefect_flows.tasks.Validate import (
+    rules_for, new_validation_results, finalize_validation, save_validation_report
+)
+from src.prefect_flows.utils.chunk_manifest import load_manifest, save_manifest, remove_manifest
+from src.prefect_flows.utils.drift_detection import (
+    drift_config, load_baselines, column_moments, merge_moments, detect_drift_moments, attach_drift
+)
+from src.prefect_flows.utils.imputation import compute_stats, merge_stats, imputation_plan
+from src.prefect_flows.utils.job_store import set_job_stage
+from src.prefect_flows.utils.mapped_file import MappedFile
+from src.prefect_flows.utils.parallel_validation import column_partials, merge_columns
+from src.prefect_flows.utils.parquet_dataset import write_part
+from src.prefect_flows.utils.rollups import compute_rollup, merge_rollup
+from src.prefect_flows.utils.schema_registry import get_schema_registry
+from src.prefect_flows.utils.sites import site_of, site_config, site_dir
+from src.prefect_flows.utils.storage import location, require_local
+
+
+def _merge_validation(manifest: dict, rules: dict) -> dict:
+    """Validation result of the whole file from the per-chunk partials in the manifest."""
+    chunks = [manifest["chunks"][key] for key in sorted(manifest["chunks"], key=lambda key: int(key.split("-")[0]))]
+    validation_results = new_validation_results(sum(chunk["rows"] for chunk in chunks))
+    partials = {column: [p for chunk in chunks for p in chunk["partials"][column]] for column in rules}
+    column_stats, errors, warnings = merge_columns(rules, partials)
+    validation_results["column_stats"] = column_stats
+    validation_results["errors"].extend(errors)
+    validation_results["warnings"].extend(warnings)
+    return finalize_validation(validation_results, sum(chunk["valid_rows"] for chunk in chunks))
+
+
+def _file_imputation_stats(mapped: MappedFile, ranges: list, columns: list, config: dict) -> dict:
+    """First pass: merge per-chunk fill statistics into whole-file statistics (by canonical column)."""
+    registry = get_schema_registry(config.get("schema_registry"))
+    resolution = registry.resolve(columns)
+    return reduce(merge_stats, (
+        compute_stats(registry.map_columns(mapped.read_csv_range(start, end, columns, config), resolution)
+                      .drop_duplicates(), config.get("imputation"))
+        for start, end in ranges
+    ))
+
+
+def _chunk_rollup(chunk: dict, output_path: str) -> pd.DataFrame:
+    """Rollup of a committed chunk; chunks checkpointed without one are read back from their promoted part."""
+    if "rollup" in chunk:
+        return pd.DataFrame(chunk["rollup"])
+    part_path = os.path.normpath(os.path.join(output_path, chunk["part"]))
+    return compute_rollup(pd.read_parquet(part_path), part_path)
+
+
+def _promote(staging_dir: str, output_path: str):
+    """Swap the staged parts in as the file's output dataset.
+
+    The previous output is only renamed aside to ``<staging_dir>.previous``
+    (ignored by dataset scans, like the staging folder); the caller deletes
+    it once the promotion is recorded. With the staging folder already gone
+    the parts were promoted before a crash and are left as they are.
+    """
+    if not os.path.exists(staging_dir):
+        if not os.path.exists(output_path):
+            raise FileNotFoundError(f"Neither staged parts nor promoted output found: {output_path}")
+        return
+    previous_path = f"{staging_dir}.previous"
+    if os.path.exists(output_path):
+        shutil.rmtree(previous_path, ignore_errors=True)
+        os.replace(output_path, previous_path)
+    os.replace(staging_dir, output_path)
+
+
+@flow(name="sensor-data-chunked-flow")
+def chunked_ingestion_flow(file_path: str, raw_folder: str = "./data/raw",
+                           output_dir: str = "data/cleansed", config: Optional[dict] = None,
+                           job_id: Optional[str] = None):
+    """Ingest a very large file as newline-aligned byte ranges with chunk-level checkpoints.
+
+    Each chunk is parsed, cleansed and validated on its own and written as
+    ``part-<start>-<end>.parquet`` under ``<output_dir>/_chunks/<file>/``
+    (ignored by dataset scans). Once the part is committed, the chunk's row
+    count and mergeable validation partials are added to a manifest, so a
+    rerun after a crash skips every committed chunk. When all chunks are
+    done the partials are merged into the file's validation result and,
+    if it passes, the parts are promoted to ``<output_dir>/<file>_processed/``.
+
+    With ``global_imputation_stats`` a first pass (also checkpointed) gathers
+    fill statistics over the whole file, so every chunk is imputed with the
+    same means/medians/group means and forward fill carries across chunk
+    boundaries. Validation totals equal those of validating the concatenated
+    chunks; duplicate removal still applies per chunk. Drift moments are
+    also kept per chunk and scored once for the whole file. Row and
+    imputed-cell counts are summed over the chunks into the file's metadata
+    document, recorded once every chunk is done.
+    """
+    logger = get_run_logger()
+    if config is None:
+        config = get_config()
+    site = site_of(file_path)
+    config = site_config(config, site)
+    raw_folder, output_dir = site_dir(raw_folder, site), site_dir(output_dir, site)
+    chunk_bytes = config["chunked_ingestion"]["chunk_bytes"]
+    file_name = os.path.basename(file_path)
+    base_name = os.path.splitext(file_name)[0]
+    staging_dir = os.path.join(output_dir, "_chunks", base_name)
+    output_path = os.path.join(output_dir, f"{base_name}_processed")
+    detect = config.get("drift_detection", {}).get("enabled")
+    drift_cfg = drift_config(config)
+
+    try:
+        # Raw chunks are written in place and staged parts promoted by rename
+        require_local(raw_folder, output_dir, config=config)
+        with MappedFile(file_path) as mapped:
+            columns = mapped.header()
+            resolution = get_schema_registry(config.get("schema_registry")).resolve(columns)
+            if resolution["version"] is None:
+                return {"status": "rejected", "error": f"Missing required columns: {resolution['missing']}"}
+
+            file_info = {"file_format": mapped.format, "file_size_bytes": mapped.size}
+            manifest = load_manifest(file_path, chunk_bytes, columns)
+            if not manifest["chunks"] and os.path.exists(staging_dir):
+                # Parts of an abandoned run over a different version of the file
+                shutil.rmtree(staging_dir)
+
+            os.makedirs(raw_folder, exist_ok=True)
+            raw_file_path = os.path.join(raw_folder, file_name)
+            ranges = mapped.line_ranges(chunk_bytes)
+            logger.info(f"{file_name}: {len(ranges)} chunks, {len(manifest['chunks'])} already committed")
+
+            if config["chunked_ingestion"].get("global_imputation_stats") and "imputation_stats" not in manifest:
+                logger.info("Computing whole-file imputation statistics...")
+                set_job_stage(job_id, "imputation_stats", config)
+                manifest["imputation_stats"] = _file_imputation_stats(mapped, ranges, columns, config)
+                save_manifest(manifest)
+            if detect and "drift_baselines" not in manifest:
+                # Outliers in every chunk are counted against the baselines as of the first run
+                manifest["drift_baselines"] = load_baselines(drift_cfg["baseline_path"])
+
+            carry = None
+            for index, (start, end) in enumerate(ranges, start=1):
+                key = f"{start}-{end}"
+                if key in manifest["chunks"]:
+                    carry = manifest["chunks"][key].get("carry")
+                    continue
+                set_job_stage(job_id, f"chunk {index}/{len(ranges)}", config)
+
+                df = mapped.read_csv_range(start, end, columns, config)
+                source_rows = len(df)
+                df = cleanse_frame(df, config.get("imputation"), stats=manifest.get("imputation_stats"), carry=carry,
+                                   schema_registry=config.get("schema_registry"))
+                # Last (filled) reading of forward-filled columns continues into the next chunk
+                carry = {col: df[col].iloc[-1] for col, strategy in
+                         imputation_plan(df, config.get("imputation")).items() if strategy == "ffill"}
+                partials, valid_rows_mask = column_partials(df, rules_for(config), config.get("parallel_validation"))
+                part_path = write_part(df, staging_dir, f"part-{start:015d}-{end:015d}.parquet", config["parquet"],
+                                       config=config)
+                # Rolled up while in memory, under the path the part will have once promoted
+                rollup = compute_rollup(df, os.path.normpath(os.path.join(output_path, os.path.basename(part_path))))
+
+                # Mirror the chunk into the raw zone; chunks are committed in file order
+                raw_start = 0 if start == mapped.header_end() else start
+                with open(raw_file_path, "r+b" if raw_start else "wb") as raw_file:
+                    raw_file.seek(raw_start)
+                    raw_file.write(mapped.view(raw_start, end))
+                    raw_file.truncate()
+
+                manifest["chunks"][key] = {
+                    "part": os.path.basename(part_path),
+                    "rows": len(df),
+                    "source_rows": source_rows,
+                    "valid_rows": int(valid_rows_mask.sum()),
+                    "partials": partials,
+                    "imputed_cells": df.attrs["imputed_cells"],
+                    "carry": carry,
+                    "rollup": rollup.to_dict("records"),
+                    "drift_moments": column_moments(df, manifest["drift_baselines"], drift_cfg) if detect else {}
+                }
+                save_manifest(manifest)
+                logger.info(f"Committed bytes {start}-{end} of {file_name} ({len(df)} rows)")
+
+        set_job_stage(job_id, "validate", config)
+        validation_results = _merge_validation(manifest, rules_for(config))
+        if detect:
+            if "drift" not in manifest:
+                moments = reduce(merge_moments, (chunk["drift_moments"] for chunk in manifest["chunks"].values()), {})
+                manifest["drift"] = detect_drift_moments(moments, drift_cfg, update=validation_results["success"])
+                # The baselines now include this file; a resumed run reuses the result instead of folding it in again
+                save_manifest(manifest)
+            attach_drift(validation_results, manifest["drift"])
+        report_path = save_validation_report(validation_results, file_path, config)
+
+        if validation_results["success"]:
+            if not manifest.get("promoted"):
+                _promote(staging_dir, output_path)
+                manifest["promoted"] = True
+                save_manifest(manifest)
+            # The replaced output is deleted only once the promotion is recorded
+            shutil.rmtree(f"{staging_dir}.previous", ignore_errors=True)
+            # Replaces every earlier rollup of this file, whatever chunking or layout wrote it
+            merge_rollup(pd.concat([_chunk_rollup(chunk, output_path) for chunk in manifest["chunks"].values()],
+                                   ignore_index=True), output_prefix=output_path)
+            logger.info(f"Promoted {len(ranges)} parts to {output_path}")
+        else:
+            output_path = None
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            logger.warning("Validation failed - data not promoted to processed folder")
+
+        # One metadata document for the whole file, as the single-pass flow records
+        imputed_cells = dict(sum((Counter(chunk["imputed_cells"]) for chunk in manifest["chunks"].values()),
+                                 Counter()))
+        metadata = {
+            "file_name": file_name,
+            "file_info": {**file_info, "saved_path": location(raw_file_path, config)},
+            "data_structure": {
+                # Chunks checkpointed before source_rows was recorded only know their cleansed rows
+                "row_count": sum(chunk.get("source_rows", chunk["rows"]) for chunk in manifest["chunks"].values()),
+                "column_count": len(columns),
+                "columns": columns
+            },
+            "chunks": len(ranges)
+        }
+        record_metadata(metadata, raw_folder, config, imputed_cells=imputed_cells,
+                        schema={key: resolution[key] for key in ("version", "fingerprint", "unknown")})
+        remove_manifest(file_path)
+
+        return {
+            "status": "success",
+            "output_path": output_path,
+            "report_path": report_path,
+            "rows": validation_results["summary"]["total_rows"],
+            "chunks": len(ranges),
+            "imputed_cells": imputed_cells,
+            "validation": validation_results
+        }
+
+    except Exception as e:
+        logger.error(f"Chunked ingestion failed: {str(e)}")
+        return {
+            "status": "failed",
+            "error": str(e)
+        }
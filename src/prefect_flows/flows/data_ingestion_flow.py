@@ -1,5 +1,6 @@
 import sys
 import os
+from typing import Optional
 from prefect import flow, get_run_logger
 from src.prefect_flows.tasks.Validate import validate_sensor_data, save_validation_report
 from src.prefect_flows.tasks.save_data import save_data
@@ -12,43 +13,133 @@ if src_path not in sys.path:
 # Now import using absolute paths from project root
 from src.prefect_flows.tasks.get_config import get_config
 from src.prefect_flows.tasks.load_data import load_data
-from src.prefect_flows.tasks.extract_metadata import extract_metadata
+from src.prefect_flows.tasks.extract_metadata import extract_metadata, record_metadata
 from src.prefect_flows.tasks.cleanse_data import cleanse_data
 from src.prefect_flows.tasks.save_data import save_data
+from src.prefect_flows.tasks.update_rollups import update_rollups
+from src.prefect_flows.tasks.detect_drift import detect_drift
+from src.prefect_flows.flows.chunked_ingestion_flow import chunked_ingestion_flow
+from src.prefect_flows.utils.drift_detection import attach_drift
+from src.prefect_flows.utils.file_formats import file_format
+from src.prefect_flows.utils.job_store import set_job_stage
+from src.prefect_flows.utils.metadata_probe import probe_file, find_rejection_reason
+from src.prefect_flows.utils.sites import site_of, site_config, site_dir
+from src.prefect_flows.utils.task_cache import DEFAULT_MAX_AGE_SECONDS, TaskCache
+
+def run_stage(cache, stage: str, probe: dict, config: dict, compute, kind: str = "json",
+              is_valid=lambda value: True):
+    """Run a pipeline stage through the task cache, or directly when caching is disabled."""
+    if cache is None:
+        return compute()
+    # The cache settings themselves do not change stage outputs
+    rules = {key: value for key, value in config.items() if key != "task_cache"}
+    return cache.get_or_compute(stage, probe["sha256"], rules, compute, kind=kind, is_valid=is_valid)
+
+def validate_and_detect_drift(df, config: dict) -> dict:
+    """Rule validation plus drift/outlier flags, which are added to the same report.
+
+    Only files that pass validation are folded into the drift baselines.
+    """
+    validation_results = validate_sensor_data(df, config)
+    if config.get("drift_detection", {}).get("enabled"):
+        attach_drift(validation_results, detect_drift(df, config, update=validation_results["success"]))
+    return validation_results
 
 @flow(name="sensor-data-ingestion-flow")
-def data_ingestion_flow(file_path: str):
-    """Main flow to orchestrate the entire data ingestion pipeline."""
+def data_ingestion_flow(file_path: str, config: Optional[dict] = None, job_id: Optional[str] = None):
+    """Main flow to orchestrate the entire data ingestion pipeline.
+    
+    Long-lived workers pass their preloaded ``config`` to skip reloading it per file.
+    The site (landing sub-folder) selects the rule overrides and output folders.
+    With ``task_cache`` enabled, stage outputs are cached by file content and
+    config, so a retry of the same file resumes after the last stage that completed.
+    With a ``job_id`` each stage is recorded in the job store as it starts.
+    """
     logger = get_run_logger()
     logger.info(f"Starting data ingestion flow for file: {file_path}")
     
     try:
         # Get configuration
         logger.info("Step 1: Loading configuration...")
-        config = get_config()
+        if config is None:
+            config = get_config()
+        site = site_of(file_path)
+        config = site_config(config, site)
+        raw_folder = site_dir("./data/raw", site)
+        
+        # Very large CSVs are processed chunk by chunk so a crash resumes instead of restarting
+        if file_format(file_path) == "csv" and \
+                os.path.getsize(file_path) > config["chunked_ingestion"]["threshold_bytes"]:
+            logger.info("Large file - switching to checkpointed chunked ingestion...")
+            return chunked_ingestion_flow(file_path, config=config, job_id=job_id)
+        
+        # Probe header and row count so unusable files are rejected before any parsing
+        logger.info("Step 2: Probing file header and row count...")
+        set_job_stage(job_id, "probe", config)
+        cache_config = config.get("task_cache", {})
+        cache = None
+        if cache_config.get("enabled"):
+            cache = TaskCache(cache_config["cache_dir"], cache_config["max_bytes"],
+                              cache_config.get("max_age_seconds", DEFAULT_MAX_AGE_SECONDS))
+        # Hashed once here; the task cache and the metadata both use this hash
+        probe = probe_file(file_path, with_hash=True)
+        rejection = find_rejection_reason(probe, config.get("schema_registry"))
+        if rejection:
+            logger.warning(f"File rejected before ingestion: {rejection}")
+            return {
+                "status": "rejected",
+                "error": rejection,
+                "probe": probe
+            }
         
         # Extract metadata
         logger.info("Step 3: Saving raw data and metadata to raw folder...")
+        set_job_stage(job_id, "extract_metadata", config)
         # In the data_ingestion_flow function, update the metadata extraction call:
-        metadata, raw_file_path = extract_metadata(file_path, raw_folder="./data/raw")  # Pass the full file_path
+        metadata, raw_file_path = run_stage(
+            cache, "extract_metadata", probe, config,
+            lambda: extract_metadata(
+                file_path,
+                raw_folder=raw_folder,
+                deep_profile=config["metadata"]["deep_profile"],
+                probe=probe,
+                config=config
+            ),  # Pass the full file_path
+            # Metadata names the landed file, so it is only reused for the same file name
+            is_valid=lambda value: (value[0].get("file_name") == os.path.basename(file_path)
+                                    and os.path.exists(value[1]))
+        )
         
         # Cleanse data
         logger.info("Step 4: Cleansing data...")
-        df = cleanse_data(raw_file_path, config)
+        set_job_stage(job_id, "cleanse_data", config)
+        df = run_stage(cache, "cleanse_data", probe, config,
+                       lambda: cleanse_data(raw_file_path, config), kind="frame")
+        if "error" not in metadata:
+            record_metadata(metadata, raw_folder, config, imputed_cells=df.attrs.get("imputed_cells", {}),
+                            schema=df.attrs.get("schema"))
                 
         # Validate data
 
         logger.info("Step : Validating data...")
-        validation_results = validate_sensor_data(df)
+        set_job_stage(job_id, "validate", config)
+        # Cached together with validation so a retry does not fold the file into the baselines twice
+        validation_results = run_stage(cache, "validate_sensor_data", probe, config,
+                                       lambda: validate_and_detect_drift(df, config))
         
         logger.info("Step 4: Saving validation report...")
-        report_path = save_validation_report(validation_results, file_path)
+        report_path = save_validation_report(validation_results, file_path, config)
         logger.info(f"Validation successfully completed! Output: {report_path}")
         
         # 5. Save processed data only if validation passes
         if validation_results["success"]:
             logger.info("Step 5: Saving processed data...")
-            processed_path = save_data(df, metadata)
+            set_job_stage(job_id, "save_data", config)
+            processed_path = save_data(df, metadata, output_dir=site_dir("data/cleansed", site), config=config)
+            
+            logger.info("Step 6: Updating dashboard rollups...")
+            # Replaces the file's earlier rollups, including those of a chunked ingestion
+            update_rollups(df, processed_path, output_prefix=os.path.splitext(processed_path)[0])
         else:
             processed_path = None
             logger.warning("Validation failed - data not promoted to processed folder")
@@ -58,6 +149,7 @@ def data_ingestion_flow(file_path: str):
         return {
             "status": "success",
             "output_path": processed_path,
+            "report_path": report_path,
             "metadata": metadata,
             "validation": validation_results
         }
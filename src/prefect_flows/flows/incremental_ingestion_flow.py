@@ -0,0 +1,122 @@
+import os
+from typing import Optional
+from prefect import flow, get_run_logger
+
+from src.prefect_flows.tasks.get_config import get_config
+from src.prefect_flows.tasks.cleanse_data import cleanse_frame
+from src.prefect_flows.tasks.Validate import validate_sensor_data, save_validation_report
+from src.prefect_flows.tasks.update_rollups import update_rollups
+from src.prefect_flows.tasks.detect_drift import detect_drift
+from src.prefect_flows.utils.drift_detection import attach_drift
+from src.prefect_flows.utils.job_store import set_job_stage
+from src.prefect_flows.utils.mapped_file import MappedFile
+from src.prefect_flows.utils.offset_checkpoint import get_offset, save_offset
+from src.prefect_flows.utils.parquet_dataset import write_part
+from src.prefect_flows.utils.sites import site_of, site_config, site_dir
+from src.prefect_flows.utils.storage import require_local
+
+
+@flow(name="sensor-data-incremental-flow")
+def incremental_ingestion_flow(file_path: str, raw_folder: str = "./data/raw",
+                               output_dir: str = "data/cleansed", config: Optional[dict] = None,
+                               job_id: Optional[str] = None):
+    """Ingest only the complete lines appended to ``file_path`` since the last run.
+
+    The byte offset of the last ingested line is checkpointed per file. Each
+    run parses ``[offset, last complete newline)``, cleanses and validates
+    those rows and appends them to ``<output_dir>/<file>/`` as a new Parquet
+    part. The checkpoint only moves after the part is committed, so a crash
+    re-ingests the same byte range into the same part name: the raw copy is
+    rewritten from the range's start and a drift result already folded into
+    the baselines is reused from the checkpoint.
+    """
+    logger = get_run_logger()
+    if config is None:
+        config = get_config()
+    site = site_of(file_path)
+    config = site_config(config, site)
+    raw_folder, output_dir = site_dir(raw_folder, site), site_dir(output_dir, site)
+    file_name = os.path.basename(file_path)
+
+    try:
+        # Appended bytes are added to the raw copy in place
+        require_local(raw_folder, output_dir, config=config)
+        checkpoint = get_offset(file_path)
+
+        with MappedFile(file_path) as mapped:
+            offset = checkpoint.get("offset", 0)
+            columns = checkpoint.get("columns")
+            pending = checkpoint.get("pending")
+            if offset > mapped.size or not columns:
+                # New or truncated/rotated file - start again from the header
+                columns = mapped.header()
+                offset = mapped.header_end()
+                pending = None
+
+            if pending and pending["start"] == offset and pending["end"] <= mapped.size:
+                # Finish the range a crashed run started, even if more lines arrived since
+                end = pending["end"]
+            else:
+                pending = None
+                end = mapped.last_line_end(offset)
+            if end <= offset:
+                logger.info(f"No new complete lines in {file_name}")
+                return {"status": "success", "output_path": None, "rows": 0}
+
+            logger.info(f"Reading bytes {offset}-{end} of {file_name}")
+            set_job_stage(job_id, "read_range", config)
+            df = mapped.read_csv_range(offset, end, columns, config)
+
+            # Mirror the appended bytes into the raw zone without re-reading the file;
+            # written at the range's own offset, so a rerun overwrites instead of appending twice
+            os.makedirs(raw_folder, exist_ok=True)
+            raw_file_path = os.path.join(raw_folder, file_name)
+            raw_start = offset
+            if offset == mapped.header_end() or not os.path.exists(raw_file_path) or \
+                    os.path.getsize(raw_file_path) < offset:
+                raw_start = 0  # (re)write the raw copy from the header
+            with open(raw_file_path, "r+b" if raw_start else "wb") as raw_file:
+                raw_file.seek(raw_start)
+                raw_file.write(mapped.view(raw_start, end))
+                raw_file.truncate()
+
+        set_job_stage(job_id, "cleanse_data", config)
+        df = cleanse_frame(df, config.get("imputation"), schema_registry=config.get("schema_registry"))
+        set_job_stage(job_id, "validate", config)
+        validation_results = validate_sensor_data(df, config)
+        if config.get("drift_detection", {}).get("enabled"):
+            if pending is None or "drift" not in pending:
+                # The baselines now include this range; a rerun reuses the result instead of folding it in again
+                pending = {"start": offset, "end": end, "drift": detect_drift(df, config, update=validation_results["success"])}
+                save_offset(file_path, offset, columns, pending=pending)
+            attach_drift(validation_results, pending["drift"])
+        report_path = save_validation_report(validation_results, file_path, config)
+
+        output_path = None
+        if validation_results["success"]:
+            dataset_dir = os.path.join(output_dir, os.path.splitext(file_name)[0])
+            output_path = write_part(df, dataset_dir, f"part-{offset:015d}-{end:015d}.parquet",
+                                     config["parquet"], config=config)
+            logger.info(f"Appended {len(df)} rows to {output_path}")
+            update_rollups(df, output_path)
+        else:
+            logger.warning(f"Validation failed for bytes {offset}-{end} - rows not promoted")
+
+        save_offset(file_path, end, columns)
+
+        return {
+            "status": "success",
+            "output_path": output_path,
+            "report_path": report_path,
+            "rows": len(df),
+            "byte_range": [offset, end],
+            "imputed_cells": df.attrs["imputed_cells"],
+            "validation": validation_results
+        }
+
+    except Exception as e:
+        logger.error(f"Incremental ingestion failed: {str(e)}")
+        return {
+            "status": "failed",
+            "error": str(e)
+        }
@@ -6,178 +6,176 @@ import pandas as pd
 import json
 from datetime import datetime
 
-@task
-def validate_sensor_data(df):
-    """Validate sensor data with specific rules for each column."""
-    print("Starting sensor data validation...")
-    #df = pd.read_csv(csv_path)
-    validation_results = {
+from src.prefect_flows.utils.report_sink import get_report_sink
+from src.prefect_flows.utils.parallel_validation import validate_columns
+
+# Expected columns and their validation rules
+EXPECTED_COLUMNS = [
+    'footfall', 'tempMode', 'AQ', 'USS', 'CS', 'VOC', 'RP', 'IP', 'Temperature', 'fail'
+]
+
+VALIDATION_RULES = {
+    'footfall': {
+        'type': 'numeric',
+        'min_value': 0,
+        'max_value': 10000,
+        'description': 'Number of people detected'
+    },
+    'tempMode': {
+        'type': 'categorical', 
+        'allowed_values': [1, 2, 3, 4, 5, 6, 7],
+        'description': 'Temperature mode setting'
+    },
+    'AQ': {
+        'type': 'numeric',
+        'min_value': 1,
+        'max_value': 10,
+        'description': 'Air Quality index'
+    },
+    'USS': {
+        'type': 'numeric', 
+        'min_value': 1,
+        'max_value': 10,
+        'description': 'Ultrasonic sensor reading'
+    },
+    'CS': {
+        'type': 'numeric',
+        'min_value': 1, 
+        'max_value': 10,
+        'description': 'Current sensor reading'
+    },
+    'VOC': {
+        'type': 'numeric',
+        'min_value': 0,
+        'max_value': 10, 
+        'description': 'Volatile Organic Compounds level'
+    },
+    'RP': {
+        'type': 'numeric',
+        'min_value': 0,
+        'max_value': 100,
+        'description': 'Relative Pressure'
+    },
+    'IP': {
+        'type': 'numeric',
+        'min_value': 1,
+        'max_value': 10,
+        'description': 'Input Power'
+    },
+    'Temperature': {
+        'type': 'numeric',
+        'min_value': -50,
+        'max_value': 100,
+        'description': 'Temperature in Celsius'
+    },
+    'fail': {
+        'type': 'binary',
+        'allowed_values': [0, 1],
+        'description': 'Failure indicator (0=normal, 1=failed)'
+    }
+}
+
+RULE_TYPES = ('numeric', 'categorical', 'binary')
+
+# json-encoded rule overrides -> compiled rule set
+_compiled_rules = {}
+
+def _complete_rule(column: str, rule: dict) -> dict:
+    """Fill in the ``type`` of an overridden rule and check it can be applied.
+
+    A column added by an override without a type is categorical when it lists
+    ``allowed_values`` and numeric otherwise.
+    """
+    rule = {'type': 'categorical' if 'allowed_values' in rule else 'numeric', **rule}
+    if rule['type'] not in RULE_TYPES:
+        raise ValueError(f"Validation rule for '{column}' has unknown type {rule['type']!r}; "
+                         f"expected one of {list(RULE_TYPES)}")
+    if rule['type'] != 'numeric' and 'allowed_values' not in rule:
+        raise ValueError(f"Validation rule for {rule['type']} column '{column}' needs 'allowed_values'")
+    return rule
+
+def rules_for(config: dict = None) -> dict:
+    """Validation rules with the per-column ``config['validation_rules']`` overrides applied.
+
+    Sites override individual rule fields (e.g. a wider Temperature range)
+    or add rules for extra columns; each distinct set of overrides is
+    compiled once. Raises ValueError for an override that cannot be applied.
+    """
+    overrides = (config or {}).get("validation_rules")
+    if not overrides:
+        return VALIDATION_RULES
+    key = json.dumps(overrides, sort_keys=True)
+    if key not in _compiled_rules:
+        _compiled_rules[key] = {
+            column: _complete_rule(column, {**VALIDATION_RULES.get(column, {}), **overrides.get(column, {})})
+            for column in {**VALIDATION_RULES, **overrides}
+        }
+    return _compiled_rules[key]
+
+
+def new_validation_results(total_rows: int) -> dict:
+    """Empty, passing validation result for ``total_rows`` rows."""
+    return {
         "success": True,
         "errors": [],
         "warnings": [],
         "column_stats": {},
         "summary": {
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "valid_rows": 0,
             "invalid_rows": 0
         }
     }
+
+
+def finalize_validation(validation_results: dict, valid_rows) -> dict:
+    """Fill in the row summary and overall success once the column checks are merged."""
+    summary = validation_results["summary"]
+    summary["valid_rows"] = valid_rows
+    summary["invalid_rows"] = summary["total_rows"] - valid_rows
+    summary["valid_percentage"] = (valid_rows / summary["total_rows"]) * 100
+    
+    # Determine overall success
+    if validation_results["errors"]:
+        validation_results["success"] = False
+    elif summary["valid_percentage"] < 95:  # Allow 5% invalid rows
+        validation_results["success"] = False
+        validation_results["errors"].append(f"Too many invalid rows: {summary['valid_percentage']:.1f}% valid")
+    
+    print(f"Validation completed: {validation_results['success']}")
+    print(f"Valid rows: {summary['valid_rows']}/{summary['total_rows']} "
+          f"({summary['valid_percentage']:.1f}%)")
+    return validation_results
+
+@task
+def validate_sensor_data(df, config: dict = None):
+    """Validate sensor data with specific rules for each column.
+    
+    Columns (and row ranges of tall columns) are validated in parallel
+    according to ``config['parallel_validation']``.
+    """
+    print("Starting sensor data validation...")
+    #df = pd.read_csv(csv_path)
+    validation_results = new_validation_results(len(df))
     
     try:
-        # Define expected columns and their validation rules
-        expected_columns = [
-            'footfall', 'tempMode', 'AQ', 'USS', 'CS', 'VOC', 'RP', 'IP', 'Temperature', 'fail'
-        ]
-        
         # Check if all expected columns exist
-        missing_columns = [col for col in expected_columns if col not in df.columns]
+        missing_columns = [col for col in EXPECTED_COLUMNS if col not in df.columns]
         if missing_columns:
             validation_results["errors"].append(f"Missing required columns: {missing_columns}")
             validation_results["success"] = False
             return validation_results
         
-        # Validate each column
-        validation_rules = {
-            'footfall': {
-                'type': 'numeric',
-                'min_value': 0,
-                'max_value': 10000,
-                'description': 'Number of people detected'
-            },
-            'tempMode': {
-                'type': 'categorical', 
-                'allowed_values': [1, 2, 3, 4, 5, 6, 7],
-                'description': 'Temperature mode setting'
-            },
-            'AQ': {
-                'type': 'numeric',
-                'min_value': 1,
-                'max_value': 10,
-                'description': 'Air Quality index'
-            },
-            'USS': {
-                'type': 'numeric', 
-                'min_value': 1,
-                'max_value': 10,
-                'description': 'Ultrasonic sensor reading'
-            },
-            'CS': {
-                'type': 'numeric',
-                'min_value': 1, 
-                'max_value': 10,
-                'description': 'Current sensor reading'
-            },
-            'VOC': {
-                'type': 'numeric',
-                'min_value': 0,
-                'max_value': 10, 
-                'description': 'Volatile Organic Compounds level'
-            },
-            'RP': {
-                'type': 'numeric',
-                'min_value': 0,
-                'max_value': 100,
-                'description': 'Relative Pressure'
-            },
-            'IP': {
-                'type': 'numeric',
-                'min_value': 1,
-                'max_value': 10,
-                'description': 'Input Power'
-            },
-            'Temperature': {
-                'type': 'numeric',
-                'min_value': -50,
-                'max_value': 100,
-                'description': 'Temperature in Celsius'
-            },
-            'fail': {
-                'type': 'binary',
-                'allowed_values': [0, 1],
-                'description': 'Failure indicator (0=normal, 1=failed)'
-            }
-        }
+        # Perform column-wise validation, sharded across workers
+        column_stats, errors, warnings, valid_rows_mask = validate_columns(
+            df, rules_for(config), (config or {}).get("parallel_validation")
+        )
+        validation_results["column_stats"] = column_stats
+        validation_results["errors"].extend(errors)
+        validation_results["warnings"].extend(warnings)
         
-        # Perform column-wise validation
-        valid_rows_mask = pd.Series([True] * len(df))
-        
-        for column, rules in validation_rules.items():
-            col_validation = {
-                'total_count': len(df[column]),
-                'null_count': df[column].isnull().sum(),
-                'invalid_count': 0,
-                'min_value': None,
-                'max_value': None,
-                'unique_values': None
-            }
-            
-            # Check for null values
-            if col_validation['null_count'] > 0:
-                validation_results["warnings"].append(f"Column '{column}' has {col_validation['null_count']} null values")
-            
-            # Type-specific validation
-            if rules['type'] == 'numeric':
-                col_validation['min_value'] = df[column].min()
-                col_validation['max_value'] = df[column].max()
-                
-                # Check value ranges
-                if 'min_value' in rules and df[column].min() < rules['min_value']:
-                    invalid_mask = df[column] < rules['min_value']
-                    col_validation['invalid_count'] += invalid_mask.sum()
-                    valid_rows_mask &= ~invalid_mask
-                    validation_results["errors"].append(
-                        f"Column '{column}' has values below minimum {rules['min_value']}: min={df[column].min()}"
-                    )
-                
-                if 'max_value' in rules and df[column].max() > rules['max_value']:
-                    invalid_mask = df[column] > rules['max_value']
-                    col_validation['invalid_count'] += invalid_mask.sum()
-                    valid_rows_mask &= ~invalid_mask
-                    validation_results["errors"].append(
-                        f"Column '{column}' has values above maximum {rules['max_value']}: max={df[column].max()}"
-                    )
-            
-            elif rules['type'] == 'categorical':
-                col_validation['unique_values'] = df[column].unique().tolist()
-                invalid_values = [val for val in df[column].unique() if val not in rules['allowed_values']]
-                if invalid_values:
-                    invalid_mask = df[column].isin(invalid_values)
-                    col_validation['invalid_count'] += invalid_mask.sum()
-                    valid_rows_mask &= ~invalid_mask
-                    validation_results["errors"].append(
-                        f"Column '{column}' has invalid values: {invalid_values}. Allowed: {rules['allowed_values']}"
-                    )
-            
-            elif rules['type'] == 'binary':
-                col_validation['unique_values'] = df[column].unique().tolist()
-                invalid_values = [val for val in df[column].unique() if val not in rules['allowed_values']]
-                if invalid_values:
-                    invalid_mask = df[column].isin(invalid_values)
-                    col_validation['invalid_count'] += invalid_mask.sum()
-                    valid_rows_mask &= ~invalid_mask
-                    validation_results["errors"].append(
-                        f"Column '{column}' has invalid values: {invalid_values}. Must be {rules['allowed_values']}"
-                    )
-            
-            validation_results["column_stats"][column] = col_validation
-        
-        # Update summary statistics
-        validation_results["summary"]["valid_rows"] = valid_rows_mask.sum()
-        validation_results["summary"]["invalid_rows"] = (~valid_rows_mask).sum()
-        validation_results["summary"]["valid_percentage"] = (valid_rows_mask.sum() / len(df)) * 100
-        
-        # Determine overall success
-        if validation_results["errors"]:
-            validation_results["success"] = False
-        elif validation_results["summary"]["valid_percentage"] < 95:  # Allow 5% invalid rows
-            validation_results["success"] = False
-            validation_results["errors"].append(f"Too many invalid rows: {validation_results['summary']['valid_percentage']:.1f}% valid")
-        
-        print(f"Validation completed: {validation_results['success']}")
-        print(f"Valid rows: {validation_results['summary']['valid_rows']}/{validation_results['summary']['total_rows']} "
-              f"({validation_results['summary']['valid_percentage']:.1f}%)")
-        
-        return validation_results
+        # Update summary statistics and overall success
+        return finalize_validation(validation_results, valid_rows_mask.sum())
         
     except Exception as e:
         error_msg = f"Validation error: {str(e)}"
@@ -187,11 +185,10 @@ def validate_sensor_data(df):
         return validation_results
 
 @task
-def save_validation_report(validation_results, file_path):
-    """Save validation results to a JSON report with proper type handling."""
+def save_validation_report(validation_results, file_path, config=None):
+    """Save validation results to a JSON report in ``config``'s report sink, with proper type handling."""
     try:
         reports_folder = "./data/reports"
-        os.makedirs(reports_folder, exist_ok=True)
         
         # Convert problematic numpy/pandas types to native Python types
         def clean_for_json(obj):
@@ -218,7 +215,8 @@ def save_validation_report(validation_results, file_path):
                 "summary": cleaned_results.get("summary", {}),
                 "errors": cleaned_results.get("errors", []),
                 "warnings": cleaned_results.get("warnings", []),
-                "column_statistics": cleaned_results.get("column_stats", {})
+                "column_statistics": cleaned_results.get("column_stats", {}),
+                "drift": cleaned_results.get("drift")
             }
         }
         
@@ -226,11 +224,12 @@ def save_validation_report(validation_results, file_path):
         report_filename = f"validation_{os.path.splitext(filename)[0]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         report_path = os.path.join(reports_folder, report_filename)
         
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        # Batched into the report sink with the run's other documents
+        sink = get_report_sink(config)
+        sink.put(report_path, report)
         
-        print(f"Validation report saved: {report_path}")
-        return report_path
+        print(f"Validation report saved: {report_path} (HTML: /reports/{os.path.splitext(report_filename)[0]})")
+        return sink.location(report_path)
         
     except Exception as e:
         print(f"Error saving validation report: {e}")
@@ -5,42 +5,69 @@ from prefect import task, get_run_logger
 import pandas as pd
 from datetime import datetime
 
+from src.prefect_flows.utils.imputation import compute_stats, impute
+from src.prefect_flows.utils.mapped_file import MappedFile
+from src.prefect_flows.utils.schema_registry import get_schema_registry
+
 #from src.prefect_flows.tasks.validate_data import validate_data_with_great_expectations
 
 
+def cleanse_frame(df_clean: pd.DataFrame, imputation_config: dict = None,
+                  stats: dict = None, carry: dict = None, schema_registry: dict = None) -> pd.DataFrame:
+    """Apply the cleansing rules to an already loaded DataFrame.
+
+    Columns are first mapped onto the canonical schema of
+    ``schema_registry`` (aliases, stray spaces, unknown columns) and the
+    result is conformed to its types, so cleansed files of every firmware
+    version share one Parquet schema. Missing values are imputed per
+    ``imputation_config`` (column mean by default) from ``stats``, or from
+    the frame itself when no stats are given. ``carry`` continues forward
+    fill from a preceding chunk. The imputed-cell count per column is left
+    in ``df.attrs["imputed_cells"]`` and the resolved schema version in
+    ``df.attrs["schema"]``.
+    """
+    # Map source columns to canonical names; resolved once per distinct header
+    registry = get_schema_registry(schema_registry)
+    resolution = registry.resolve(df_clean.columns)
+    df_clean = registry.map_columns(df_clean, resolution)
+
+    # Drop duplicates
+    initial_len = len(df_clean)
+    df_clean.drop_duplicates(inplace=True)
+    print(f"Removed {initial_len - len(df_clean)} duplicate rows")
+
+    # Handle missing values - fill strategies per column, all statistics from one grouped pass
+    imputed_cells = {}
+    if df_clean.isnull().values.any():
+        if stats is None:
+            stats = compute_stats(df_clean, imputation_config)
+        imputed_cells = impute(df_clean, stats, imputation_config, carry)
+        for col, count in imputed_cells.items():
+            print(f"Imputed {count} missing values in {col}")
+    df_clean.attrs["imputed_cells"] = imputed_cells
+    
+    # Ensure 'fail' column is integer (0 or 1)
+    if 'fail' in df_clean.columns:
+        df_clean['fail'] = df_clean['fail'].astype(int)
+        print("Converted 'fail' column to integer")
+
+    return registry.conform(df_clean, resolution)
+
+
 @task
 def cleanse_data(csv_file_path: str,  config: dict):
     """Clean and preprocess the sensor data and save to cleansed folder."""
     print("Starting data cleansing...")
     logger = get_run_logger()
     try:
-        # Read the CSV file
-        df_clean = pd.read_csv(csv_file_path)
-
-        # Strip column names (accidental spaces, etc.)
-        df_clean.columns = df_clean.columns.str.strip()
-
-        # Drop duplicates
-        initial_len = len(df_clean)
-        df_clean.drop_duplicates(inplace=True)
-        print(f"Removed {initial_len - len(df_clean)} duplicate rows")
-
-        # Handle missing values - fill with mean for numeric columns
-        numeric_cols = df_clean.select_dtypes(include=['number']).columns
-        for col in numeric_cols:
-            if df_clean[col].isnull().sum() > 0:
-                mean_val = df_clean[col].mean()
-                df_clean[col].fillna(mean_val, inplace=True)
-                print(f"Filled missing values in {col} with mean: {mean_val:.2f}")
-        
-        # Ensure 'fail' column is integer (0 or 1)
-        if 'fail' in df_clean.columns:
-            df_clean['fail'] = df_clean['fail'].astype(int)
-            print("Converted 'fail' column to integer")
+        # Read the CSV file through a memory mapping (multithreaded pyarrow parser
+        # unless configured otherwise); the raw copy is still in the page cache.
+        # Parquet/Arrow files are converted from their typed columns without parsing.
+        with MappedFile(csv_file_path) as mapped:
+            df_clean = mapped.read_frame(config)
 
-        
         # Return the path to the cleansed file
-        return df_clean
+        return cleanse_frame(df_clean, config.get("imputation"), schema_registry=config.get("schema_registry"))
         
     except Exception as e:
         print(f"Error during data cleansing: {str(e)}")
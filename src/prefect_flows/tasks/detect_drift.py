@@ -0,0 +1,13 @@
+from prefect import task
+import pandas as pd
+
+from src.prefect_flows.utils.drift_detection import drift_config, load_baselines, column_moments, detect_drift_moments
+
+@task
+def detect_drift(df: pd.DataFrame, config: dict = None, update: bool = True):
+    """Score a cleansed frame for drift/outliers against the running baselines and, with ``update``, update them."""
+    cfg = drift_config(config)
+    moments = column_moments(df, load_baselines(cfg["baseline_path"]), cfg)
+    drift = detect_drift_moments(moments, cfg, update)
+    print(f"Drift detection: {len(drift['flags'])} flags across {len(moments)} columns")
+    return drift
@@ -3,51 +3,91 @@ from prefect import task
 import json
 import pandas as pd
 import os
-import shutil
 from datetime import datetime
 
+from src.prefect_flows.utils import storage
+from src.prefect_flows.utils.mapped_file import MappedFile
+from src.prefect_flows.utils.metadata_probe import probe_mapped
+from src.prefect_flows.utils.report_sink import get_report_sink
+
+def _metadata_path(raw_folder: str, file_name: str) -> str:
+    metadata_file = f"{os.path.splitext(file_name)[0]}_metadata.json"
+    return os.path.join(raw_folder, "metadata", metadata_file)
+
+
+def record_metadata(metadata: dict, raw_folder: str = "./data/raw", config: dict = None, **fields) -> dict:
+    """Add later-stage facts (e.g. imputed-cell counts) to a file's metadata document."""
+    metadata.update(fields)
+    get_report_sink(config).put(_metadata_path(raw_folder, metadata["file_name"]), metadata)
+    return metadata
+
+
 @task
-def extract_metadata(file_path, raw_folder="./data/raw"):
-    """Extract metadata from the DataFrame."""
-    os.makedirs(raw_folder, exist_ok=True)
-    metadata_folder = os.path.join(raw_folder, "metadata")
-    os.makedirs(metadata_folder, exist_ok=True)
-    
+def extract_metadata(file_path, raw_folder="./data/raw", deep_profile=False, probe=None, config=None):
+    """Extract metadata from the landed file.
+
+    By default only the header line is read and rows are counted with a
+    newline scan (Parquet/Arrow files: schema and row count from the footer). ``deep_profile=True`` additionally parses the full file
+    and records dtypes, null counts and numeric summaries. A ``probe`` taken
+    with ``with_hash=True`` is reused instead of probing and hashing again.
+
+    The raw copy goes to the raw zone's storage and the metadata to the
+    report sink (batched, see ``report_sink``), both as set in ``config``. The returned
+    path is a local copy of the bytes for the later stages to map: the raw
+    copy on local disk, or the landed file when the raw zone is an object store.
+    """
+
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
+        # Map the landed file once; probing, hashing and profiling share the mapping
+        df = None
+        if probe is None or "sha256" not in probe or deep_profile:
+            with MappedFile(file_path) as mapped:
+                if probe is None or "sha256" not in probe:
+                    probe = {**probe_mapped(mapped), "sha256": mapped.sha256()}
+                df = mapped.read_frame() if deep_profile else None
+        content_hash = probe["sha256"]
         file_name = os.path.basename(file_path)
-        
-        # Save raw CSV file to raw folder
+
+        # Save raw CSV file to raw folder (a multipart upload on object stores)
         raw_file_path = os.path.join(raw_folder, file_name)
-        shutil.copy2(file_path, raw_file_path)
-        
+        storage.put_file(file_path, raw_file_path, config)
+        local_path = raw_file_path if storage.is_local(raw_file_path, config) else file_path
+
         # Extract basic metadata
         metadata = {
             "file_name": file_name,
             "file_info": {
-                "file_size_bytes": os.path.getsize(file_path),
-                "saved_path": raw_file_path
+                "file_format": probe["file_format"],
+                "file_size_bytes": probe["file_size_bytes"],
+                "sha256": content_hash,
+                "saved_path": storage.location(raw_file_path, config)
             },
             "data_structure": {
-                "row_count": len(df),
-                "column_count": len(df.columns),
-                "columns": list(df.columns)
+                "row_count": probe["row_count"],
+                "column_count": probe["column_count"],
+                "columns": probe["columns"]
             }
         }
-        
-        # Save metadata to metadata folder
-        metadata_file = f"{os.path.splitext(file_name)[0]}_metadata.json"
-        metadata_path = os.path.join(metadata_folder, metadata_file)
-        
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
-        
-        print(f"File saved to Raw Folder: {raw_file_path}")
-        print(f"Metadata saved: {metadata_path}")
-        
-        return metadata, raw_file_path  # Always returns two values
-        
+
+        if df is not None:
+            # Parsed row count is exact even with quoted multi-line values
+            metadata["data_structure"]["row_count"] = len(df)
+            metadata["profile"] = {
+                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+                "null_counts": {col: int(count) for col, count in df.isnull().sum().items()},
+                "numeric_summary": json.loads(df.describe().to_json())
+            }
+
+        # Save metadata under the metadata folder's path in the sink
+        metadata_path = _metadata_path(raw_folder, file_name)
+        sink = get_report_sink(config)
+        sink.put(metadata_path, metadata)
+
+        print(f"File saved to Raw Folder: {storage.location(raw_file_path, config)}")
+        print(f"Metadata saved: {sink.location(metadata_path)}")
+
+        return metadata, local_path  # Always returns two values
+
     except Exception as e:
         print(f"Error in extract_metadata: {str(e)}")
         # Return two values even in error case to maintain consistency
@@ -9,28 +9,9 @@ if src_path not in sys.path:
 from prefect import task
 import os
 
+from src.prefect_flows.utils.config import load_config
+
 @task
 def get_config():
     """Load configuration for data validation rules based on your actual dataset."""
-    config = {
-        "valid_ranges": {
-            "footfall": {"min": 0, "max": 1000},
-            "tempMode": {"min": 0, "max": 10},
-            "AQ": {"min": 0, "max": 10},
-            "USS": {"min": 0, "max": 10},
-            "CS": {"min": 0, "max": 10},
-            "VOC": {"min": 0, "max": 100},
-            "RP": {"min": 0, "max": 100},
-            "IP": {"min": 0, "max": 10},
-            "Temperature": {"min": 0, "max": 50}
-        },
-        "required_columns": [
-            "footfall", "tempMode", "AQ", "USS", "CS", 
-            "VOC", "RP", "IP", "Temperature", "fail"
-        ],
-        "categorical_columns": {
-            "tempMode": [0, 1, 2, 3, 4, 5, 6, 7],
-            "fail": [0, 1]
-        }
-    }
-    return config
\ No newline at end of file
+    return load_config()
@@ -2,23 +2,25 @@ from prefect import task
 import pandas as pd
 import os
 
+from src.prefect_flows.utils.parquet_dataset import write_table
+
 @task
-def save_data(df: pd.DataFrame, metadata: dict, output_dir: str = "data/cleansed"):
-    """Save processed data as Parquet file."""
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+def save_data(df: pd.DataFrame, metadata: dict, output_dir: str = "data/cleansed", config: dict = None):
+    """Save processed data as Parquet file.
     
+    Sort keys, row group size, statistics and page index come from
+    ``config['parquet']``; without a config pyarrow defaults are used.
+    The file goes to the cleansed zone's storage; the returned path is
+    its object-store URI when that zone is not on local disk.
+    """
     # Generate output filename - use the original filename but change extension
     input_filename = metadata['file_name']
-    base_filename = input_filename.replace('.csv', '')
+    base_filename = os.path.splitext(input_filename)[0]
     output_filename = f"{base_filename}_processed.parquet"
     output_path = os.path.join(output_dir, output_filename)
     
-    # Ensure the directory exists (double-check)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    # Save as Parquet
-    df.to_parquet(output_path, index=False)
+    # Save as Parquet (write_table creates local directories as needed)
+    output_path = write_table(df, output_path, (config or {}).get("parquet"), config=config)
     print(f"Data saved as Parquet: {output_path}")
     
     return output_path
\ No newline at end of file
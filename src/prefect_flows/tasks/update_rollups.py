@@ -0,0 +1,17 @@
+from prefect import task
+import pandas as pd
+import os
+
+from src.prefect_flows.utils.rollups import ROLLUP_PATH, compute_rollup, merge_rollup
+
+@task
+def update_rollups(df: pd.DataFrame, output_path: str, rollup_path: str = ROLLUP_PATH, output_prefix: str = None):
+    """Fold a freshly saved output into the per-day / per-tempMode rollup table.
+
+    ``output_prefix`` names the whole file output ``output_path`` belongs to;
+    see ``merge_rollup``.
+    """
+    rollup = compute_rollup(df, os.path.normpath(output_path))
+    merge_rollup(rollup, rollup_path, output_prefix)
+    print(f"Rollups updated with {len(rollup)} groups from {output_path}: {rollup_path}")
+    return rollup_path
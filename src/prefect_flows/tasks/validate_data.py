@@ -6,6 +6,19 @@ from great_expectations.core.expectation_suite import ExpectationSuite
 import json
 import os
 
+from src.prefect_flows.utils.parallel_validation import DEFAULT_PARALLEL_CONFIG, map_shards
+from src.prefect_flows.utils.report_renderer import store_report, submit_html_report
+
+DEFAULT_RESULT_CONFIG = {
+    "result_format": "COMPLETE",    # "BOOLEAN_ONLY", "BASIC", "SUMMARY" or "COMPLETE"
+    "complete_row_limit": 100000,   # COMPLETE is downgraded to SUMMARY above this many rows
+    "max_unexpected_examples": 20   # sampled unexpected values/indexes kept per expectation
+}
+
+# Per-expectation result fields that grow with the number of bad rows
+UNBOUNDED_RESULT_KEYS = ["unexpected_list", "unexpected_index_list", "unexpected_rows",
+                         "partial_unexpected_list", "partial_unexpected_index_list"]
+
 @task
 def validate_data(df: pd.DataFrame, config: dict):
     """Validate data using Great Expectations with comprehensive validation suite."""
@@ -17,19 +30,118 @@ def validate_data(df: pd.DataFrame, config: dict):
     # Create expectation suite
     expectation_suite = create_expectation_suite(config)
     
-    # Run validation
-    validation_results = gdf.validate(
-        expectation_suite=expectation_suite,
-        result_format="COMPLETE",
-        only_return_failures=False
+    # Pick result granularity, downgrading COMPLETE on large frames
+    result_config = {**DEFAULT_RESULT_CONFIG, **config.get("ge_validation", {})}
+    result_format = resolve_result_format(len(df), result_config)
+    
+    # Run validation, sharding expectations by column across workers for large frames
+    validation_results = run_expectation_suite(
+        df, gdf, expectation_suite, result_format, config.get("parallel_validation")
+    )
+    validation_results = bound_validation_results(
+        validation_results, result_config["max_unexpected_examples"]
     )
     
     # Generate comprehensive validation report
     validation_report = generate_validation_report(validation_results, df)
     
+    # Store the report data; HTML is rendered on demand (GET /reports/{id}) or,
+    # if configured, by the background renderer - never inline here
+    report_id = store_report(validation_report, f"ge_validation_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S_%f')}",
+                             config=config)
+    validation_report["report_id"] = report_id
+    if config.get("html_report", {}).get("prerender"):
+        submit_html_report(validation_report)
+    
     print("Validation completed")
     return validation_report
 
+def resolve_result_format(n_rows: int, result_config: dict) -> dict:
+    """Build the GE result_format, downgrading COMPLETE to SUMMARY above the row limit.
+    
+    SUMMARY still carries a sample of ``max_unexpected_examples`` unexpected
+    values per expectation, so reports keep concrete examples.
+    """
+    result_format = result_config["result_format"]
+    if result_format == "COMPLETE" and n_rows > result_config["complete_row_limit"]:
+        print(f"{n_rows} rows exceed complete_row_limit={result_config['complete_row_limit']}, "
+              f"using SUMMARY result format")
+        result_format = "SUMMARY"
+    return {
+        "result_format": result_format,
+        "partial_unexpected_count": result_config["max_unexpected_examples"]
+    }
+
+def bound_validation_results(validation_results, max_examples: int) -> dict:
+    """Convert validation results to plain JSON and cap every per-row list at ``max_examples``.
+    
+    Capped lists are flagged with ``<key>_truncated``; the exact
+    ``unexpected_count`` is always preserved.
+    """
+    if hasattr(validation_results, "to_json_dict"):
+        validation_results = validation_results.to_json_dict()
+    for result in validation_results["results"]:
+        details = result.get("result") or {}
+        for key in UNBOUNDED_RESULT_KEYS:
+            values = details.get(key)
+            if isinstance(values, list) and len(values) > max_examples:
+                details[key] = values[:max_examples]
+                details[f"{key}_truncated"] = True
+    return validation_results
+
+def _validate_expectation_shard(job):
+    """Worker entry point: validate one column's expectations against that column only."""
+    df_subset, expectations, result_format = job
+    suite = ExpectationSuite(expectation_suite_name="sensor_data_validation_shard", expectations=expectations)
+    results = ge.from_pandas(df_subset).validate(
+        expectation_suite=suite,
+        result_format=result_format,
+        only_return_failures=False
+    )
+    return [result.to_json_dict() for result in results["results"]]
+
+def run_expectation_suite(df: pd.DataFrame, gdf, expectation_suite: ExpectationSuite,
+                          result_format, parallel_config: dict = None):
+    """Validate the suite, sharding expectations by column when the frame is large.
+    
+    Each shard only receives the columns its expectations touch. Shard
+    results are concatenated in shard order, which matches the column-grouped
+    order Great Expectations itself reports results in.
+    """
+    cfg = {**DEFAULT_PARALLEL_CONFIG, **(parallel_config or {})}
+    if cfg["backend"] == "serial" or len(df) < cfg["parallel_threshold_rows"]:
+        return gdf.validate(
+            expectation_suite=expectation_suite,
+            result_format=result_format,
+            only_return_failures=False
+        )
+    
+    # Group expectations by column in order of first appearance
+    shards = {}
+    for expectation in expectation_suite.expectations:
+        shards.setdefault(expectation.kwargs.get("column"), []).append(expectation)
+    
+    jobs = []
+    for column, expectations in shards.items():
+        # Missing columns get an empty frame so existence checks still fail
+        columns = [column] if column in df.columns else []
+        jobs.append((df[columns], expectations, result_format))
+    shard_results = map_shards(_validate_expectation_shard, jobs, cfg["backend"], cfg["max_workers"])
+    
+    results = [result for shard in shard_results for result in shard]
+    successful = sum(1 for result in results if result["success"])
+    return {
+        "success": successful == len(results),
+        "results": results,
+        "statistics": {
+            "evaluated_expectations": len(results),
+            "successful_expectations": successful,
+            "unsuccessful_expectations": len(results) - successful,
+            "success_percent": (successful / len(results)) * 100 if results else None
+        },
+        "meta": {"expectation_suite_name": expectation_suite.expectation_suite_name}
+    }
+
 def create_expectation_suite(config: dict) -> ExpectationSuite:
     """Create a comprehensive expectation suite for sensor data."""
     
@@ -157,9 +269,6 @@ def generate_validation_report(validation_results: dict, df: pd.DataFrame) -> di
     # Data quality score
     quality_score = calculate_data_quality_score(validation_results, df)
     
-    # Generate HTML report (optional)
-    generate_html_report(validation_results)
-    
     return {
         "summary": {
             "success": success,
@@ -221,64 +330,6 @@ def generate_recommendations(failed_expectations: list) -> list:
     
     return recommendations
 
-def generate_html_report(validation_results: dict):
-    """Generate HTML validation report for documentation."""
-    
-    report_dir = "validation_reports"
-    os.makedirs(report_dir, exist_ok=True)
-    
-    # Simple HTML report
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Data Validation Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-            .success {{ color: green; }}
-            .failure {{ color: red; }}
-            .warning {{ color: orange; }}
-            table {{ border-collapse: collapse; width: 100%; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-            th {{ background-color: #f2f2f2; }}
-        </style>
-    </head>
-    <body>
-        <h1>Data Validation Report</h1>
-        <p>Generated on: {pd.Timestamp.now()}</p>
-        
-        <h2>Summary</h2>
-        <p>Overall Success: <span class="{'success' if validation_results['success'] else 'failure'}">
-            {validation_results['success']}
-        </span></p>
-        <p>Successful Expectations: {sum(1 for r in validation_results['results'] if r['success'])} / {len(validation_results['results'])}</p>
-        
-        <h2>Detailed Results</h2>
-        <table>
-            <tr>
-                <th>Expectation</th>
-                <th>Status</th>
-                <th>Details</th>
-            </tr>
-            {"".join([
-                f"<tr><td>{r['expectation_config']['expectation_type']}</td>"
-                f"<td class={'success' if r['success'] else 'failure'}>{r['success']}</td>"
-                f"<td>{r['result'].get('observed_value', 'N/A')}</td></tr>"
-                for r in validation_results['results']
-            ])}
-        </table>
-    </body>
-    </html>
-    """
-    
-    timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-    report_path = f"{report_dir}/validation_report_{timestamp}.html"
-    
-    with open(report_path, "w") as f:
-        f.write(html_content)
-    
-    print(f"HTML validation report saved: {report_path}")
-
 @task
 def validate_data_with_great_expectations(cleansed_file_path, config: dict):
     """Alternative: Use Great Expectations with data context."""
@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+import tarfile
+import zipfile
+
+from src.prefect_flows.utils.file_formats import is_supported
+from src.prefect_flows.utils.sites import BATCHES_DIR
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar.gz", ".tgz")
+
+DEFAULT_BULK_UPLOAD_CONFIG = {
+    "max_files": 1000,
+    "max_total_bytes": 2 * 1024 ** 3
+}
+
+
+class BatchLimitExceeded(Exception):
+    """A bulk upload has more files or more (extracted) bytes than allowed."""
+
+
+def bulk_upload_config(config: dict = None) -> dict:
+    return {**DEFAULT_BULK_UPLOAD_CONFIG, **((config or {}).get("bulk_upload") or {})}
+
+
+def is_archive(file_name: str) -> bool:
+    return file_name.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def is_batch_member(file_path: str) -> bool:
+    """A CSV inside a batch folder; it is ingested through its batch manifest, not on its own."""
+    return BATCHES_DIR in os.path.normpath(os.path.dirname(file_path)).split(os.sep)[:-1]
+
+
+def is_batch_manifest(file_path: str) -> bool:
+    return file_path.endswith(".json") and os.path.basename(os.path.dirname(file_path)) == BATCHES_DIR
+
+
+def _iter_archive(fileobj, file_name: str):
+    """(member name, readable stream) for every regular data file in an archive, in archive order."""
+    if file_name.lower().endswith(".zip"):
+        # Zip keeps its directory at the end, so the upload's spooled file is read with seeks
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and is_supported(info.filename):
+                    with archive.open(info) as member:
+                        yield info.filename, member
+    else:
+        # Tar is read strictly front to back, one member at a time
+        with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+            for info in archive:
+                if info.isfile() and is_supported(info.name):
+                    yield info.name, archive.extractfile(info)
+
+
+def stage_batch(uploads: list, staging_dir: str, config: dict = None) -> tuple:
+    """Copy uploaded data files and those inside uploaded archives into ``staging_dir``.
+
+    ``uploads`` are ``(file name, readable stream)`` pairs. Archives are
+    extracted member by member straight into staging; nothing else is kept.
+    Member paths are flattened to their base name. Returns the staged paths
+    and ``(name, reason)`` for every entry that was skipped. Raises
+    ``BatchLimitExceeded`` past ``max_files`` or ``max_total_bytes``.
+    """
+    limits = bulk_upload_config(config)
+    os.makedirs(staging_dir, exist_ok=True)
+    staged, skipped = [], []
+    total_bytes = 0
+
+    def entries():
+        for file_name, stream in uploads:
+            if is_archive(file_name):
+                yield from _iter_archive(stream, file_name)
+            elif is_supported(file_name):
+                yield file_name, stream
+            else:
+                skipped.append((file_name, "Only CSV, Parquet and Arrow files and zip/tar.gz archives are allowed"))
+
+    for name, stream in entries():
+        base_name = os.path.basename(name)
+        target = os.path.join(staging_dir, base_name)
+        if not base_name or base_name.startswith("."):
+            skipped.append((name, "Invalid file name"))
+            continue
+        if os.path.exists(target):
+            skipped.append((name, f"Duplicate file name in batch: {base_name}"))
+            continue
+        if len(staged) >= limits["max_files"]:
+            raise BatchLimitExceeded(f"Batch has more than {limits['max_files']} files")
+        with open(target, "wb") as f:
+            while True:
+                block = stream.read(1024 * 1024)
+                if not block:
+                    break
+                total_bytes += len(block)
+                if total_bytes > limits["max_total_bytes"]:
+                    raise BatchLimitExceeded(f"Batch is larger than {limits['max_total_bytes']} bytes")
+                f.write(block)
+        staged.append(target)
+    return staged, skipped
+
+
+def land_batch(staging_dir: str, landing_dir: str, manifest: dict) -> str:
+    """Move a staged batch into ``<landing_dir>/_batches/`` and publish its manifest there.
+
+    The files move as one folder, then the manifest lands last, so the
+    watcher sees a single event for the whole batch once every file is in
+    place. ``manifest['files']`` lists ``{"file_name", "job_id"}`` entries.
+    Returns the manifest path.
+    """
+    batch_id = manifest["batch_id"]
+    batches_dir = os.path.join(landing_dir, BATCHES_DIR)
+    batch_dir = os.path.join(batches_dir, batch_id)
+    os.makedirs(batches_dir, exist_ok=True)
+    shutil.move(staging_dir, batch_dir)
+
+    # Written outside the watched tree, then moved in complete
+    staged_manifest = f"{staging_dir}.json"
+    with open(staged_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    manifest_path = os.path.join(batches_dir, f"{batch_id}.json")
+    shutil.move(staged_manifest, manifest_path)
+    return manifest_path
+
+
+def load_batch(manifest_path: str) -> dict:
+    """Batch manifest with each file's landed path added as ``file_path``."""
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    batch_dir = os.path.join(os.path.dirname(manifest_path), manifest["batch_id"])
+    for entry in manifest["files"]:
+        entry["file_path"] = os.path.join(batch_dir, entry["file_name"])
+    return manifest
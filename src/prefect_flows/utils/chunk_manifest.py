@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+
+MANIFEST_DIR = "./data/checkpoints/chunks"
+
+
+def _json_default(obj):
+    # numpy scalars in the validation partials
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+def manifest_path(file_path: str, manifest_dir: str = MANIFEST_DIR) -> str:
+    """Manifest location for one source file (unique per absolute path)."""
+    path_hash = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    return os.path.join(manifest_dir, f"{os.path.basename(file_path)}-{path_hash}.json")
+
+
+def file_identity(file_path: str) -> dict:
+    """Size and modification time; a manifest only applies to the exact file it was started on."""
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def load_manifest(file_path: str, chunk_bytes: int, columns: list, manifest_dir: str = MANIFEST_DIR) -> dict:
+    """Resume state for ``file_path``, or a fresh manifest if the file or chunking changed.
+
+    ``chunks`` maps ``"<start>-<end>"`` to the committed part, its row count
+    and validation partials.
+    """
+    fresh = {
+        "file_path": os.path.abspath(file_path),
+        **file_identity(file_path),
+        "chunk_bytes": chunk_bytes,
+        "columns": columns,
+        "chunks": {}
+    }
+    path = manifest_path(file_path, manifest_dir)
+    if not os.path.exists(path):
+        return fresh
+    with open(path) as f:
+        manifest = json.load(f)
+    unchanged = all(manifest.get(key) == fresh[key] for key in ("size", "mtime_ns", "chunk_bytes", "columns"))
+    return manifest if unchanged else fresh
+
+
+def save_manifest(manifest: dict, manifest_dir: str = MANIFEST_DIR):
+    """Atomically record the manifest after a chunk's part has been committed."""
+    os.makedirs(manifest_dir, exist_ok=True)
+    path = manifest_path(manifest["file_path"], manifest_dir)
+    # Write-then-rename so a crash never leaves a truncated manifest
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, default=_json_default)
+    os.replace(tmp_path, path)
+
+
+def remove_manifest(file_path: str, manifest_dir: str = MANIFEST_DIR):
+    path = manifest_path(file_path, manifest_dir)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,163 @@
+# src/prefect_flows/utils/config.py
+# Plain (Prefect-free) pipeline configuration, so light entry points such as
+# the upload app can read it without importing the orchestration stack.
+
+
+def load_config() -> dict:
+    """Load configuration for data validation rules based on your actual dataset."""
+    config = {
+        "valid_ranges": {
+            "footfall": {"min": 0, "max": 1000},
+            "tempMode": {"min": 0, "max": 10},
+            "AQ": {"min": 0, "max": 10},
+            "USS": {"min": 0, "max": 10},
+            "CS": {"min": 0, "max": 10},
+            "VOC": {"min": 0, "max": 100},
+            "RP": {"min": 0, "max": 100},
+            "IP": {"min": 0, "max": 10},
+            "Temperature": {"min": 0, "max": 50}
+        },
+        "required_columns": [
+            "footfall", "tempMode", "AQ", "USS", "CS", 
+            "VOC", "RP", "IP", "Temperature", "fail"
+        ],
+        "schema_registry": {
+            # Canonical cleansed columns and their Parquet types; every firmware version is conformed to these
+            "columns": {
+                "footfall": "float64", "tempMode": "int64", "AQ": "float64", "USS": "float64",
+                "CS": "float64", "VOC": "float64", "RP": "float64", "IP": "float64",
+                "Temperature": "float64", "fail": "int64"
+            },
+            # Source schemas by firmware version: the canonical columns each sends and its column names
+            "versions": [
+                {"version": 1,
+                 "columns": ["footfall", "tempMode", "AQ", "USS", "CS", "VOC", "RP", "IP", "Temperature", "fail"],
+                 "aliases": {}}
+                # e.g. a firmware that renames a column and adds one (declared in "columns" above):
+                # {"version": 2, "columns": [..., "Temperature", "fail", "Humidity"],
+                #  "aliases": {"temp_c": "Temperature"}}
+            ],
+            "unknown_columns": "drop"  # or "keep" them after the canonical columns
+        },
+        "categorical_columns": {
+            "tempMode": [0, 1, 2, 3, 4, 5, 6, 7],
+            "fail": [0, 1]
+        },
+        "imputation": {
+            "default": "mean",          # "mean", "median", "ffill", "group_mean" or "none"
+            "columns": {},              # per-column overrides, e.g. {"Temperature": "group_mean"}
+            "group_column": "tempMode"  # groups for "group_mean"
+        },
+        "csv_reader": {
+            "engine": "pyarrow",  # "pandas" uses the single-threaded pd.read_csv
+            "threads": None,      # block sizing only (parsing uses the shared Arrow pool); 1 parses inline
+            "block_size": None    # None sizes parse blocks from the file size
+        },
+        "metadata": {
+            "deep_profile": False  # True parses the whole file for dtypes/nulls/summaries
+        },
+        "micro_batch": {
+            "batch_size": 500,           # flush once this many records are buffered...
+            "max_latency_seconds": 1.0,  # ...or once the oldest record has waited this long
+            "output_dir": "data/cleansed/stream",
+            "quarantine_dir": "data/quarantine/stream"  # rejected batches, kept for replay
+        },
+        "parquet": {
+            # Sorting clusters failures and temperature ranges into few row groups
+            "sort_by": ["fail", "Temperature"],
+            "row_group_size": 64 * 1024,
+            "data_page_size": 64 * 1024,
+            "write_statistics": True,
+            "write_page_index": True
+        },
+        "parallel_validation": {
+            "backend": "thread",                # "serial", "thread" or "process" (shared-memory columns)
+            "max_workers": None,                # None uses every core
+            "parallel_threshold_rows": 100000,  # smaller frames are validated inline
+            "rows_per_shard": 250000            # tall columns are split into row ranges of this size
+        },
+        "drift_detection": {
+            "enabled": True,
+            "columns": ["footfall", "AQ", "USS", "CS", "VOC", "RP", "IP", "Temperature"],
+            "alpha": 0.1,              # EWMA weight of each new file once the baseline is warm
+            "warmup_files": 3,         # files averaged into a new baseline before anything is flagged
+            "drift_threshold": 1.0,    # flag when a file's mean moves this many baseline std devs
+            "outlier_z": 4.0,          # readings beyond this many std devs count as outliers
+            "max_outlier_rate": 0.01,  # flag when more than this fraction of readings are outliers
+            "baseline_path": "./data/baselines/sensor_baselines.json"
+        },
+        "ge_validation": {
+            "result_format": "COMPLETE",    # "BOOLEAN_ONLY", "BASIC", "SUMMARY" or "COMPLETE"
+            "complete_row_limit": 100000,   # COMPLETE is downgraded to SUMMARY above this many rows
+            "max_unexpected_examples": 20   # unexpected values/indexes kept per expectation
+        },
+        "html_report": {
+            "prerender": False  # True renders HTML on a background worker after validation
+        },
+        "chunked_ingestion": {
+            "threshold_bytes": 1024 ** 3,   # larger files are ingested chunk by chunk with checkpoints
+            "chunk_bytes": 128 * 1024 ** 2,  # newline-aligned byte ranges parsed, validated and written at a time
+            "global_imputation_stats": True  # extra first pass so every chunk is filled from whole-file statistics
+        },
+        "sites": {
+            # Files in data/landing/<site>/ belong to <site>; files directly in data/landing to "default"
+            "max_concurrent_per_site": None,  # workers one site may occupy at once; None allows half of them
+                                              # while other sites have work queued, and all of them otherwise
+            "overrides": {
+                # "plant_a": {
+                #     "max_concurrent": 1,
+                #     "validation_rules": {"Temperature": {"min_value": -20, "max_value": 120}}
+                # }
+            }
+        },
+        "scheduler": {
+            "fast_lane_max_bytes": 10 * 1024 ** 2,  # files up to this size may use the fast lane...
+            "fast_lane_workers": 1,                 # ...which keeps this many workers free of larger files
+            "initial_throughput_bytes_per_second": 20 * 1024 ** 2,  # refined from finished jobs for ETAs
+            "status_path": "./data/queue/status.json",
+            "priority_hints_path": "./data/queue/priorities.json"
+        },
+        "bulk_upload": {
+            "max_files": 1000,                # files per bulk upload, counting archive members
+            "max_total_bytes": 2 * 1024 ** 3  # extracted bytes per bulk upload
+        },
+        "job_store": {
+            "db_path": "./data/jobs/jobs.db",  # lifecycle of every landed file, served by /jobs
+            "poll_interval_seconds": 0.5       # how often /jobs/events checks for new status changes
+        },
+        "storage": {
+            # Each zone keeps its local root; set "uri" (e.g. "s3://lake/raw") to store it in an
+            # S3-compatible object store instead. Tail and chunked ingestion need local zones.
+            "zones": {
+                "raw": {"root": "./data/raw", "uri": None},
+                "cleansed": {"root": "data/cleansed", "uri": None},
+                "reports": {"root": "./data/reports", "uri": None}
+            },
+            "s3": {
+                "endpoint_override": None,         # e.g. "localhost:9000" for a local MinIO emulator
+                "scheme": "https",
+                "region": None,
+                "access_key": None,                # None uses the AWS environment/credential chain
+                "secret_key": None,
+                "part_size_bytes": 16 * 1024 ** 2,  # multipart upload part size
+                "io_threads": 16                   # parallel requests, shared connection pool
+            }
+        },
+        "report_sink": {
+            # Metadata and JSON report documents (prerendered HTML is always written as files)
+            "backend": "sqlite",               # one embedded database; "files" writes each through storage
+            "db_path": "./data/sink/documents.db",
+            "durability": "batched",           # "batched": committed every flush interval, at most one
+                                               # interval lost on a crash; "commit": committed on each write;
+                                               # "sync": committed and fsynced on each write
+            "flush_interval_seconds": 1.0,
+            "max_batch_documents": 200
+        },
+        "task_cache": {
+            "enabled": False,             # reuse stage outputs for inputs already processed with this config
+            "cache_dir": "./data/cache",  # holds a Parquet copy of each cached file's cleansed frame
+            "max_bytes": 1024 ** 3,       # least recently used entries are evicted above this size
+            "max_age_seconds": 7 * 24 * 3600  # and entries unused for this long
+        }
+    }
+    return config
@@ -0,0 +1,69 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+
+MIN_BLOCK_SIZE = 1 << 20    # 1 MiB
+MAX_BLOCK_SIZE = 64 << 20   # 64 MiB
+BLOCKS_PER_THREAD = 4
+
+
+def _block_size_for(source, threads: int) -> int:
+    """Pick a block size that gives every parser thread a few blocks to work on."""
+    try:
+        # Arrow files and buffers (e.g. a memory mapping) know their own size
+        file_size = source.size() if isinstance(source, pa.NativeFile) else os.path.getsize(source)
+    except (TypeError, OSError):
+        # Unsized file object - fall back to the largest block
+        return MAX_BLOCK_SIZE
+    block_size = file_size // max(threads * BLOCKS_PER_THREAD, 1)
+    return max(MIN_BLOCK_SIZE, min(MAX_BLOCK_SIZE, block_size))
+
+
+def read_csv_table(source, block_size: int = None, threads: int = None,
+                   column_names: list = None) -> pa.Table:
+    """Parse a CSV file into an Arrow table on all available cores.
+
+    The pyarrow reader splits the input at newline-aligned byte offsets into
+    blocks of ``block_size`` bytes and parses the blocks in parallel on the
+    Arrow CPU thread pool. Parsed chunks are kept in file order, so the row
+    order of the table always matches the source file.
+
+    ``threads`` does not cap the threads used: any value above 1 parses on
+    the shared Arrow CPU pool, which runs as many blocks at once as it has
+    threads (``pa.cpu_count()``). It only sets the block size (about
+    ``BLOCKS_PER_THREAD`` blocks per thread, so fewer threads means fewer,
+    larger blocks). With 1 the file is parsed on the calling thread. The
+    pool size is process-wide and is not changed here, because long-lived
+    workers share it with validation and Parquet writes.
+
+    Pass ``column_names`` to parse a headerless byte range of a file.
+    """
+    threads = min(threads, pa.cpu_count()) if threads else pa.cpu_count()
+
+    read_options = pv.ReadOptions(
+        use_threads=threads > 1,
+        block_size=block_size or _block_size_for(source, threads),
+        column_names=column_names
+    )
+    return pv.read_csv(source, read_options=read_options)
+
+
+def read_csv_frame(source, config: dict = None, column_names: list = None) -> pd.DataFrame:
+    """Read a CSV file into a DataFrame using the engine configured in ``csv_reader``."""
+    reader_config = (config or {}).get("csv_reader", {})
+
+    if reader_config.get("engine", "pyarrow") != "pyarrow":
+        if column_names:
+            return pd.read_csv(source, names=column_names, header=None)
+        return pd.read_csv(source)
+
+    table = read_csv_table(
+        source,
+        block_size=reader_config.get("block_size"),
+        threads=reader_config.get("threads"),
+        column_names=column_names
+    )
+    # split_blocks avoids consolidating columns into one 2D block (an extra copy)
+    # and self_destruct releases each Arrow column as soon as it is converted
+    return table.to_pandas(split_blocks=True, self_destruct=True)
@@ -0,0 +1,153 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from src.prefect_flows.utils.file_lock import file_lock
+
+BASELINE_PATH = "./data/baselines/sensor_baselines.json"
+
+DEFAULT_DRIFT_CONFIG = {
+    "columns": ["footfall", "AQ", "USS", "CS", "VOC", "RP", "IP", "Temperature"],
+    "alpha": 0.1,              # EWMA weight of each new file once the baseline is warm
+    "warmup_files": 3,         # files averaged into a new baseline before anything is flagged
+    "drift_threshold": 1.0,    # flag when the file mean moves this many baseline std devs
+    "outlier_z": 4.0,          # readings further than this many std devs count as outliers
+    "max_outlier_rate": 0.01,  # flag when more than this fraction of readings are outliers
+    "baseline_path": BASELINE_PATH
+}
+
+
+def drift_config(config: dict = None) -> dict:
+    return {**DEFAULT_DRIFT_CONFIG, **((config or {}).get("drift_detection") or {})}
+
+
+def load_baselines(baseline_path: str = BASELINE_PATH) -> dict:
+    """Per-column EWMA baselines: ``{column: {"mean", "var", "files"}}``."""
+    if not os.path.exists(baseline_path):
+        return {}
+    with open(baseline_path) as f:
+        return json.load(f)
+
+
+def _save_baselines(baselines: dict, baseline_path: str):
+    tmp_path = f"{baseline_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(baselines, f, indent=2)
+    os.replace(tmp_path, baseline_path)
+
+
+def column_moments(df: pd.DataFrame, baselines: dict, cfg: dict) -> dict:
+    """Count, mean, sum of squared deviations and baseline outliers per column.
+
+    Constant size per column, and mergeable across chunks with
+    ``merge_moments`` because outliers are counted against the baseline as
+    it was when the file started.
+    """
+    moments = {}
+    for col in [col for col in cfg["columns"] if col in df.columns]:
+        values = df[col].to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        count = len(values)
+        mean = float(values.mean()) if count else 0.0
+        baseline = baselines.get(col)
+        outliers = 0
+        if baseline and baseline["files"] >= cfg["warmup_files"] and baseline["var"] > 0:
+            threshold = cfg["outlier_z"] * np.sqrt(baseline["var"])
+            outliers = int(np.count_nonzero(np.abs(values - baseline["mean"]) > threshold))
+        moments[col] = {
+            "count": count,
+            "mean": mean,
+            "m2": float(((values - mean) ** 2).sum()) if count else 0.0,
+            "outliers": outliers
+        }
+    return moments
+
+
+def merge_moments(first: dict, second: dict) -> dict:
+    """Combine the moments of two chunks (parallel variance update)."""
+    merged = {}
+    for col in set(first) | set(second):
+        a = first.get(col, {"count": 0, "mean": 0.0, "m2": 0.0, "outliers": 0})
+        b = second.get(col, {"count": 0, "mean": 0.0, "m2": 0.0, "outliers": 0})
+        count = a["count"] + b["count"]
+        delta = b["mean"] - a["mean"]
+        merged[col] = {
+            "count": count,
+            "mean": a["mean"] + delta * b["count"] / count if count else 0.0,
+            "m2": a["m2"] + b["m2"] + delta ** 2 * a["count"] * b["count"] / count if count else 0.0,
+            "outliers": a["outliers"] + b["outliers"]
+        }
+    return merged
+
+
+def score_moments(moments: dict, baselines: dict, cfg: dict) -> dict:
+    """Drift score and outlier rate of one file against the baselines."""
+    columns, flags = {}, []
+    for col, m in moments.items():
+        baseline = baselines.get(col)
+        warm = bool(baseline and baseline["files"] >= cfg["warmup_files"] and baseline["var"] > 0)
+        entry = {
+            "file_mean": m["mean"],
+            "baseline_mean": baseline["mean"] if baseline else None,
+            "baseline_std": float(np.sqrt(baseline["var"])) if baseline else None,
+            "drift_score": None,
+            "outlier_rate": m["outliers"] / m["count"] if m["count"] else 0.0,
+            "drift": False,
+            "outliers": False
+        }
+        if warm and m["count"]:
+            entry["drift_score"] = abs(m["mean"] - baseline["mean"]) / entry["baseline_std"]
+            entry["drift"] = entry["drift_score"] > cfg["drift_threshold"]
+            entry["outliers"] = entry["outlier_rate"] > cfg["max_outlier_rate"]
+        if entry["drift"]:
+            flags.append(f"Column '{col}' drifted: mean {m['mean']:.2f} vs baseline {baseline['mean']:.2f} "
+                         f"({entry['drift_score']:.1f} std)")
+        if entry["outliers"]:
+            flags.append(f"Column '{col}' has {entry['outlier_rate']:.1%} outliers beyond {cfg['outlier_z']} std")
+        columns[col] = entry
+    return {"columns": columns, "flags": flags}
+
+
+def update_baselines(baselines: dict, moments: dict, cfg: dict) -> dict:
+    """Fold one file's mean/variance into the EWMA baselines.
+
+    Until ``warmup_files`` files are seen every file has equal weight, then
+    each new file gets weight ``alpha``.
+    """
+    for col, m in moments.items():
+        if not m["count"]:
+            continue
+        file_var = m["m2"] / m["count"]
+        baseline = baselines.get(col)
+        if baseline is None:
+            baselines[col] = {"mean": m["mean"], "var": file_var, "files": 1}
+            continue
+        weight = max(cfg["alpha"], 1 / (baseline["files"] + 1))
+        delta = m["mean"] - baseline["mean"]
+        baseline["mean"] += weight * delta
+        # Exponentially weighted variance including the shift of the mean
+        baseline["var"] = (1 - weight) * (baseline["var"] + weight * delta ** 2) + weight * file_var
+        baseline["files"] += 1
+    return baselines
+
+
+def detect_drift_moments(moments: dict, cfg: dict, update: bool = True) -> dict:
+    """Score moments against the persisted baselines, then update and persist them.
+
+    Callers pass ``update=False`` for data that failed validation, so
+    out-of-range files never shift the baselines and hide later drift.
+    """
+    with file_lock(cfg["baseline_path"]):
+        baselines = load_baselines(cfg["baseline_path"])
+        result = score_moments(moments, baselines, cfg)
+        if update:
+            _save_baselines(update_baselines(baselines, moments, cfg), cfg["baseline_path"])
+    return result
+
+
+def attach_drift(validation_results: dict, drift: dict) -> dict:
+    """Add drift/outlier flags to a validation result as warnings (they never fail a file)."""
+    validation_results["drift"] = drift
+    validation_results["warnings"].extend(drift["flags"])
+    return validation_results
@@ -0,0 +1,20 @@
+import os
+
+# Kept free of heavy imports: the watcher and the upload API only need the file filter
+
+COLUMNAR_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",    # Arrow IPC file format
+    ".feather": "arrow",  # Feather v2 is the Arrow IPC file format
+    ".ipc": "arrow"
+}
+SUPPORTED_EXTENSIONS = (".csv",) + tuple(COLUMNAR_FORMATS)
+
+
+def file_format(file_path: str) -> str:
+    """'csv', 'parquet' or 'arrow', from the file extension."""
+    return COLUMNAR_FORMATS.get(os.path.splitext(file_path)[1].lower(), "csv")
+
+
+def is_supported(file_path: str) -> bool:
+    return file_path.lower().endswith(SUPPORTED_EXTENSIONS)
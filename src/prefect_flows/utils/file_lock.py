@@ -0,0 +1,27 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+# One in-process lock per protected file, shared by watcher and micro-batch threads
+_thread_locks = {}
+_registry_lock = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str):
+    """Serialize read-modify-write of ``path`` across threads and worker processes.
+
+    Holds an in-process lock plus an exclusive ``flock`` on ``<path>.lock``.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _registry_lock:
+        thread_lock = _thread_locks.setdefault(os.path.abspath(path), threading.Lock())
+    with thread_lock, open(f"{path}.lock", "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+STRATEGIES = ("mean", "median", "ffill", "group_mean", "none")
+
+DEFAULT_IMPUTATION_CONFIG = {
+    "default": "mean",         # strategy for numeric columns not listed in "columns"
+    "columns": {},             # per-column strategy, e.g. {"Temperature": "group_mean"}
+    "group_column": "tempMode"
+}
+
+
+def _config(imputation_config: dict = None) -> dict:
+    return {**DEFAULT_IMPUTATION_CONFIG, **(imputation_config or {})}
+
+
+def imputation_plan(df: pd.DataFrame, imputation_config: dict = None) -> dict:
+    """Strategy per numeric column of ``df``; columns set to "none" are left out."""
+    cfg = _config(imputation_config)
+    plan = {}
+    for col in df.select_dtypes(include=['number']).columns:
+        strategy = cfg["columns"].get(col, cfg["default"])
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy for column '{col}': {strategy}")
+        # A column cannot be filled from its own group means
+        if strategy == "group_mean" and col == cfg["group_column"]:
+            strategy = "mean"
+        if strategy != "none":
+            plan[col] = strategy
+    return plan
+
+
+def compute_stats(df: pd.DataFrame, imputation_config: dict = None) -> dict:
+    """Mergeable fill statistics for ``df``, gathered in one grouped pass.
+
+    Sums and counts are aggregated per group and summed into column totals,
+    so means and group means come from the same scan; medians keep exact
+    value counts. Stats of chunks combine with ``merge_stats``; the result
+    is plain JSON-serializable data so it can be stored in checkpoints.
+    """
+    cfg = _config(imputation_config)
+    plan = imputation_plan(df, cfg)
+    group = cfg["group_column"]
+    value_cols = [col for col in plan if col != group]
+
+    stats = {"columns": {}, "groups": {}, "value_counts": {}}
+    if group in df.columns and value_cols:
+        grouped = df.groupby(group, dropna=False)[value_cols].agg(["sum", "count"])
+        totals = grouped.sum()
+        for col in value_cols:
+            stats["columns"][col] = [float(totals[(col, "sum")]), int(totals[(col, "count")])]
+            if plan[col] == "group_mean":
+                stats["groups"][col] = [[None if pd.isna(key) else key, float(row_sum), int(row_count)]
+                                        for key, row_sum, row_count in zip(grouped.index.tolist(),
+                                                                           grouped[(col, "sum")],
+                                                                           grouped[(col, "count")])]
+    elif value_cols:
+        totals = df[value_cols].agg(["sum", "count"])
+        for col in value_cols:
+            stats["columns"][col] = [float(totals.at["sum", col]), int(totals.at["count", col])]
+    if group in plan:
+        stats["columns"][group] = [float(df[group].sum()), int(df[group].count())]
+
+    for col in [col for col, strategy in plan.items() if strategy == "median"]:
+        counts = df[col].value_counts()
+        stats["value_counts"][col] = [[value, int(count)] for value, count in zip(counts.index.tolist(), counts)]
+    return _plain(stats)
+
+
+def _plain(obj):
+    # numpy scalars -> Python numbers, so stats survive a JSON round trip unchanged
+    if isinstance(obj, dict):
+        return {key: _plain(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_plain(value) for value in obj]
+    return obj.item() if isinstance(obj, np.generic) else obj
+
+
+def merge_stats(first: dict, second: dict) -> dict:
+    """Combine the stats of two chunks into the stats of both."""
+    def add_pairs(a, b):
+        totals = {}
+        for key, *values in a + b:
+            current = totals.setdefault(key, [0] * len(values))
+            totals[key] = [x + y for x, y in zip(current, values)]
+        return [[key, *values] for key, values in totals.items()]
+
+    merged = {"columns": {}, "groups": {}, "value_counts": {}}
+    for col in set(first["columns"]) | set(second["columns"]):
+        a, b = first["columns"].get(col, [0.0, 0]), second["columns"].get(col, [0.0, 0])
+        merged["columns"][col] = [a[0] + b[0], a[1] + b[1]]
+    for section in ("groups", "value_counts"):
+        for col in set(first[section]) | set(second[section]):
+            merged[section][col] = add_pairs(first[section].get(col, []), second[section].get(col, []))
+    return merged
+
+
+def _median(value_counts: list):
+    """Exact median from ``[[value, count], ...]``, averaging the middle pair like pandas."""
+    if not value_counts:
+        return np.nan
+    values, counts = zip(*sorted(pair for pair in value_counts if not pd.isna(pair[0])))
+    positions = np.cumsum(counts)
+    total = positions[-1]
+    lower = values[int(np.searchsorted(positions, (total - 1) // 2, side="right"))]
+    upper = values[int(np.searchsorted(positions, total // 2, side="right"))]
+    return (lower + upper) / 2
+
+
+def impute(df: pd.DataFrame, stats: dict, imputation_config: dict = None, carry: dict = None) -> dict:
+    """Fill nulls in ``df`` in place from ``stats``; returns the imputed-cell count per column.
+
+    ``stats`` may come from ``df`` itself or from a first pass over a whole
+    file. ``carry`` holds the last reading of each forward-filled column
+    from the preceding chunk, so forward fill continues across chunk
+    boundaries. Leading gaps with no earlier reading and groups without any
+    reading fall back to the column mean.
+    """
+    cfg = _config(imputation_config)
+    plan = imputation_plan(df, cfg)
+    null_counts = df[list(plan)].isna().sum()
+    plan = {col: strategy for col, strategy in plan.items() if null_counts[col]}
+    if not plan:
+        return {}
+
+    means = {col: (total / count if count else np.nan) for col, (total, count) in stats["columns"].items()}
+    fills = {}
+    for col, strategy in plan.items():
+        if strategy == "median":
+            fills[col] = _median(stats["value_counts"].get(col, []))
+        elif strategy == "group_mean":
+            group_means = {key: total / count for key, total, count in stats["groups"].get(col, [])
+                           if count and key is not None}
+            df[col] = df[col].fillna(df[cfg["group_column"]].map(group_means))
+            fills[col] = means.get(col)
+        elif strategy == "ffill":
+            first_valid = df[col].first_valid_index()
+            previous = (carry or {}).get(col)
+            if previous is not None and first_valid != df.index[0]:
+                df.loc[df.index[0], col] = previous
+            df[col] = df[col].ffill()
+            fills[col] = means.get(col)
+        else:
+            fills[col] = means.get(col)
+
+    # One vectorized fill for every column's remaining constant fill value
+    df.fillna({col: value for col, value in fills.items() if value is not None and not pd.isna(value)},
+              inplace=True)
+    imputed = null_counts[list(plan)] - df[list(plan)].isna().sum()
+    return {col: int(count) for col, count in imputed.items() if count}
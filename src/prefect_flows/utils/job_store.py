@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+JOB_STATUSES = ("landed", "queued", "running", "succeeded", "failed")
+FINAL_STATUSES = ("succeeded", "failed")
+
+DEFAULT_JOB_STORE_CONFIG = {
+    "db_path": "./data/jobs/jobs.db",
+    "poll_interval_seconds": 0.5
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    site TEXT,
+    mode TEXT,
+    priority TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    output_path TEXT,
+    report_path TEXT,
+    validation_status TEXT,
+    error TEXT,
+    batch_id TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, updated_at);
+CREATE INDEX IF NOT EXISTS jobs_file ON jobs (file_path, created_at);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id);
+CREATE TABLE IF NOT EXISTS job_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, seq);
+"""
+
+_JOB_FIELDS = ("site", "mode", "priority", "stage", "output_path", "report_path", "validation_status", "error",
+               "batch_id")
+
+# db path -> store; the schema is created once per process
+_stores = {}
+
+
+def job_store_config(config: dict = None) -> dict:
+    return {**DEFAULT_JOB_STORE_CONFIG, **((config or {}).get("job_store") or {})}
+
+
+def get_job_store(config: dict = None) -> "JobStore":
+    db_path = job_store_config(config)["db_path"]
+    if db_path not in _stores:
+        _stores[db_path] = JobStore(db_path)
+    return _stores[db_path]
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="milliseconds")
+
+
+class JobStore:
+    """Lifecycle of every ingestion job in a SQLite database.
+
+    A job moves ``landed -> queued -> running -> succeeded | failed``; while
+    running, ``stage`` names the pipeline step. Files of a bulk upload also
+    carry the id of their batch job (mode "batch"). Every change is also appended
+    to ``job_events`` so clients can follow jobs from a sequence number
+    instead of polling each job. The upload API, the watcher's worker pool
+    and the workers all write to the same file, so each call opens its own
+    short-lived connection (WAL mode keeps readers off the writers' lock).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_JOB_STORE_CONFIG["db_path"]):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if columns and "batch_id" not in columns:
+                # Stores created before bulk uploads
+                conn.execute("ALTER TABLE jobs ADD COLUMN batch_id TEXT")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, file_path: str, status: str = "landed", job_id: str = None, **fields) -> str:
+        """Record a new job for ``file_path`` and return its id."""
+        job_id = job_id or uuid.uuid4().hex
+        now = _now()
+        columns = {key: fields.get(key) for key in _JOB_FIELDS}
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs (id, file_path, file_name, status, created_at, updated_at, {', '.join(columns)}) "
+                f"VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * len(columns))})",
+                (job_id, os.path.abspath(file_path), os.path.basename(file_path), status, now, now,
+                 *columns.values()))
+            conn.execute("INSERT INTO job_events (job_id, status, stage, at) VALUES (?, ?, ?, ?)",
+                         (job_id, status, columns["stage"], now))
+        return job_id
+
+    def update(self, job_id: str, status: str, **fields):
+        """Move a job to ``status``, setting any of the other job fields given."""
+        if status not in JOB_STATUSES:
+            raise ValueError(f"Unknown job status: {status}")
+        fields = {key: value for key, value in fields.items() if key in _JOB_FIELDS}
+        now = _now()
+        assignments = "".join(f", {key} = ?" for key in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET status = ?, updated_at = ?{assignments} WHERE id = ?",
+                         (status, now, *fields.values(), job_id))
+            conn.execute("INSERT INTO job_events (job_id, status, stage, at) VALUES (?, ?, ?, ?)",
+                         (job_id, status, fields.get("stage"), now))
+
+    def get(self, job_id: str) -> dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: str = None, site: str = None, batch_id: str = None, limit: int = 100) -> list:
+        """Most recently updated jobs, optionally only those in ``status``, of ``site`` and/or of a batch."""
+        clauses, params = [], []
+        for column, value in (("status", status), ("site", site), ("batch_id", batch_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM jobs {where} ORDER BY updated_at DESC LIMIT ?",
+                                (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def events_since(self, seq: int = 0, job_id: str = None, limit: int = 500) -> list:
+        """Status changes after sequence number ``seq``, oldest first."""
+        query = "SELECT * FROM job_events WHERE seq > ?"
+        params = [seq]
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        with self._connect() as conn:
+            rows = conn.execute(f"{query} ORDER BY seq LIMIT ?", (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def last_seq(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM job_events").fetchone()[0]
+
+    def enqueue(self, file_path: str, **fields) -> str:
+        """Mark a file as queued, reusing the job created when it landed if there is one."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT id FROM jobs WHERE file_path = ? AND status = 'landed' "
+                               "ORDER BY created_at DESC LIMIT 1", (os.path.abspath(file_path),)).fetchone()
+        if row is None:
+            return self.create(file_path, status="queued", **fields)
+        self.update(row["id"], "queued", **{key: value for key, value in fields.items() if value is not None})
+        return row["id"]
+
+    def finish(self, job_id: str, result: dict):
+        """Record a flow result: output and report paths, or the error."""
+        validation = result.get("validation") or {}
+        self.update(
+            job_id,
+            "succeeded" if result.get("status") == "success" else "failed",
+            stage=None,
+            output_path=result.get("output_path"),
+            report_path=result.get("report_path"),
+            validation_status=("PASS" if validation.get("success") else "FAIL") if validation else None,
+            error=result.get("error")
+        )
+
+    def batch_progress(self, batch_id: str, done: int, failed: int, total: int):
+        """Running stage of a batch job, or its final status once every file has finished."""
+        if done < total:
+            self.update(batch_id, "running", stage=f"{done}/{total} files done")
+        else:
+            self.update(batch_id, "failed" if failed else "succeeded", stage=None,
+                        error=f"{failed} of {total} files failed" if failed else None)
+
+
+def set_job_stage(job_id: str, stage: str, config: dict = None):
+    """Mark a job as running ``stage``; a no-op for runs not tracked as jobs."""
+    if job_id is not None:
+        get_job_store(config).update(job_id, "running", stage=stage)
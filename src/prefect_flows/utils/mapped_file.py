@@ -0,0 +1,205 @@
+import csv
+import hashlib
+import mmap
+import os
+import numpy as np
+
+from src.prefect_flows.utils.file_formats import file_format
+
+# pandas/pyarrow are imported inside the parse methods: probing a file (header,
+# row count, hash) should not pay for the parsing stack
+
+NEWLINE = 0x0A
+SCAN_WINDOW = 64 << 20  # bytes compared per vectorized step when counting newlines
+
+
+class MappedFile:
+    """Read-only memory mapping of a landed or raw file.
+
+    Header sniffing, row counting, hashing and parsing all read from the same
+    mapping, so the bytes come straight from the OS page cache instead of
+    being copied into Python-level read buffers for every pass.
+
+    Parquet and Arrow IPC files are read from the same mapping: ``header()``
+    and ``count_rows()`` come from the footer, and ``read_frame()`` converts
+    the typed columns without any text parsing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = file_format(path)
+        self.size = os.path.getsize(path)
+        self._footer = None
+        self._file = open(path, "rb")
+        # mmap refuses zero-length files, so empty files simply have no mapping
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A zero-copy view is still alive; the mapping is released with it
+                pass
+            self._map = None
+        self._file.close()
+
+    def header(self) -> list:
+        """Return the column names from the first line of the file (or the columnar schema)."""
+        if self._map is None:
+            return []
+        if self.format != "csv":
+            return [name.strip() for name in self.columnar_footer()[0]]
+        end = self._map.find(b"\n")
+        line = self._map[:end if end != -1 else self.size].decode("utf-8-sig").rstrip("\r")
+        return [name.strip() for name in next(csv.reader([line]), [])]
+
+    def header_end(self) -> int:
+        """Byte offset of the first data row, just past the header line."""
+        if self._map is None:
+            return 0
+        end = self._map.find(b"\n")
+        return end + 1 if end != -1 else self.size
+
+    def last_line_end(self, start: int = 0) -> int:
+        """Byte offset just past the last complete (newline-terminated) line at or after ``start``."""
+        if self._map is None:
+            return start
+        end = self._map.rfind(b"\n", start)
+        return end + 1 if end != -1 else start
+
+    def line_ranges(self, chunk_bytes: int, start: int = None) -> list:
+        """Split the data rows into ``[start, end)`` byte ranges of about ``chunk_bytes``.
+
+        Every range ends just past a newline (or at the end of the file), so
+        each one parses on its own with the header's column names.
+        """
+        start = self.header_end() if start is None else start
+        ranges = []
+        while start < self.size:
+            end = self._map.find(b"\n", min(start + chunk_bytes, self.size) - 1)
+            end = self.size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+        return ranges
+
+    def count_lines(self) -> int:
+        """Count lines with a vectorized newline scan over the mapping."""
+        if self._map is None:
+            return 0
+        data = np.frombuffer(self._map, dtype=np.uint8)
+        try:
+            lines = sum(
+                int(np.count_nonzero(data[start:start + SCAN_WINDOW] == NEWLINE))
+                for start in range(0, self.size, SCAN_WINDOW)
+            )
+            # A last line without a trailing newline still counts
+            if data[-1] != NEWLINE:
+                lines += 1
+        finally:
+            del data
+        return lines
+
+    def count_rows(self) -> int:
+        """Number of data rows, i.e. lines excluding the header (or the row count in the footer)."""
+        if self.format != "csv":
+            return self.columnar_footer()[1] if self._map is not None else 0
+        return max(self.count_lines() - 1, 0)
+
+    def columnar_footer(self) -> tuple:
+        """Column names and row count of a Parquet/Arrow IPC file, from its metadata alone."""
+        if self._footer is None:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            source = pa.BufferReader(pa.py_buffer(self._map))
+            if self.format == "parquet":
+                parquet_file = pq.ParquetFile(source)
+                schema, rows = parquet_file.schema_arrow, parquet_file.metadata.num_rows
+            else:
+                reader = pa.ipc.open_file(source)
+                # Record batches are zero-copy slices of the mapping; only their headers are read
+                schema = reader.schema
+                rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+            index_columns = _stored_index_columns(schema)
+            self._footer = ([name for name in schema.names if name not in index_columns], rows)
+        return self._footer
+
+    def sha256(self) -> str:
+        """Content hash of the file, computed directly over the mapping."""
+        digest = hashlib.sha256()
+        if self._map is not None:
+            digest.update(self._map)
+        return digest.hexdigest()
+
+    def read_csv(self, config: dict = None):
+        """Parse the mapped bytes into a DataFrame without copying them into a read buffer first."""
+        import pandas as pd
+        import pyarrow as pa
+        from src.prefect_flows.utils.csv_reader import read_csv_frame
+
+        if self._map is None:
+            raise pd.errors.EmptyDataError(f"No columns to parse from file: {self.path}")
+        reader = pa.BufferReader(pa.py_buffer(self._map))
+        try:
+            return read_csv_frame(reader, config)
+        finally:
+            reader.close()
+
+    def read_frame(self, config: dict = None):
+        """Load the whole file into a DataFrame, whatever its format."""
+        if self.format == "csv":
+            return self.read_csv(config)
+        return self.read_columnar()
+
+    def read_columnar(self):
+        """Typed columns of a Parquet/Arrow IPC file as a DataFrame, shaped like a parsed CSV.
+
+        Stored pandas indexes are dropped and dictionary columns decoded, so
+        the frame has a plain RangeIndex and value columns like the CSV path.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._map is None:
+            raise pd.errors.EmptyDataError(f"No columns to parse from file: {self.path}")
+        source = pa.BufferReader(pa.py_buffer(self._map))
+        if self.format == "parquet":
+            table = pq.read_table(source)
+        else:
+            table = pa.ipc.open_file(source).read_all()
+
+        table = table.drop(list(_stored_index_columns(table.schema))).replace_schema_metadata(None)
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                column = table.column(i)
+                table = table.set_column(i, field.name, column.cast(field.type.value_type))
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def read_csv_range(self, start: int, end: int, column_names: list, config: dict = None):
+        """Parse the headerless rows in ``[start, end)`` from a zero-copy slice of the mapping."""
+        import pyarrow as pa
+        from src.prefect_flows.utils.csv_reader import read_csv_frame
+
+        reader = pa.BufferReader(pa.py_buffer(self._map).slice(start, end - start))
+        try:
+            return read_csv_frame(reader, config, column_names=column_names)
+        finally:
+            reader.close()
+
+    def view(self, start: int, end: int) -> memoryview:
+        """Zero-copy view of ``[start, end)``; release it before closing the file."""
+        return memoryview(self._map)[start:end]
+
+
+def _stored_index_columns(schema) -> set:
+    """Columns that only hold a pandas index written alongside the data."""
+    pandas_metadata = schema.pandas_metadata or {}
+    return {column for column in pandas_metadata.get("index_columns", []) if isinstance(column, str)}
@@ -0,0 +1,41 @@
+from src.prefect_flows.utils.mapped_file import MappedFile
+from src.prefect_flows.utils.schema_registry import get_schema_registry
+
+
+def probe_mapped(mapped: MappedFile) -> dict:
+    """Header and row count of an already mapped file, without parsing the data."""
+    columns = mapped.header()
+    return {
+        "file_format": mapped.format,
+        "file_size_bytes": mapped.size,
+        "row_count": mapped.count_rows(),
+        "column_count": len(columns),
+        "columns": columns
+    }
+
+
+def probe_file(file_path: str, with_hash: bool = False) -> dict:
+    """Fast metadata probe: reads the header line and counts newlines over the raw bytes.
+
+    Parquet and Arrow IPC files are probed from their footer instead.
+
+    ``with_hash`` also records the content SHA-256 from the same mapping.
+    """
+    with MappedFile(file_path) as mapped:
+        probe = probe_mapped(mapped)
+        if with_hash:
+            probe["sha256"] = mapped.sha256()
+        return probe
+
+
+def find_rejection_reason(probe: dict, schema_registry: dict = None):
+    """Return why a probed file can be rejected before ingestion, or None if it looks usable.
+
+    The header must match a version of ``schema_registry`` (directly or through its aliases).
+    """
+    resolution = get_schema_registry(schema_registry).resolve(probe["columns"])
+    if resolution["version"] is None:
+        return f"Missing required columns: {resolution['missing']}"
+    if probe["row_count"] == 0:
+        return "File contains no data rows"
+    return None
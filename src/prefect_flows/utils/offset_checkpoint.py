@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+
+from src.prefect_flows.utils.file_lock import file_lock
+
+CHECKPOINT_PATH = "./data/checkpoints/tail_offsets.json"
+
+
+def load_offsets(checkpoint_path: str = CHECKPOINT_PATH) -> dict:
+    """Load the per-file byte offset checkpoints for tailed files."""
+    if not os.path.exists(checkpoint_path):
+        return {}
+    with open(checkpoint_path) as f:
+        return json.load(f)
+
+
+def get_offset(file_path: str, checkpoint_path: str = CHECKPOINT_PATH) -> dict:
+    """Checkpoint entry for one file: {'offset': ..., 'columns': [...]} or an empty dict."""
+    return load_offsets(checkpoint_path).get(os.path.abspath(file_path), {})
+
+
+def save_offset(file_path: str, offset: int, columns: list, checkpoint_path: str = CHECKPOINT_PATH,
+                pending: dict = None):
+    """Record that everything before ``offset`` in ``file_path`` has been ingested.
+
+    ``pending`` describes a range after ``offset`` that is partly processed
+    (e.g. its drift result), so a rerun finishes the same range. Workers
+    tailing different files share the checkpoint file, so the update holds
+    its lock.
+    """
+    entry = {"offset": offset, "columns": columns}
+    if pending is not None:
+        entry["pending"] = pending
+    with file_lock(checkpoint_path):
+        offsets = load_offsets(checkpoint_path)
+        offsets[os.path.abspath(file_path)] = entry
+
+        # Write-then-rename so a crash never leaves a truncated checkpoint file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(checkpoint_path), suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(offsets, f, indent=2)
+        os.replace(tmp_path, checkpoint_path)
@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+DEFAULT_PARALLEL_CONFIG = {
+    "backend": "thread",                # "serial", "thread" or "process"
+    "max_workers": None,                # None uses every core
+    "parallel_threshold_rows": 100000,  # smaller frames are validated inline
+    "rows_per_shard": 250000            # tall columns are split into row ranges of this size
+}
+
+
+def map_shards(fn, jobs: list, backend: str = "thread", max_workers: int = None) -> list:
+    """Run ``fn`` over ``jobs`` on the chosen backend, returning results in job order."""
+    if backend == "serial" or len(jobs) <= 1:
+        return [fn(job) for job in jobs]
+    executor_class = ProcessPoolExecutor if backend == "process" else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers or os.cpu_count()) as pool:
+        return list(pool.map(fn, jobs))
+
+
+def plan_shards(n_rows: int, columns: list, rows_per_shard: int) -> list:
+    """Split every column into ``(column, start, stop)`` row ranges."""
+    bounds = list(range(0, n_rows, rows_per_shard)) + [n_rows] if n_rows else [0, 0]
+    return [(column, start, stop) for column in columns for start, stop in zip(bounds, bounds[1:])]
+
+
+def shard_stats(values: pd.Series, rules: dict):
+    """Partial statistics and the invalid-row mask for one row range of one column."""
+    stats = {
+        "total_count": len(values),
+        "null_count": int(values.isnull().sum()),
+        "below_min": 0,
+        "above_max": 0,
+        "min_value": None,
+        "max_value": None,
+        "unique_values": None
+    }
+
+    if rules['type'] == 'numeric':
+        invalid = np.zeros(len(values), dtype=bool)
+        stats['min_value'] = values.min()
+        stats['max_value'] = values.max()
+        if 'min_value' in rules:
+            below = (values < rules['min_value']).to_numpy()
+            stats['below_min'] = int(below.sum())
+            invalid |= below
+        if 'max_value' in rules:
+            above = (values > rules['max_value']).to_numpy()
+            stats['above_max'] = int(above.sum())
+            invalid |= above
+    else:
+        # categorical and binary columns check membership in the allowed set
+        stats['unique_values'] = values.unique().tolist()
+        invalid = ~values.isin(rules['allowed_values']).to_numpy()
+
+    stats['invalid_count'] = int(invalid.sum())
+    return stats, invalid
+
+
+def merge_column(column: str, rules: dict, partials: list):
+    """Combine shard statistics of one column into its report entry, errors and warnings."""
+    mins = [p['min_value'] for p in partials if p['min_value'] is not None]
+    maxs = [p['max_value'] for p in partials if p['max_value'] is not None]
+    col_validation = {
+        'total_count': sum(p['total_count'] for p in partials),
+        'null_count': sum(p['null_count'] for p in partials),
+        'invalid_count': sum(p['invalid_count'] for p in partials),
+        'min_value': pd.Series(mins).min() if mins else None,
+        'max_value': pd.Series(maxs).max() if maxs else None,
+        'unique_values': None
+    }
+    errors, warnings = [], []
+
+    # Check for null values
+    if col_validation['null_count'] > 0:
+        warnings.append(f"Column '{column}' has {col_validation['null_count']} null values")
+
+    if rules['type'] == 'numeric':
+        if sum(p['below_min'] for p in partials):
+            errors.append(
+                f"Column '{column}' has values below minimum {rules['min_value']}: min={col_validation['min_value']}"
+            )
+        if sum(p['above_max'] for p in partials):
+            errors.append(
+                f"Column '{column}' has values above maximum {rules['max_value']}: max={col_validation['max_value']}"
+            )
+    else:
+        uniques = [value for p in partials for value in p['unique_values']]
+        col_validation['unique_values'] = pd.unique(pd.Series(uniques, dtype=object)).tolist()
+        invalid_values = [val for val in col_validation['unique_values'] if val not in rules['allowed_values']]
+        if invalid_values:
+            if rules['type'] == 'binary':
+                errors.append(f"Column '{column}' has invalid values: {invalid_values}. Must be {rules['allowed_values']}")
+            else:
+                errors.append(f"Column '{column}' has invalid values: {invalid_values}. Allowed: {rules['allowed_values']}")
+
+    return col_validation, errors, warnings
+
+
+def _process_shard(job):
+    """Worker entry point: attach to the shared column buffer and compute one shard."""
+    (shm_name, dtype, n_rows), start, stop, rules = job
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        column = np.ndarray((n_rows,), dtype=np.dtype(dtype), buffer=shm.buf)
+        result = shard_stats(pd.Series(column[start:stop], copy=True), rules)
+        del column
+        return result
+    finally:
+        shm.close()
+
+
+def _thread_shard(job):
+    values, rules = job
+    return shard_stats(values, rules)
+
+
+def _run_in_processes(df: pd.DataFrame, rules: dict, shards: list, max_workers: int) -> list:
+    """Place numeric columns in shared memory once so workers read them without pickling."""
+    blocks = {}
+    try:
+        jobs = []
+        for column, start, stop in shards:
+            if column not in blocks:
+                values = df[column].to_numpy()
+                if values.dtype.kind not in "biuf":
+                    raise TypeError(f"Column '{column}' is not numeric and cannot be shared across processes")
+                shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+                blocks[column] = (shm, values.dtype.str)
+            shm, dtype = blocks[column]
+            jobs.append(((shm.name, dtype, len(df)), start, stop, rules[column]))
+        return map_shards(_process_shard, jobs, "process", max_workers)
+    finally:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+
+
+def column_partials(df: pd.DataFrame, rules: dict, parallel_config: dict = None):
+    """Shard statistics of every column in ``rules`` plus the valid-row mask.
+
+    Partials are mergeable with ``merge_column``: the partials of several
+    frames (e.g. chunks of one file) merge into the statistics of their
+    concatenation.
+    """
+    cfg = {**DEFAULT_PARALLEL_CONFIG, **(parallel_config or {})}
+    backend = cfg["backend"] if len(df) >= cfg["parallel_threshold_rows"] else "serial"
+    shards = plan_shards(len(df), list(rules), cfg["rows_per_shard"])
+
+    if backend == "process":
+        try:
+            results = _run_in_processes(df, rules, shards, cfg["max_workers"])
+        except TypeError as e:
+            print(f"Falling back to thread validation: {e}")
+            backend = "thread"
+    if backend != "process":
+        jobs = [(df[column].iloc[start:stop], rules[column]) for column, start, stop in shards]
+        results = map_shards(_thread_shard, jobs, backend, cfg["max_workers"])
+
+    valid_rows_mask = np.ones(len(df), dtype=bool)
+    partials = {column: [] for column in rules}
+    for (column, start, stop), (stats, invalid) in zip(shards, results):
+        valid_rows_mask[start:stop] &= ~invalid
+        partials[column].append(stats)
+    return partials, valid_rows_mask
+
+
+def merge_columns(rules: dict, partials: dict):
+    """Merge per-column partials into ``(column_stats, errors, warnings)``."""
+    column_stats, errors, warnings = {}, [], []
+    for column, column_rules in rules.items():
+        col_validation, col_errors, col_warnings = merge_column(column, column_rules, partials[column])
+        column_stats[column] = col_validation
+        errors.extend(col_errors)
+        warnings.extend(col_warnings)
+    return column_stats, errors, warnings
+
+
+def validate_columns(df: pd.DataFrame, rules: dict, parallel_config: dict = None):
+    """Validate ``df`` against per-column ``rules``, sharding columns and row ranges across workers.
+
+    Returns ``(column_stats, errors, warnings, valid_rows_mask)`` in the same
+    shape a single-threaded column loop would produce.
+    """
+    partials, valid_rows_mask = column_partials(df, rules, parallel_config)
+    column_stats, errors, warnings = merge_columns(rules, partials)
+    return column_stats, errors, warnings, valid_rows_mask
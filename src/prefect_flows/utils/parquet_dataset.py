@@ -0,0 +1,92 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.prefect_flows.utils import storage
+
+
+def write_options(parquet_config: dict = None) -> dict:
+    """pyarrow writer options for the ``parquet`` section of the config.
+
+    Column statistics and the page index let readers skip whole row groups
+    and pages for predicates like ``fail == 1`` or a ``Temperature`` range;
+    smaller row groups make that skipping finer-grained.
+    """
+    parquet_config = parquet_config or {}
+    options = {
+        "write_statistics": parquet_config.get("write_statistics", True),
+        "write_page_index": parquet_config.get("write_page_index", False),
+        "compression": parquet_config.get("compression", "snappy")
+    }
+    if parquet_config.get("row_group_size"):
+        options["row_group_size"] = parquet_config["row_group_size"]
+    if parquet_config.get("data_page_size"):
+        options["data_page_size"] = parquet_config["data_page_size"]
+    return options
+
+
+def to_sorted_table(df: pd.DataFrame, parquet_config: dict = None) -> pa.Table:
+    """Convert to Arrow, sorted by the configured keys so min/max statistics become selective."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sort_by = [col for col in (parquet_config or {}).get("sort_by", []) if col in table.column_names]
+    if sort_by:
+        table = table.sort_by([(col, "ascending") for col in sort_by])
+    return table
+
+
+def write_table(df: pd.DataFrame, output_path: str, parquet_config: dict = None, config: dict = None) -> str:
+    """Write a DataFrame as a single Parquet file using the tuned writer options.
+
+    ``output_path`` is resolved through its storage zone in ``config``;
+    returns where the file was stored.
+    """
+    filesystem, target = storage.resolve(output_path, config)
+    if storage.is_local(output_path, config):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    pq.write_table(to_sorted_table(df, parquet_config), target, filesystem=filesystem,
+                   **write_options(parquet_config))
+    return storage.location(output_path, config)
+
+
+def write_part(df: pd.DataFrame, dataset_dir: str, part_name: str, parquet_config: dict = None,
+               config: dict = None) -> str:
+    """Atomically add one Parquet part file to a dataset directory.
+
+    The part is written to a temporary name and renamed into place, so readers
+    never see a half-written file and rewriting the same part is idempotent.
+    Parts are cast to the schema of the parts already in the dataset when
+    possible, so the directory stays readable as one dataset. On an
+    object-store zone the part is written directly: an object only becomes
+    visible once its upload completes.
+    """
+    part_path = os.path.join(dataset_dir, part_name)
+    tmp_path = os.path.join(dataset_dir, f".{part_name}.tmp")
+
+    table = to_sorted_table(df, parquet_config)
+    existing_schema = dataset_schema(dataset_dir, config)
+    if existing_schema is not None and not table.schema.equals(existing_schema):
+        try:
+            table = table.cast(existing_schema)
+        except (pa.ArrowInvalid, ValueError) as e:
+            print(f"Part {part_name} does not match dataset schema, writing as-is: {e}")
+
+    if not storage.is_local(part_path, config):
+        filesystem, target = storage.resolve(part_path, config)
+        pq.write_table(table, target, filesystem=filesystem, **write_options(parquet_config))
+        return part_path
+
+    os.makedirs(dataset_dir, exist_ok=True)
+    pq.write_table(table, tmp_path, **write_options(parquet_config))
+    os.replace(tmp_path, part_path)
+    return part_path
+
+
+def dataset_schema(dataset_dir: str, config: dict = None):
+    """Schema of the first committed part in a dataset directory (footer read only)."""
+    parts = sorted(path for path, _ in storage.list_files(dataset_dir, ".parquet", config)
+                   if not os.path.basename(path).startswith("."))
+    if not parts:
+        return None
+    with storage.open_input_file(parts[0], config) as source:
+        return pq.read_schema(source)
@@ -0,0 +1,137 @@
+import html
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.prefect_flows.utils.report_sink import get_report_sink
+
+REPORTS_DIR = "./data/reports"
+HTML_REPORTS_DIR = "validation_reports"
+
+# One background worker keeps HTML rendering off the validation critical path
+_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="html-report")
+
+_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Data Validation Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .success { color: green; }
+        .failure { color: red; }
+        .warning { color: orange; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+    </style>
+</head>
+<body>
+    <h1>Data Validation Report</h1>
+"""
+
+_TAIL = """    </table>
+</body>
+</html>
+"""
+
+
+def _status(success) -> str:
+    return f'<span class="{"success" if success else "failure"}">{html.escape(str(success))}</span>'
+
+
+def _render_expectation_report(report: dict):
+    """Rows for a Great Expectations report built by ``generate_validation_report``."""
+    summary = report["summary"]
+    yield "    <h2>Summary</h2>\n"
+    yield f"    <p>Overall Success: {_status(summary['success'])}</p>\n"
+    yield (f"    <p>Successful Expectations: {summary['successful_expectations']} / "
+           f"{summary['total_expectations']}</p>\n")
+    yield f"    <p>Data Quality Score: {summary['data_quality_score']}</p>\n"
+    yield "    <h2>Detailed Results</h2>\n    <table>\n"
+    yield "        <tr><th>Expectation</th><th>Column</th><th>Status</th><th>Details</th></tr>\n"
+    for result in report["validation_results"]["results"]:
+        config = result["expectation_config"]
+        details = result["result"].get("observed_value", result["result"].get("unexpected_count", "N/A"))
+        yield (f"        <tr><td>{html.escape(config['expectation_type'])}</td>"
+               f"<td>{html.escape(str(config['kwargs'].get('column', 'N/A')))}</td>"
+               f"<td>{_status(result['success'])}</td>"
+               f"<td>{html.escape(str(details))}</td></tr>\n")
+
+
+def _render_sensor_report(report: dict):
+    """Rows for a rule-based report written by ``save_validation_report``."""
+    report = report["validation_report"]
+    summary = report.get("summary", {})
+    yield "    <h2>Summary</h2>\n"
+    yield f"    <p>File: {html.escape(str(report.get('file_validated')))}</p>\n"
+    yield f"    <p>Overall Status: {_status(report.get('overall_status') == 'PASS')}</p>\n"
+    yield (f"    <p>Valid Rows: {summary.get('valid_rows')} / {summary.get('total_rows')}</p>\n")
+    for error in report.get("errors", []):
+        yield f'    <p class="failure">{html.escape(str(error))}</p>\n'
+    for warning in report.get("warnings", []):
+        yield f'    <p class="warning">{html.escape(str(warning))}</p>\n'
+    yield "    <h2>Column Statistics</h2>\n    <table>\n"
+    yield "        <tr><th>Column</th><th>Nulls</th><th>Invalid</th><th>Min</th><th>Max</th></tr>\n"
+    for column, stats in report.get("column_statistics", {}).items():
+        yield (f"        <tr><td>{html.escape(column)}</td><td>{stats.get('null_count')}</td>"
+               f"<td class={'failure' if stats.get('invalid_count') else 'success'}>{stats.get('invalid_count')}</td>"
+               f"<td>{stats.get('min_value')}</td><td>{stats.get('max_value')}</td></tr>\n")
+    if report.get("drift"):
+        yield "    </table>\n    <h2>Drift and Outliers</h2>\n    <table>\n"
+        yield ("        <tr><th>Column</th><th>File Mean</th><th>Baseline Mean</th>"
+               "<th>Drift Score</th><th>Outlier Rate</th></tr>\n")
+        for column, entry in report["drift"]["columns"].items():
+            flagged = entry["drift"] or entry["outliers"]
+            yield (f"        <tr><td>{html.escape(column)}</td><td>{entry['file_mean']}</td>"
+                   f"<td>{entry['baseline_mean']}</td><td>{entry['drift_score']}</td>"
+                   f"<td class={'warning' if flagged else 'success'}>{entry['outlier_rate']:.2%}</td></tr>\n")
+
+
+def render_html_report(report: dict):
+    """Render a stored validation report as HTML, yielding it chunk by chunk.
+
+    Nothing is built up front: each expectation or column becomes one
+    chunk, so callers can stream the document to a file or HTTP response.
+    """
+    yield _HEAD
+    yield f"    <p>Generated on: {datetime.now().isoformat()}</p>\n"
+    if "validation_report" in report:
+        yield from _render_sensor_report(report)
+    else:
+        yield from _render_expectation_report(report)
+    yield _TAIL
+
+
+def write_html_report(report: dict, report_path: str) -> str:
+    """Stream the rendered report into the file ``report_path``.
+
+    Prerendered HTML stays a plain file for browsers and other tools; the
+    report sink only keeps the JSON that ``/reports/{id}`` renders from.
+    """
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    with open(report_path, "w") as f:
+        for chunk in render_html_report(report):
+            f.write(chunk)
+    print(f"HTML validation report saved: {report_path}")
+    return report_path
+
+
+def submit_html_report(report: dict, report_dir: str = HTML_REPORTS_DIR):
+    """Render the report to ``report_dir`` on the background worker; returns a Future."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = os.path.join(report_dir, f"validation_report_{timestamp}.html")
+    return _render_executor.submit(write_html_report, report, report_path)
+
+
+def store_report(report: dict, name: str, reports_dir: str = REPORTS_DIR, config: dict = None) -> str:
+    """Persist report data as JSON so it can be rendered later; returns the report id."""
+    get_report_sink(config).put(os.path.join(reports_dir, f"{name}.json"), report)
+    return name
+
+
+def load_report(report_id: str, reports_dir: str = REPORTS_DIR, config: dict = None) -> dict:
+    """Load stored report data by id (the JSON file name without extension)."""
+    # Report ids are plain file names; never let them walk out of the reports folder
+    report = get_report_sink(config).get(os.path.join(reports_dir, f"{os.path.basename(report_id)}.json"))
+    return json.loads(report) if report is not None else None
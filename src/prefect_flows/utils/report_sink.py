@@ -0,0 +1,209 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from src.prefect_flows.utils import storage
+
+DURABILITY_MODES = ("batched", "commit", "sync")
+
+DEFAULT_REPORT_SINK_CONFIG = {
+    "backend": "sqlite",             # "sqlite": one embedded database; "files": one file per document
+    "db_path": "./data/sink/documents.db",
+    "durability": "batched",         # "batched", "commit" or "sync", see ReportSink
+    "flush_interval_seconds": 1.0,
+    "max_batch_documents": 200       # flush early once this many documents are waiting
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (dir, name)
+);
+CREATE INDEX IF NOT EXISTS documents_dir ON documents (dir, updated_at);
+"""
+
+# settings -> sink; one sink (and flusher thread) per process
+_sinks = {}
+_lock = threading.Lock()
+
+
+def report_sink_config(config: dict = None) -> dict:
+    return {**DEFAULT_REPORT_SINK_CONFIG, **((config or {}).get("report_sink") or {})}
+
+
+def get_report_sink(config: dict = None):
+    """The process-wide sink for metadata and report documents."""
+    if config is None:
+        from src.prefect_flows.utils.config import load_config
+        config = load_config()
+    settings = report_sink_config(config)
+    key = json.dumps(settings, sort_keys=True)
+    with _lock:
+        if key not in _sinks:
+            if settings["backend"] == "files":
+                _sinks[key] = FileSink(config)
+            elif settings["backend"] == "sqlite":
+                _sinks[key] = ReportSink(settings["db_path"], settings["durability"],
+                                         settings["flush_interval_seconds"], settings["max_batch_documents"])
+            else:
+                raise ValueError(f"Unknown report sink backend: {settings['backend']}")
+        return _sinks[key]
+
+
+def _encode(document) -> str:
+    return document if isinstance(document, str) else json.dumps(document, indent=2, default=str)
+
+
+class FileSink:
+    """Every document is its own file, written through its storage zone (from ``config``) as it is put."""
+
+    def __init__(self, config: dict = None):
+        self.config = config
+
+    def put(self, path: str, document):
+        storage.write_bytes(path, _encode(document).encode(), self.config)
+
+    def get(self, path: str) -> str:
+        return storage.read_bytes(path, self.config).decode() if storage.exists(path, self.config) else None
+
+    def list(self, directory: str, suffix: str = "") -> list:
+        return storage.list_files(directory, suffix, self.config)
+
+    def location(self, path: str) -> str:
+        return storage.location(path, self.config)
+
+    def flush(self):
+        pass
+
+
+class ReportSink:
+    """Metadata and report documents in one SQLite database, written in batches.
+
+    Documents keep the paths they would have as files (e.g.
+    ``./data/reports/validation_x.json``), so callers and readers address
+    them as before; putting a path again replaces the document.
+
+    ``durability`` makes the trade-off explicit:
+
+    * ``batched``: ``put`` only queues the document. A background thread
+      commits everything waiting every ``flush_interval_seconds`` (sooner
+      once ``max_batch_documents`` are waiting) in one transaction, and on
+      exit. A crash loses at most the last interval, and other processes
+      see a document only after its flush; this process sees it at once.
+    * ``commit``: ``put`` commits before returning. Survives a process
+      crash; an OS crash or power loss may drop the latest commits (WAL,
+      ``synchronous=NORMAL``).
+    * ``sync``: as ``commit``, but fsynced (``synchronous=FULL``), so a
+      document is durable once ``put`` returns.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_REPORT_SINK_CONFIG["db_path"], durability: str = "batched",
+                 flush_interval_seconds: float = 1.0, max_batch_documents: int = 200):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        # Absolute, so a later change of working directory cannot move the database
+        self.db_path = os.path.abspath(db_path)
+        self.durability = durability
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch_documents = max_batch_documents
+        self._pending = {}  # (dir, name) -> (body, updated_at)
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        if durability == "batched":
+            threading.Thread(target=self._flush_loop, name="report-sink-flush", daemon=True).start()
+            atexit.register(self.flush)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute(f"PRAGMA synchronous={'FULL' if self.durability == 'sync' else 'NORMAL'}")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(path: str) -> tuple:
+        path = os.path.abspath(path)
+        return os.path.dirname(path), os.path.basename(path)
+
+    def put(self, path: str, document):
+        """Store ``document`` (a dict, or already encoded text) under ``path``."""
+        key = self._key(path)
+        row = (_encode(document), time.time())
+        if self.durability != "batched":
+            self._write({key: row})
+            return
+        with self._pending_lock:
+            self._pending[key] = row
+            waiting = len(self._pending)
+        if waiting >= self.max_batch_documents:
+            self._wake.set()
+
+    def get(self, path: str) -> str:
+        """Stored text of ``path``, or None."""
+        key = self._key(path)
+        with self._pending_lock:
+            if key in self._pending:
+                return self._pending[key][0]
+        with self._connect() as conn:
+            row = conn.execute("SELECT body FROM documents WHERE dir = ? AND name = ?", key).fetchone()
+        return row[0] if row else None
+
+    def list(self, directory: str, suffix: str = "") -> list:
+        """``(path, updated time)`` of the documents directly in ``directory``."""
+        directory_key = os.path.abspath(directory)
+        with self._connect() as conn:
+            rows = dict(conn.execute("SELECT name, updated_at FROM documents WHERE dir = ?", (directory_key,)))
+        with self._pending_lock:
+            rows.update({name: updated_at for (dir_, name), (_, updated_at) in self._pending.items()
+                         if dir_ == directory_key})
+        return [(os.path.join(directory, name), updated_at) for name, updated_at in rows.items()
+                if name.endswith(suffix)]
+
+    def location(self, path: str) -> str:
+        """Where a document is stored: the database file and the document's path in it."""
+        return f"{os.path.relpath(self.db_path)}#{os.path.relpath(os.path.abspath(path))}"
+
+    def flush(self):
+        """Commit every queued document in one transaction."""
+        with self._pending_lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        try:
+            self._write(batch)
+        except Exception:
+            # Keep the batch for the next flush unless newer versions were put meanwhile
+            with self._pending_lock:
+                self._pending = {**batch, **self._pending}
+            raise
+
+    def _write(self, rows: dict):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO documents (dir, name, body, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (dir, name) DO UPDATE SET body = excluded.body, updated_at = excluded.updated_at",
+                [(*key, body, updated_at) for key, (body, updated_at) in rows.items()])
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Report sink flush failed, retrying: {e}")
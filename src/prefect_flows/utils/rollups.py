@@ -0,0 +1,120 @@
+import os
+from datetime import date, datetime
+import pandas as pd
+import pyarrow.dataset as ds
+
+from src.prefect_flows.utils.file_lock import file_lock
+
+ROLLUP_PATH = "./data/rollups/sensor_rollups.parquet"
+GROUP_COLUMN = "tempMode"
+FAIL_COLUMN = "fail"
+
+
+def compute_rollup(df: pd.DataFrame, source: str, day: str = None) -> pd.DataFrame:
+    """Per-``tempMode`` partial aggregates (counts and sums) for one saved output.
+
+    Sums and counts rather than means are stored, so rows from different
+    sources and days can be merged exactly.
+    """
+    day = day or date.today().isoformat()
+    sensor_cols = [col for col in df.select_dtypes(include=['number']).columns
+                   if col not in (GROUP_COLUMN, FAIL_COLUMN)]
+
+    grouped = df.groupby(GROUP_COLUMN)
+    rollup = pd.DataFrame({
+        "row_count": grouped.size(),
+        "fail_count": grouped[FAIL_COLUMN].sum() if FAIL_COLUMN in df.columns else 0
+    })
+    sums = grouped[sensor_cols].sum().add_suffix("_sum")
+    counts = grouped[sensor_cols].count().add_suffix("_count")
+    rollup = pd.concat([rollup, sums, counts], axis=1).reset_index()
+
+    rollup.insert(0, "day", day)
+    rollup.insert(0, "source", source)
+    return rollup
+
+
+def load_rollups(rollup_path: str = ROLLUP_PATH) -> pd.DataFrame:
+    """Load the rollup table (a few rows per ingested output)."""
+    if not os.path.exists(rollup_path):
+        return pd.DataFrame()
+    return pd.read_parquet(rollup_path)
+
+
+def _write_rollups(rollups: pd.DataFrame, rollup_path: str):
+    os.makedirs(os.path.dirname(rollup_path), exist_ok=True)
+    tmp_path = f"{rollup_path}.tmp"
+    rollups.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, rollup_path)
+
+
+def is_output_source(source: str, output_prefix: str) -> bool:
+    """Whether a rollup source belongs to the file output ``<output_prefix>``.
+
+    A file's output is either one ``<prefix>.parquet`` file or a folder of
+    parts ``<prefix>/part-*.parquet``, depending on how it was ingested.
+    """
+    output_prefix = os.path.normpath(output_prefix)
+    return source == f"{output_prefix}.parquet" or source.startswith(output_prefix + os.sep)
+
+
+def merge_rollup(rollup: pd.DataFrame, rollup_path: str = ROLLUP_PATH, output_prefix: str = None) -> pd.DataFrame:
+    """Replace the contribution of ``rollup``'s source in the rollup table.
+
+    Re-ingesting the same output replaces its rows instead of double counting.
+    With ``output_prefix`` every earlier source of that file output is
+    replaced too, whatever layout or chunking it was written with.
+    """
+    with file_lock(rollup_path):
+        rollups = load_rollups(rollup_path)
+        if not rollups.empty:
+            replaced = rollups["source"].isin(rollup["source"].unique())
+            if output_prefix is not None:
+                replaced |= rollups["source"].map(lambda source: is_output_source(source, output_prefix))
+            rollups = rollups[~replaced]
+        rollups = pd.concat([rollups, rollup], ignore_index=True).fillna(0)
+        _write_rollups(rollups, rollup_path)
+        return rollups
+
+
+def recompute_rollups(cleansed_dir: str = "data/cleansed", rollup_path: str = ROLLUP_PATH) -> pd.DataFrame:
+    """Rebuild the rollup table from the cleansed lake, e.g. after a backfill.
+
+    Each Parquet file is one source; its day is taken from the file
+    modification time. Files are read one at a time, so memory stays
+    bounded by the largest file.
+    """
+    rollups = []
+    for fragment in ds.dataset(cleansed_dir, format="parquet").get_fragments():
+        df = fragment.to_table().to_pandas()
+        if GROUP_COLUMN not in df.columns:
+            continue
+        day = datetime.fromtimestamp(os.path.getmtime(fragment.path)).date().isoformat()
+        rollups.append(compute_rollup(df, os.path.normpath(fragment.path), day))
+
+    result = pd.concat(rollups, ignore_index=True).fillna(0) if rollups else pd.DataFrame()
+    with file_lock(rollup_path):
+        _write_rollups(result, rollup_path)
+    return result
+
+
+def summarize_rollups(group_by: list = None, rollup_path: str = ROLLUP_PATH) -> pd.DataFrame:
+    """Dashboard view: row counts, failure rate and mean readings per group.
+
+    ``group_by`` defaults to ``["tempMode"]``; use ``["day"]`` or
+    ``["day", "tempMode"]`` for daily figures.
+    """
+    group_by = group_by or [GROUP_COLUMN]
+    rollups = load_rollups(rollup_path)
+    if rollups.empty:
+        return rollups
+
+    totals = rollups.drop(columns=["source"]).groupby(group_by).sum(numeric_only=True)
+    summary = pd.DataFrame({
+        "row_count": totals["row_count"],
+        "fail_rate": totals["fail_count"] / totals["row_count"]
+    })
+    for sum_col in [col for col in totals.columns if col.endswith("_sum")]:
+        col = sum_col[:-len("_sum")]
+        summary[f"{col}_mean"] = totals[sum_col] / totals[f"{col}_count"]
+    return summary.reset_index()
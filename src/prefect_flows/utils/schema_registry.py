@@ -0,0 +1,131 @@
+import hashlib
+import json
+
+# Canonical columns of the cleansed Parquet and their types, so every file
+# (and every firmware version) writes the same Parquet schema. Readings are
+# float64 because imputation can fill them with fractional means; tempMode
+# and fail stay int64 like the cleansed files written before the registry.
+DEFAULT_SCHEMA_REGISTRY = {
+    "columns": {
+        "footfall": "float64", "tempMode": "int64", "AQ": "float64", "USS": "float64", "CS": "float64",
+        "VOC": "float64", "RP": "float64", "IP": "float64", "Temperature": "float64", "fail": "int64"
+    },
+    "versions": [
+        {"version": 1,
+         "columns": ["footfall", "tempMode", "AQ", "USS", "CS", "VOC", "RP", "IP", "Temperature", "fail"],
+         "aliases": {}}
+    ],
+    "unknown_columns": "drop"
+}
+
+# json-encoded registry config -> registry, with its cache of resolved headers
+_registries = {}
+
+
+def schema_registry_config(schema_registry: dict = None) -> dict:
+    return {**DEFAULT_SCHEMA_REGISTRY, **(schema_registry or {})}
+
+
+def get_schema_registry(schema_registry: dict = None) -> "SchemaRegistry":
+    """Registry for ``config['schema_registry']``, built once per distinct config."""
+    settings = schema_registry_config(schema_registry)
+    key = json.dumps(settings, sort_keys=True)
+    if key not in _registries:
+        _registries[key] = SchemaRegistry(settings)
+    return _registries[key]
+
+
+def header_fingerprint(columns) -> str:
+    """Stable id of a header: its column names, in order."""
+    return hashlib.sha1(json.dumps(list(columns)).encode()).hexdigest()[:16]
+
+
+def _normalize(name: str) -> str:
+    return str(name).strip().casefold()
+
+
+class SchemaRegistry:
+    """Versioned source schemas of the sensor files, mapped onto one canonical schema.
+
+    Each version lists the canonical columns its firmware sends (all
+    required) and ``aliases`` from the names it uses to canonical names.
+    Names match ignoring case and surrounding spaces. A header resolves to
+    the newest version whose columns it all carries; columns a newer
+    version added are then written as nulls, and columns no version knows
+    are dropped (or kept after the canonical ones with
+    ``unknown_columns: "keep"``). Resolutions are cached by header
+    fingerprint, so each distinct header is resolved once per process.
+    """
+
+    def __init__(self, settings: dict):
+        if settings["unknown_columns"] not in ("drop", "keep"):
+            raise ValueError(f"Unknown unknown_columns setting: {settings['unknown_columns']}")
+        self.columns = settings["columns"]
+        self.versions = sorted(settings["versions"], key=lambda version: version["version"], reverse=True)
+        self.keep_unknown = settings["unknown_columns"] == "keep"
+        self._canonical = {_normalize(column): column for column in self.columns}
+        self._resolved = {}
+
+    def resolve(self, columns) -> dict:
+        """How a header maps onto the registry: ``version`` (None if no version
+        matches), ``rename``, ``unknown`` and the newest version's ``missing`` columns.
+        """
+        columns = list(columns)
+        fingerprint = header_fingerprint(columns)
+        if fingerprint not in self._resolved:
+            self._resolved[fingerprint] = self._resolve(columns, fingerprint)
+        return self._resolved[fingerprint]
+
+    def _resolve(self, columns: list, fingerprint: str) -> dict:
+        newest = None
+        for version in self.versions:
+            names = {**self._canonical,
+                     **{_normalize(alias): column for alias, column in version.get("aliases", {}).items()}}
+            rename = {}
+            for name in columns:
+                column = names.get(_normalize(name))
+                # A second source column for the same canonical column is left unmapped
+                if column is not None and column not in rename.values():
+                    rename[name] = column
+            resolution = {
+                "version": version["version"],
+                "fingerprint": fingerprint,
+                "rename": rename,
+                "unknown": [name for name in columns if name not in rename],
+                "missing": [column for column in version["columns"] if column not in rename.values()]
+            }
+            if not resolution["missing"]:
+                return resolution
+            newest = newest or resolution
+        return {**newest, "version": None}
+
+    def map_columns(self, df, resolution: dict):
+        """Rename ``df``'s columns to canonical names and drop unknown ones (unless kept)."""
+        df = df.rename(columns=resolution["rename"])
+        if resolution["unknown"] and not self.keep_unknown:
+            df = df.drop(columns=resolution["unknown"])
+        df.attrs["schema"] = {key: resolution[key] for key in ("version", "fingerprint", "unknown")}
+        return df
+
+    def conform(self, df, resolution: dict):
+        """Cast a mapped frame to the canonical types, add columns its version lacks, canonical columns first.
+
+        Fractional values in integer columns (imputed means) are rounded.
+        Frames matching no version are returned as they are, so validation
+        reports their missing columns.
+        """
+        if resolution["version"] is None:
+            return df
+        for column, dtype in self.columns.items():
+            if column not in df.columns:
+                df[column] = None
+            series = df[column]
+            if dtype.startswith("int") and series.dtype.kind == "f":
+                # Means imputed into an integer column are rounded to whole readings
+                series = series.round()
+            # Integer columns holding nulls use the nullable integer type (still int64 in Parquet)
+            target = dtype.capitalize() if dtype.startswith("int") and series.isna().any() else dtype
+            if str(series.dtype) != target:
+                df[column] = series.astype(target)
+        extra = [column for column in df.columns if column not in self.columns]
+        return df[list(self.columns) + extra]
@@ -0,0 +1,77 @@
+import copy
+import os
+import re
+
+from src.prefect_flows.utils.task_cache import config_version
+
+LANDING_DIR = "./data/landing"
+DEFAULT_SITE = "default"
+# Bulk uploads land as <landing>[/<site>]/_batches/<batch id>/ next to their manifest
+BATCHES_DIR = "_batches"
+SITE_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# (config version, site) -> merged config; rule sets are compiled once per site
+_compiled = {}
+
+
+def is_valid_site(site: str) -> bool:
+    return bool(SITE_NAME.match(site or ""))
+
+
+def site_of(file_path: str, landing_dir: str = LANDING_DIR) -> str:
+    """Site of a landed file: its first sub-folder under ``landing_dir``.
+
+    Files directly in the landing folder (or outside it), or in its batch
+    folder, belong to the default site.
+    """
+    relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(landing_dir))
+    parts = relative.split(os.sep)
+    if len(parts) < 2 or parts[0] in ("..", BATCHES_DIR) or not is_valid_site(parts[0]):
+        return DEFAULT_SITE
+    return parts[0]
+
+
+def _deep_merge(base: dict, override: dict) -> dict:
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def site_config(config: dict, site: str) -> dict:
+    """Pipeline config for one site: the base config with the site's overrides applied.
+
+    ``config['sites']['overrides'][site]`` may override any section, e.g.
+    ``valid_ranges`` or ``validation_rules`` (per-column changes to the
+    sensor validation rules). Non-default sites also get their own drift
+    baselines. The result carries ``site`` and is cached, so each site's
+    config is only built once.
+    """
+    if config.get("site") == site:
+        return config
+    key = (config_version(config), site)
+    if key not in _compiled:
+        overrides = config.get("sites", {}).get("overrides", {}).get(site, {})
+        merged = _deep_merge(config, {k: v for k, v in overrides.items() if k != "max_concurrent"})
+        if site != DEFAULT_SITE and "drift_detection" in merged and \
+                "baseline_path" not in overrides.get("drift_detection", {}):
+            baseline_path = merged["drift_detection"]["baseline_path"]
+            merged["drift_detection"]["baseline_path"] = os.path.join(
+                os.path.dirname(baseline_path), site, os.path.basename(baseline_path))
+        merged["site"] = site
+        _compiled[key] = merged
+    return _compiled[key]
+
+
+def site_dir(base_dir: str, site: str) -> str:
+    """Per-site sub-folder of an output zone; the default site keeps the zone root."""
+    return base_dir if site == DEFAULT_SITE else os.path.join(base_dir, site)
+
+
+def site_concurrency(config: dict, site: str) -> int:
+    """Maximum number of workers one site may occupy at a time, or None for the scheduler's fair share."""
+    sites = config.get("sites", {})
+    return sites.get("overrides", {}).get(site, {}).get("max_concurrent", sites.get("max_concurrent_per_site"))
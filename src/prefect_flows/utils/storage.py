@@ -0,0 +1,222 @@
+import json
+import os
+import shutil
+import threading
+from urllib.parse import urlparse
+
+# pyarrow is only imported for object-store zones and pyarrow readers/writers,
+# so light entry points (upload app, reports listing) stay cheap on local disk
+
+# Zones keep the local paths the pipeline has always used. A zone with a
+# ``uri`` maps everything under its ``root`` to that object-store location
+# instead, so callers keep building paths as before and resolve them here.
+DEFAULT_STORAGE_CONFIG = {
+    "zones": {
+        "raw": {"root": "./data/raw", "uri": None},
+        "cleansed": {"root": "data/cleansed", "uri": None},
+        "reports": {"root": "./data/reports", "uri": None}
+    },
+    "s3": {
+        "endpoint_override": None,  # e.g. "localhost:9000" for a MinIO emulator
+        "scheme": "https",
+        "region": None,
+        "access_key": None,         # None uses the usual AWS environment/credential chain
+        "secret_key": None,
+        "part_size_bytes": 16 * 1024 ** 2,
+        "io_threads": 16            # concurrent object requests, including multipart parts
+    }
+}
+
+# One S3 filesystem per connection settings: its client, and with it the
+# connection pool, is shared by every zone and call in the process
+_filesystems = {}
+_zones = {}
+_lock = threading.Lock()
+
+
+def storage_config(config: dict = None) -> dict:
+    storage = (config or {}).get("storage") or {}
+    zones = {name: dict(zone) for name, zone in DEFAULT_STORAGE_CONFIG["zones"].items()}
+    for name, zone in storage.get("zones", {}).items():
+        zones[name] = {**zones.get(name, {}), **zone}
+    return {"zones": zones, "s3": {**DEFAULT_STORAGE_CONFIG["s3"], **storage.get("s3", {})}}
+
+
+def _local_filesystem():
+    import pyarrow.fs as pafs
+    return pafs.LocalFileSystem()
+
+
+def _s3_filesystem(s3_config: dict):
+    key = json.dumps(s3_config, sort_keys=True)
+    with _lock:
+        if key not in _filesystems:
+            import pyarrow.fs as pafs
+            _filesystems[key] = pafs.S3FileSystem(
+                endpoint_override=s3_config["endpoint_override"],
+                scheme=s3_config["scheme"],
+                region=s3_config["region"],
+                access_key=s3_config["access_key"],
+                secret_key=s3_config["secret_key"],
+                # Parts of a multipart upload are sent in the background, in parallel
+                background_writes=True
+            )
+        return _filesystems[key]
+
+
+class Zone:
+    """One storage zone: a local root, optionally mapped to an S3-compatible bucket prefix."""
+
+    def __init__(self, name: str, root: str, uri: str = None, s3_config: dict = None):
+        self.name = name
+        self.root = os.path.abspath(root)
+        self.uri = uri
+        self.s3_config = s3_config or DEFAULT_STORAGE_CONFIG["s3"]
+        self.base = self.root
+        if uri is not None:
+            parsed = urlparse(uri)
+            if parsed.scheme != "s3":
+                raise ValueError(f"Unsupported storage URI for zone '{name}': {uri}")
+            self.base = f"{parsed.netloc}{parsed.path}".rstrip("/")
+
+    @property
+    def is_local(self) -> bool:
+        return self.uri is None
+
+    @property
+    def filesystem(self):
+        return _local_filesystem() if self.is_local else _s3_filesystem(self.s3_config)
+
+    def contains(self, path: str) -> bool:
+        path = os.path.abspath(path)
+        return path == self.root or path.startswith(self.root + os.sep)
+
+    def resolve(self, path: str) -> str:
+        """Filesystem path of ``path``, a local path under this zone's root."""
+        if self.is_local:
+            return os.path.abspath(path)
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        return self.base if relative == "." else f"{self.base}/{relative.replace(os.sep, '/')}"
+
+
+def zones(config: dict = None) -> list:
+    """Configured zones, built once per storage config."""
+    if config is None:
+        from src.prefect_flows.utils.config import load_config
+        config = load_config()
+    settings = storage_config(config)
+    key = json.dumps(settings, sort_keys=True)
+    with _lock:
+        if key not in _zones:
+            _zones[key] = [Zone(name, zone["root"], zone.get("uri"), settings["s3"])
+                           for name, zone in settings["zones"].items()]
+        return _zones[key]
+
+
+def configure_io(config: dict = None):
+    """Size Arrow's process-wide I/O pool for object-store zones; call once at process startup.
+
+    The pool carries concurrent object requests, including multipart parts.
+    Local-only setups keep Arrow's default.
+    """
+    if any(not zone.is_local for zone in zones(config)):
+        import pyarrow as pa
+        pa.set_io_thread_count(storage_config(config)["s3"]["io_threads"])
+
+
+def zone_for(path: str, config: dict = None) -> Zone:
+    """Zone holding ``path``, or None for paths outside every zone (plain local files)."""
+    matches = [zone for zone in zones(config) if zone.contains(path)]
+    # Nested roots: the most specific zone wins
+    return max(matches, key=lambda zone: len(zone.root), default=None)
+
+
+def _remote_zone(path: str, config: dict = None) -> Zone:
+    zone = zone_for(path, config)
+    return None if zone is None or zone.is_local else zone
+
+
+def resolve(path: str, config: dict = None) -> tuple:
+    """``(filesystem, path)`` for pyarrow readers and writers."""
+    zone = _remote_zone(path, config)
+    if zone is None:
+        return _local_filesystem(), os.path.abspath(path)
+    return zone.filesystem, zone.resolve(path)
+
+
+def is_local(path: str, config: dict = None) -> bool:
+    return _remote_zone(path, config) is None
+
+
+def require_local(*paths, config: dict = None):
+    """Fail clearly where append/rename semantics are needed and a zone is an object store."""
+    remote = [path for path in paths if not is_local(path, config)]
+    if remote:
+        raise ValueError(f"Needs a local storage zone, but these paths map to an object store: {remote}")
+
+
+def location(path: str, config: dict = None) -> str:
+    """Where ``path`` is actually stored: the path itself, or its object-store URI."""
+    zone = _remote_zone(path, config)
+    return path if zone is None else f"s3://{zone.resolve(path)}"
+
+
+def write_bytes(path: str, data: bytes, config: dict = None):
+    zone = _remote_zone(path, config)
+    if zone is None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return
+    with zone.filesystem.open_output_stream(zone.resolve(path)) as stream:
+        stream.write(data)
+
+
+def read_bytes(path: str, config: dict = None) -> bytes:
+    zone = _remote_zone(path, config)
+    if zone is None:
+        with open(path, "rb") as f:
+            return f.read()
+    with zone.filesystem.open_input_stream(zone.resolve(path)) as stream:
+        return stream.read()
+
+
+def exists(path: str, config: dict = None) -> bool:
+    zone = _remote_zone(path, config)
+    if zone is None:
+        return os.path.exists(path)
+    import pyarrow.fs as pafs
+    return zone.filesystem.get_file_info(zone.resolve(path)).type != pafs.FileType.NotFound
+
+
+def put_file(local_path: str, path: str, config: dict = None):
+    """Store a local file at ``path``; object stores get a parallel multipart upload."""
+    zone = _remote_zone(path, config)
+    if zone is None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        shutil.copy2(local_path, path)
+        return
+    import pyarrow.fs as pafs
+    pafs.copy_files(os.path.abspath(local_path), zone.resolve(path),
+                    source_filesystem=_local_filesystem(), destination_filesystem=zone.filesystem,
+                    chunk_size=zone.s3_config["part_size_bytes"], use_threads=True)
+
+
+def list_files(directory: str, suffix: str = "", config: dict = None) -> list:
+    """``(path, modified time)`` of the files directly in ``directory``; empty if it does not exist."""
+    zone = _remote_zone(directory, config)
+    if zone is None:
+        if not os.path.isdir(directory):
+            return []
+        return [(entry.path, entry.stat().st_mtime) for entry in os.scandir(directory)
+                if entry.is_file() and entry.name.endswith(suffix)]
+    import pyarrow.fs as pafs
+    infos = zone.filesystem.get_file_info(pafs.FileSelector(zone.resolve(directory), allow_not_found=True))
+    return [(os.path.join(directory, info.base_name), info.mtime.timestamp() if info.mtime else 0.0)
+            for info in infos if info.type == pafs.FileType.File and info.base_name.endswith(suffix)]
+
+
+def open_input_file(path: str, config: dict = None):
+    """Random-access file: Parquet readers fetch only the footer and the byte ranges they need."""
+    filesystem, source = resolve(path, config)
+    return filesystem.open_input_file(source)
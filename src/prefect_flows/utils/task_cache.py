@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_DIR = "./data/cache"
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+ATTRS_METADATA_KEY = b"frame_attrs"
+
+
+def config_version(config: dict) -> str:
+    """Stable fingerprint of the rules/config a stage ran with."""
+    encoded = json.dumps(config or {}, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _json_default(obj):
+    # numpy scalars and arrays, pandas Series
+    if hasattr(obj, 'item'):
+        return obj.item()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+
+class TaskCache:
+    """Content-addressed cache of stage outputs in a local directory.
+
+    Entries are keyed by stage name, the SHA-256 of the input file and the
+    config version, so a retry or re-run of the same file with the same
+    rules resumes after the last completed stage. Frames are stored as
+    Parquet, everything else as JSON. Hits refresh an entry's mtime; entries
+    unused for ``max_age_seconds`` are evicted, and then the least recently
+    used ones while the directory exceeds ``max_bytes``.
+
+    Several warm workers share the directory: every write goes through its
+    own temporary file, entries may vanish under another worker's eviction
+    at any time, and a failing cache read or write never fails the stage.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, stage: str, input_hash: str, config: dict = None) -> str:
+        return hashlib.sha256(f"{stage}:{input_hash}:{config_version(config)}".encode()).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def _hit(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        os.utime(path)  # mark as recently used
+        return True
+
+    def _tmp_path(self) -> str:
+        """Unique temporary file in the cache directory, so concurrent writers of one key never collide."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def _commit(self, tmp_path: str, path: str):
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_json(self, key: str):
+        path = self._path(key, ".json")
+        if not self._hit(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put_json(self, key: str, value):
+        path = self._path(key, ".json")
+        tmp_path = self._tmp_path()
+        with open(tmp_path, 'w') as f:
+            json.dump(value, f, default=_json_default)
+        self._commit(tmp_path, path)
+
+    def get_frame(self, key: str):
+        path = self._path(key, ".parquet")
+        if not self._hit(path):
+            return None
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        df = table.to_pandas()
+        # DataFrame.attrs (e.g. imputed-cell counts) travel in the schema metadata
+        attrs = (table.schema.metadata or {}).get(ATTRS_METADATA_KEY)
+        df.attrs = json.loads(attrs) if attrs else {}
+        return df
+
+    def put_frame(self, key: str, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        path = self._path(key, ".parquet")
+        tmp_path = self._tmp_path()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        attrs = json.dumps(df.attrs, default=_json_default).encode()
+        pq.write_table(table.replace_schema_metadata({**(table.schema.metadata or {}), ATTRS_METADATA_KEY: attrs}),
+                       tmp_path)
+        self._commit(tmp_path, path)
+
+    def get_or_compute(self, stage: str, input_hash: str, config: dict, compute, kind: str = "json",
+                       is_valid=lambda value: True):
+        """Return the cached output of ``stage`` or compute, cache and return it.
+
+        ``kind`` is "json" or "frame". Results rejected by ``is_valid`` (for
+        example error payloads) are returned but not cached.
+        """
+        key = self.key(stage, input_hash, config)
+        getter, putter = (self.get_frame, self.put_frame) if kind == "frame" else (self.get_json, self.put_json)
+
+        try:
+            cached = getter(key)
+        except Exception as e:
+            # e.g. evicted by another worker between the lookup and the read
+            print(f"Cache read for stage '{stage}' failed, recomputing: {e}")
+            cached = None
+        if cached is not None and is_valid(cached):
+            print(f"Cache hit for stage '{stage}'")
+            return cached
+
+        value = compute()
+        if is_valid(value):
+            try:
+                putter(key, value)
+            except Exception as e:
+                print(f"Cache write for stage '{stage}' failed: {e}")
+        return value
+
+    def evict(self):
+        """Delete entries unused for ``max_age_seconds``, then the least recently used until under ``max_bytes``."""
+        expired_before = time.time() - self.max_age_seconds
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # already evicted by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes and mtime >= expired_before:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
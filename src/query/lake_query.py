@@ -0,0 +1,88 @@
+# src/query/lake_query.py
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.prefect_flows.utils import storage
+
+CLEANSED_DIR = "data/cleansed"
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+
+def open_lake(path: str = CLEANSED_DIR, config: dict = None) -> ds.Dataset:
+    """Open every Parquet file under the cleansed zone as one dataset (footers only).
+
+    On an object-store zone (as configured in ``config``) reads are ranged
+    requests for the needed column chunks, pre-buffered so nearby ranges
+    are fetched together.
+    """
+    filesystem, source = storage.resolve(path, config)
+    parquet_format = ds.ParquetFileFormat(
+        default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=not storage.is_local(path, config)))
+    return ds.dataset(source, filesystem=filesystem, format=parquet_format)
+
+
+def to_expression(filters):
+    """Turn pandas-style filters into an Arrow expression.
+
+    ``filters`` is either an Arrow expression or a list of ``(column, op, value)``
+    tuples that are AND-ed together, e.g. ``[("fail", "==", 1),
+    ("Temperature", ">", 30)]``; a list of such lists is OR-ed (DNF).
+    """
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+
+def scan(filters=None, columns: list = None, batch_size: int = DEFAULT_BATCH_SIZE,
+         path: str = CLEANSED_DIR, config: dict = None):
+    """Stream matching record batches from the lake.
+
+    Only ``columns`` are read from disk, and row groups whose min/max
+    statistics cannot satisfy ``filters`` are skipped without being decoded.
+    """
+    dataset = open_lake(path, config)
+    yield from dataset.to_batches(columns=columns, filter=to_expression(filters), batch_size=batch_size)
+
+
+def iter_frames(filters=None, columns: list = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                path: str = CLEANSED_DIR, config: dict = None):
+    """Same as ``scan`` but yields pandas DataFrames, one per batch."""
+    for batch in scan(filters, columns, batch_size, path, config):
+        yield batch.to_pandas()
+
+
+def count(filters=None, path: str = CLEANSED_DIR, config: dict = None) -> int:
+    """Count matching rows; unfiltered counts come straight from the Parquet footers."""
+    return open_lake(path, config).count_rows(filter=to_expression(filters))
+
+
+def aggregate(group_by: str = "tempMode", columns: list = None, filters=None,
+              path: str = CLEANSED_DIR, config: dict = None) -> pd.DataFrame:
+    """Row counts and per-group means computed batch by batch.
+
+    Each batch is reduced to per-group sums and counts before the next one is
+    read, so memory is bounded by the number of groups rather than the size
+    of the lake.
+    """
+    dataset = open_lake(path, config)
+    if columns is None:
+        columns = [field.name for field in dataset.schema
+                   if field.name != group_by
+                   and (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))]
+
+    aggregations = [(group_by, "count")] + [(col, "sum") for col in columns] + [(col, "count") for col in columns]
+    totals = None
+    for batch in scan(filters, [group_by] + columns, path=path, config=config):
+        partial = pa.Table.from_batches([batch]).group_by(group_by).aggregate(aggregations)
+        partial = partial.to_pandas().set_index(group_by)
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+
+    if totals is None:
+        return pd.DataFrame(columns=[group_by, "row_count"] + [f"{col}_mean" for col in columns])
+
+    result = pd.DataFrame({"row_count": totals[f"{group_by}_count"].astype("int64")})
+    for col in columns:
+        result[f"{col}_mean"] = totals[f"{col}_sum"] / totals[f"{col}_count"]
+    return result.sort_index().reset_index()
@@ -9,38 +9,171 @@ from watchdog.events import FileSystemEventHandler
 project_root = os.path.join(os.path.dirname(__file__), '..', '..')
 sys.path.append(project_root)
 
-from src.prefect_flows.flows.data_ingestion_flow import data_ingestion_flow
+from src.prefect_flows.utils.batch_upload import is_batch_manifest, is_batch_member, load_batch
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.file_formats import is_supported
+from src.prefect_flows.utils.job_store import get_job_store
+from src.prefect_flows.utils.offset_checkpoint import get_offset
+from src.prefect_flows.utils.sites import site_of
+from src.triggers.scheduler import scheduler_config, take_priority_hint
+
+# The flows (and with them Prefect, pandas and pyarrow) are imported on the
+# first event, so the watcher is ready as soon as the observer starts
+
+def enqueue_inline(file_path: str, mode: str, config: dict) -> str:
+    """Job store entry for a file ingested on the observer thread.
+
+    There is no queue to order, but the priority requested at upload is
+    consumed (and recorded on the job) so hints never pile up.
+    """
+    priority = take_priority_hint(file_path, scheduler_config(config)["priority_hints_path"])
+    return get_job_store(config).enqueue(file_path, site=site_of(file_path), mode=mode, priority=priority)
+
+def ingest_batch(manifest_path: str, pool=None, config: dict = None):
+    """Ingest every file of a bulk upload, announced by its batch manifest."""
+    print(f"\nNew batch detected: {manifest_path}")
+    if pool is not None:
+        pool.submit_batch(manifest_path)
+        print("Batch queued for the warm ingestion workers...")
+        return
+    
+    from src.prefect_flows.flows.data_ingestion_flow import data_ingestion_flow
+    config = config or load_config()
+    manifest = load_batch(manifest_path)
+    batch_id, files = manifest["batch_id"], manifest["files"]
+    job_store = get_job_store(config)
+    job_store.batch_progress(batch_id, 0, 0, len(files))
+    failed = 0
+    for done, entry in enumerate(files, start=1):
+        job_id = job_store.enqueue(entry["file_path"], site=site_of(entry["file_path"]), mode="full",
+                                   priority=manifest.get("priority"), batch_id=batch_id)
+        result = data_ingestion_flow(entry["file_path"], config=config, job_id=job_id)
+        job_store.finish(job_id, result)
+        failed += result["status"] != "success"
+        job_store.batch_progress(batch_id, done, failed, len(files))
+    print(f"Batch completed: {len(files) - failed} of {len(files)} files ingested")
 
 class NewFileHandler(FileSystemEventHandler):
-    """Handler for new file events in the raw data directory."""
+    """Handler for new file events in the raw data directory.
+    
+    A bulk upload arrives as one batch manifest, after all of its files.
+    With a ``WarmWorkerPool`` files are handed to pre-started workers;
+    otherwise the flow runs inline on the observer thread with ``config``.
+    """
+    
+    def __init__(self, pool=None, config: dict = None):
+        super().__init__()
+        self.pool = pool
+        self.config = config or load_config()
     
     def on_created(self, event):
-        if not event.is_directory and event.src_path.endswith('.csv'):
+        if not event.is_directory and is_batch_manifest(event.src_path):
+            ingest_batch(event.src_path, self.pool, self.config)
+        elif not event.is_directory and is_supported(event.src_path) and not is_batch_member(event.src_path):
             print(f"\nNew file detected: {event.src_path}")
+            
+            if self.pool is not None:
+                self.pool.submit(event.src_path)
+                print("Queued for a warm ingestion worker...")
+                return
+            
             print("Starting data ingestion flow...")
             
             # Run the Prefect flow
-            result = data_ingestion_flow(event.src_path)
+            from src.prefect_flows.flows.data_ingestion_flow import data_ingestion_flow
+            job_id = enqueue_inline(event.src_path, "full", self.config)
+            result = data_ingestion_flow(event.src_path, config=self.config, job_id=job_id)
+            get_job_store(self.config).finish(job_id, result)
             
             if result['status'] == 'success':
                 print(f"Processing completed: {result['output_path']}")
             else:
                 print(f"Processing failed: {result['error']}")
 
-def start_folder_watcher(watch_path: str = "./data/landing"):
-    """Start watching a folder for new files."""
+class TailingFileHandler(FileSystemEventHandler):
+    """Handler that ingests only the lines appended to continuously growing files."""
+    
+    def __init__(self, pool=None, config: dict = None):
+        super().__init__()
+        self.pool = pool
+        self.config = config or load_config()
+    
+    def on_created(self, event):
+        if not event.is_directory and is_batch_manifest(event.src_path):
+            # Bulk uploads are complete files, ingested in full
+            ingest_batch(event.src_path, self.pool, self.config)
+            return
+        self._ingest_appended(event)
+    
+    def on_modified(self, event):
+        self._ingest_appended(event)
+    
+    def _ingest_appended(self, event):
+        if event.is_directory or not event.src_path.endswith('.csv') or is_batch_member(event.src_path):
+            return
+        
+        # Modify events arrive in bursts; skip them once the checkpoint has caught up
+        if os.path.getsize(event.src_path) <= get_offset(event.src_path).get("offset", 0):
+            return
+        
+        if self.pool is not None:
+            self.pool.submit(event.src_path, mode="incremental")
+            return
+        
+        from src.prefect_flows.flows.incremental_ingestion_flow import incremental_ingestion_flow
+        job_id = enqueue_inline(event.src_path, "incremental", self.config)
+        result = incremental_ingestion_flow(event.src_path, config=self.config, job_id=job_id)
+        get_job_store(self.config).finish(job_id, result)
+        
+        if result['status'] == 'success':
+            if result['rows']:
+                print(f"Appended {result['rows']} rows: {result['output_path']}")
+        else:
+            print(f"Processing failed: {result['error']}")
+
+def watch_landing(event_handler, watch_path: str = "./data/landing"):
+    """Start an observer on ``watch_path`` and its sub-folders; returns the running observer.
+    
+    Site uploads land in ``<watch_path>/<site>/`` and bulk uploads under
+    ``_batches/``, so the folder is always watched recursively.
+    """
+    os.makedirs(watch_path, exist_ok=True)
+    observer = Observer()
+    observer.schedule(event_handler, watch_path, recursive=True)
+    observer.start()
+    return observer
+
+def start_folder_watcher(watch_path: str = "./data/landing", tail: bool = False, workers: int = 0,
+                         config: dict = None):
+    """Start watching a folder for new files.
+    
+    With ``tail=True`` CSV files are treated as continuously growing and every
+    modification ingests only the newly appended complete lines. With
+    ``workers > 0`` files are processed by that many warm worker processes,
+    shared fairly between sites. Sub-folders are watched too: a file in
+    ``<watch_path>/<site>/`` belongs to that site.
+    """
     # Create the directory if it doesn't exist
     os.makedirs(watch_path, exist_ok=True)
     
-    print(f"Watching folder for new CSV files: {os.path.abspath(watch_path)}")
-    print("Drop CSV files in this folder to trigger processing...")
+    print(f"Watching folder for new data files: {os.path.abspath(watch_path)}")
+    print("Drop CSV, Parquet or Arrow files in this folder to trigger processing...")
     print("Press Ctrl+C to stop watching")
     
 
-    event_handler = NewFileHandler()
-    observer = Observer()
-    observer.schedule(event_handler, watch_path, recursive=False)
-    observer.start()
+    # Workers size their own I/O pools; this covers files ingested in this process
+    from src.prefect_flows.utils.storage import configure_io
+    config = config or load_config()
+    configure_io(config)
+
+    pool = None
+    if workers:
+        from src.triggers.worker_pool import WarmWorkerPool
+        print(f"Warming up {workers} ingestion workers...")
+        pool = WarmWorkerPool(workers=workers, config=config).start()
+    
+    event_handler = TailingFileHandler(pool, config) if tail else NewFileHandler(pool, config)
+    observer = watch_landing(event_handler, watch_path)
     
     try:
         while True:
@@ -50,6 +183,8 @@ def start_folder_watcher(watch_path: str = "./data/landing"):
         print("\nStopping folder watcher...")
     
     observer.join()
+    if pool is not None:
+        pool.stop()
 
 if __name__ == "__main__":
     start_folder_watcher()
\ No newline at end of file
@@ -0,0 +1,204 @@
+# src/triggers/micro_batch.py
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import pandas as pd
+
+# Add the project root to Python path
+project_root = os.path.join(os.path.dirname(__file__), '..', '..')
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.prefect_flows.tasks.cleanse_data import cleanse_frame
+from src.prefect_flows.tasks.Validate import validate_sensor_data
+from src.prefect_flows.utils.parquet_dataset import write_part
+from src.prefect_flows.utils.rollups import compute_rollup, merge_rollup
+
+LATENCY_WINDOW = 10000  # most recent per-record latencies kept for percentiles
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Buffer sensor records in memory and push them through cleanse/validate/save in micro-batches.
+
+    A batch is flushed as soon as it holds ``batch_size`` records or its
+    oldest record has waited ``max_latency_seconds``, whichever comes first.
+    End-to-end latency is measured per record from ``submit`` until its
+    batch has been committed to the Parquet dataset. Batches are cleansed
+    and validated with ``config`` (imputation, schema registry, validation
+    rules), like files. A batch that fails validation or cannot be
+    processed at all is counted as rejected and its records are written to
+    ``quarantine_dir`` with the reason, to be ``replay``-ed later.
+    """
+
+    def __init__(self, batch_size: int = 500, max_latency_seconds: float = 1.0,
+                 output_dir: str = "data/cleansed/stream", parquet_config: dict = None, config: dict = None,
+                 quarantine_dir: str = "data/quarantine/stream"):
+        self.batch_size = batch_size
+        self.max_latency_seconds = max_latency_seconds
+        self.output_dir = output_dir
+        self.quarantine_dir = quarantine_dir
+        self.config = config or {}
+        self.parquet_config = parquet_config or self.config.get("parquet")
+
+        self._buffer = []
+        self._arrivals = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer = None
+
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stats = {
+            "records_received": 0,
+            "records_committed": 0,
+            "records_rejected": 0,
+            "batches_flushed": 0,
+            "last_flush_seconds": None,
+            "last_output_path": None,
+            "last_error": None,
+            "last_quarantine_path": None
+        }
+
+    def start(self):
+        """Start the background thread that enforces the latency trigger."""
+        if self._timer is None:
+            self._stop.clear()
+            self._timer = threading.Thread(target=self._run_timer, name="micro-batch-timer", daemon=True)
+            self._timer.start()
+
+    def stop(self):
+        """Stop the timer thread and flush whatever is still buffered."""
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        self.flush()
+
+    def submit(self, records: list) -> int:
+        """Add records to the current batch; returns the number of records buffered."""
+        now = time.monotonic()
+        with self._lock:
+            self._buffer.extend(records)
+            self._arrivals.extend([now] * len(records))
+            self._stats["records_received"] += len(records)
+            buffered = len(self._buffer)
+
+        if buffered >= self.batch_size:
+            self.flush()
+        return buffered
+
+    def flush(self):
+        """Cleanse, validate and save the buffered records as one Parquet part."""
+        with self._flush_lock:
+            with self._lock:
+                records, arrivals = self._buffer, self._arrivals
+                self._buffer, self._arrivals = [], []
+            if not records:
+                return None
+
+            started = time.monotonic()
+            output_path, error, quarantine_path = None, None, None
+            try:
+                df = cleanse_frame(pd.DataFrame.from_records(records), self.config.get("imputation"),
+                                   schema_registry=self.config.get("schema_registry"))
+                validation_results = validate_sensor_data.fn(df, self.config)
+
+                if validation_results["success"]:
+                    part_name = f"part-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+                    output_path = write_part(df, self.output_dir, part_name, self.parquet_config,
+                                             config=self.config or None)
+                    merge_rollup(compute_rollup(df, os.path.normpath(output_path)))
+                else:
+                    error = f"Failed validation: {validation_results['errors']}"
+            except Exception as e:
+                # Re-queueing would fail the same way on every flush (e.g. a non-numeric reading)
+                error = f"Could not be processed: {e}"
+
+            if error is not None:
+                try:
+                    quarantine_path = self._quarantine(records, error)
+                    logger.warning("Micro-batch of %d records rejected (%s); quarantined to %s",
+                                   len(records), error, quarantine_path)
+                except OSError:
+                    logger.exception("Micro-batch of %d records rejected (%s) and could not be quarantined",
+                                     len(records), error)
+
+            finished = time.monotonic()
+            with self._lock:
+                self._latencies.extend(finished - arrived for arrived in arrivals)
+                self._stats["records_rejected" if error else "records_committed"] += len(records)
+                self._stats["batches_flushed"] += 1
+                self._stats["last_flush_seconds"] = finished - started
+                self._stats["last_output_path"] = output_path
+                if error is not None:
+                    self._stats["last_error"] = error
+                    self._stats["last_quarantine_path"] = quarantine_path
+            return output_path
+
+    def _quarantine(self, records: list, reason: str) -> str:
+        """Write a rejected batch's records, as submitted, to the quarantine folder; returns the file."""
+        os.makedirs(self.quarantine_dir, exist_ok=True)
+        path = os.path.join(self.quarantine_dir, f"batch-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json")
+        # Write-then-rename so a replay never picks up a half-written batch
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"rejected_at": datetime.now().isoformat(), "reason": reason, "records": records}, f,
+                      default=str)
+        os.replace(tmp_path, path)
+        return path
+
+    def replay(self, quarantine_path: str) -> int:
+        """Submit a quarantined batch's records again (e.g. after a rule fix); returns how many.
+
+        A batch rejected again is quarantined under a new name.
+        """
+        with open(quarantine_path) as f:
+            records = json.load(f)["records"]
+        os.remove(quarantine_path)
+        self.submit(records)
+        return len(records)
+
+    def metrics(self) -> dict:
+        """Counters plus achieved end-to-end latency over the most recent records."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self._stats)
+            buffered = len(self._buffer)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(int(len(latencies) * p), len(latencies) - 1)]
+
+        return {
+            **stats,
+            "buffered_records": buffered,
+            "batch_size": self.batch_size,
+            "max_latency_seconds": self.max_latency_seconds,
+            "latency_seconds": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] if latencies else None
+            }
+        }
+
+    def _run_timer(self):
+        # Poll at a fraction of the latency budget so the oldest record never waits much longer
+        interval = max(self.max_latency_seconds / 10, 0.01)
+        while not self._stop.wait(interval):
+            with self._lock:
+                oldest = self._arrivals[0] if self._arrivals else None
+            if oldest is not None and time.monotonic() - oldest >= self.max_latency_seconds:
+                try:
+                    self.flush()
+                except Exception:
+                    # The latency trigger must outlive any single failed flush
+                    logger.exception("Micro-batch flush failed")
@@ -0,0 +1,264 @@
+# src/triggers/scheduler.py
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime
+
+from src.prefect_flows.utils.file_lock import file_lock
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+DEFAULT_PRIORITY = "normal"
+
+DEFAULT_SCHEDULER_CONFIG = {
+    "fast_lane_max_bytes": 10 * 1024 ** 2,               # files up to this size may use the fast lane
+    "fast_lane_workers": 1,                              # workers that never take larger files
+    "initial_throughput_bytes_per_second": 20 * 1024 ** 2,
+    "status_path": "./data/queue/status.json",
+    "priority_hints_path": "./data/queue/priorities.json"
+}
+
+
+def scheduler_config(config: dict = None) -> dict:
+    return {**DEFAULT_SCHEDULER_CONFIG, **((config or {}).get("scheduler") or {})}
+
+
+class JobScheduler:
+    """Decides which queued ingestion job a free worker runs next.
+
+    Ordering, most significant first:
+
+    * explicit priority ("high", "normal", "low"; uploads may set it),
+    * fair share: sites with fewer running jobs go first. A site with a
+      ``max_concurrent`` limit (``limit_for(site)``) never runs more jobs
+      than that; other sites may take up to half of the workers while
+      another site has runnable work, and every worker otherwise,
+    * size: estimated run time minus time already waited, so small files
+      overtake backfills but large files still age to the front.
+
+    ``fast_lane_workers`` workers are held back from files larger than
+    ``fast_lane_max_bytes``, so a small file never waits for a multi-GB
+    one to finish. Jobs for the same file run one at a time, in order.
+    Not thread-safe; the pool calls it under its lock.
+    """
+
+    def __init__(self, limit_for, workers: int, config: dict = None):
+        self.limit_for = limit_for
+        self.workers = workers
+        self.fair_share = max(1, (workers + 1) // 2)
+        self.config = scheduler_config(config)
+        # At least one worker must remain free to take large files
+        self.large_slots = workers - min(self.config["fast_lane_workers"], workers - 1)
+        self.throughput = self.config["initial_throughput_bytes_per_second"]
+        self._queued = []
+        self._running = {}  # job id -> job
+        self._site_running = Counter()
+
+    def is_small(self, job: dict) -> bool:
+        return job["size_bytes"] <= self.config["fast_lane_max_bytes"]
+
+    def estimate_seconds(self, job: dict) -> float:
+        return job["size_bytes"] / self.throughput
+
+    def _score(self, job: dict, now: float) -> float:
+        return _score(job["size_bytes"], now - job["queued_at"], self.throughput)
+
+    def push(self, job: dict):
+        """Queue a job; it needs ``id``, ``site``, ``file_path`` and ``size_bytes`` keys."""
+        job.setdefault("priority", DEFAULT_PRIORITY)
+        job.setdefault("queued_at", time.time())
+        self._queued.append(job)
+
+    def pop(self):
+        """Next runnable job, or None if every queued job is blocked."""
+        now = time.time()
+        running_files = {job["file_path"] for job in self._running.values()}
+        large_allowed = sum(not self.is_small(job) for job in self._running.values()) < self.large_slots
+        seen_files = set()
+        best = None
+        for job in self._queued:
+            if job["file_path"] in seen_files:
+                continue  # only the oldest queued job of a file is eligible
+            seen_files.add(job["file_path"])
+            site_running = self._site_running[job["site"]]
+            limit = self.limit_for(job["site"])
+            if job["file_path"] in running_files or (limit is not None and site_running >= limit):
+                continue
+            if not large_allowed and not self.is_small(job):
+                continue
+            # Sites past their fair share only get workers no other site's jobs can use
+            over_share = limit is None and site_running >= self.fair_share
+            key = (over_share, PRIORITIES[job["priority"]], site_running, self._score(job, now))
+            if best is None or key < best[0]:
+                best = (key, job)
+        if best is None:
+            return None
+
+        job = best[1]
+        self._queued.remove(job)
+        job["started_at"] = now
+        self._running[job["id"]] = job
+        self._site_running[job["site"]] += 1
+        return job
+
+    def finish(self, job_id, duration_seconds: float = None):
+        """Release a finished job's slots and refine the throughput estimate."""
+        job = self._running.pop(job_id)
+        self._site_running[job["site"]] -= 1
+        if duration_seconds and job["size_bytes"]:
+            self.throughput = 0.8 * self.throughput + 0.2 * job["size_bytes"] / duration_seconds
+        return job
+
+    def running_job(self, job_id) -> dict:
+        return self._running.get(job_id)
+
+    def queued(self) -> int:
+        return len(self._queued)
+
+    def running(self) -> dict:
+        return {site: count for site, count in self._site_running.items() if count}
+
+    def snapshot(self) -> dict:
+        """Running jobs and queued jobs with their position and estimated start time.
+
+        Start times come from list-scheduling the queue, in priority/size
+        order, onto the workers as they are expected to free up.
+        """
+        now = time.time()
+        running = [{**_public(job), "started_at": _iso(job["started_at"]),
+                    "estimated_finish": _iso(job["started_at"] + self.estimate_seconds(job))}
+                   for job in self._running.values()]
+        ordered = sorted(self._queued, key=lambda job: (PRIORITIES[job["priority"]], self._score(job, now)))
+        status = {
+            "updated_at": _iso(now),
+            "workers": self.workers,
+            "large_slots": self.large_slots,
+            "fast_lane_max_bytes": self.config["fast_lane_max_bytes"],
+            "throughput_bytes_per_second": self.throughput,
+            "running": running,
+            "queued": []
+        }
+        starts = _list_schedule(status, [job["size_bytes"] for job in ordered], now)
+        status["queued"] = [{**_public(job), "queued_at": job["queued_at"], "position": position,
+                             "estimated_start": _iso(start)}
+                            for position, (job, start) in enumerate(zip(ordered, starts), start=1)]
+        return status
+
+
+def _score(size_bytes: int, waited_seconds: float, throughput: float) -> float:
+    """Size ordering within a priority: estimated run time minus time already waited."""
+    return size_bytes / throughput - waited_seconds
+
+
+def _list_schedule(status: dict, sizes: list, now: float) -> list:
+    """Estimated start time of each job size, run in order on the workers in ``status``.
+
+    Large files additionally wait for one of the ``large_slots`` workers
+    outside the fast lane.
+    """
+    throughput = status["throughput_bytes_per_second"]
+    is_large = lambda size: size > status["fast_lane_max_bytes"]
+    finishes = [(max(now, datetime.fromisoformat(job["estimated_finish"]).timestamp()), is_large(job["size_bytes"]))
+                for job in status["running"]]
+    free_at = sorted([finish for finish, _ in finishes] + [now] * (status["workers"] - len(finishes)))
+    large_running = sorted(finish for finish, large in finishes if large)
+    large_free = sorted(large_running + [now] * (status["large_slots"] - len(large_running)))
+
+    starts = []
+    for size in sizes:
+        start = max(free_at[0], large_free[0]) if is_large(size) else free_at[0]
+        finish = start + size / throughput
+        free_at[0] = finish
+        free_at.sort()
+        if is_large(size):
+            large_free[0] = finish
+            large_free.sort()
+        starts.append(start)
+    return starts
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
+
+
+def _public(job: dict) -> dict:
+    return {key: job[key] for key in ("id", "job_id", "file_path", "site", "mode", "priority", "size_bytes") if key in job}
+
+
+def publish_status(snapshot: dict, status_path: str = DEFAULT_SCHEDULER_CONFIG["status_path"]):
+    """Write the queue snapshot for other processes (e.g. the upload API) to read."""
+    os.makedirs(os.path.dirname(status_path), exist_ok=True)
+    tmp_path = f"{status_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, status_path)
+
+
+def load_status(status_path: str = DEFAULT_SCHEDULER_CONFIG["status_path"]) -> dict:
+    """Latest published queue snapshot, or None if no worker pool is publishing one."""
+    if not os.path.exists(status_path):
+        return None
+    with open(status_path) as f:
+        return json.load(f)
+
+
+def find_job(status: dict, file_path: str) -> dict:
+    """Latest running or queued entry for ``file_path`` in a snapshot, with its state."""
+    file_path = os.path.abspath(file_path)
+    for state in ("queued", "running"):
+        for job in reversed((status or {}).get(state, [])):
+            if job["file_path"] == file_path:
+                return {**job, "state": state}
+    return None
+
+
+def estimate_start(status: dict, size_bytes: int, priority: str = DEFAULT_PRIORITY) -> dict:
+    """Where a file about to be queued would land: position and estimated start time.
+
+    Queued jobs are ordered as ``JobScheduler.pop`` orders them, by
+    priority and then by size aged by the time they have already waited.
+    """
+    if not status:
+        return {"position": None, "estimated_start": None}
+    now = time.time()
+    throughput = status["throughput_bytes_per_second"]
+    key = (PRIORITIES[priority], _score(size_bytes, 0, throughput))
+    ahead = [job for job in status["queued"]
+             if (PRIORITIES[job["priority"]], _score(job["size_bytes"], now - job["queued_at"], throughput)) <= key]
+    starts = _list_schedule(status, [job["size_bytes"] for job in ahead] + [size_bytes], now)
+    return {"position": len(ahead) + 1, "estimated_start": _iso(starts[-1])}
+
+
+def save_priority_hint(file_path: str, priority: str,
+                       hints_path: str = DEFAULT_SCHEDULER_CONFIG["priority_hints_path"]):
+    """Record the requested priority of a file before it lands, for the pool to pick up."""
+    with file_lock(hints_path):
+        hints = _load_hints(hints_path)
+        hints[os.path.abspath(file_path)] = priority
+        _write_hints(hints, hints_path)
+
+
+def take_priority_hint(file_path: str, hints_path: str = DEFAULT_SCHEDULER_CONFIG["priority_hints_path"]) -> str:
+    """Consume the requested priority of a landed file, if any."""
+    if not os.path.exists(hints_path):
+        return None
+    with file_lock(hints_path):
+        hints = _load_hints(hints_path)
+        priority = hints.pop(os.path.abspath(file_path), None)
+        if priority is not None:
+            _write_hints(hints, hints_path)
+    return priority
+
+
+def _load_hints(hints_path: str) -> dict:
+    if not os.path.exists(hints_path):
+        return {}
+    with open(hints_path) as f:
+        return json.load(f)
+
+
+def _write_hints(hints: dict, hints_path: str):
+    tmp_path = f"{hints_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(hints, f, indent=2)
+    os.replace(tmp_path, hints_path)
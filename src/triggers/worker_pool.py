@@ -0,0 +1,311 @@
+# src/triggers/worker_pool.py
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+# Add the project root to Python path
+project_root = os.path.join(os.path.dirname(__file__), '..', '..')
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.prefect_flows.utils.batch_upload import load_batch
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.job_store import get_job_store
+from src.prefect_flows.utils.sites import site_of, site_concurrency
+from src.triggers.scheduler import JobScheduler, PRIORITIES, scheduler_config, publish_status, take_priority_hint
+
+WORKER_POLL_SECONDS = 1.0  # how often a quiet pool checks that its workers are still alive
+
+
+def _warmup():
+    """Empty flow run so Prefect's API client and database are ready before the first file."""
+
+
+def _worker_main(task_queue, result_queue, config: dict):
+    """Worker process: pay for imports and pipeline state once, then serve file paths.
+
+    ``config`` is the pool's, so files run with the config they were scheduled with.
+    """
+    # Heavy imports, configuration and validation rules are loaded once per worker
+    from prefect import flow
+    from src.prefect_flows.flows.data_ingestion_flow import data_ingestion_flow
+    from src.prefect_flows.flows.incremental_ingestion_flow import incremental_ingestion_flow
+    from src.prefect_flows.utils.report_sink import get_report_sink
+    from src.prefect_flows.utils.storage import configure_io
+
+    configure_io(config)
+    flows = {"full": data_ingestion_flow, "incremental": incremental_ingestion_flow}
+    flow(name="ingestion-worker-warmup")(_warmup)()
+    result_queue.put(("ready", os.getpid(), None))
+
+    while True:
+        job = task_queue.get()
+        if job is None:
+            break
+        job_id, file_path, mode, store_id = job
+        started = time.monotonic()
+        try:
+            result = flows[mode](file_path, config=config, job_id=store_id)
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+        result["file_path"] = file_path
+        result["duration_seconds"] = time.monotonic() - started
+        result_queue.put(("done", job_id, result))
+
+    # Commit documents still waiting in a batched report sink before exiting
+    get_report_sink(config).flush()
+
+
+def print_result(result: dict):
+    """Default result callback, matching the watcher's console output."""
+    if result['status'] == 'success':
+        if result.get('rows', None) != 0:
+            print(f"Processing completed: {result['output_path']}")
+    else:
+        print(f"Processing failed: {result['error']}")
+
+
+class WarmWorkerPool:
+    """Pool of long-lived ingestion worker processes.
+
+    Workers are started once and keep Prefect, pandas, pyarrow, the config
+    and the compiled validation rules in memory; each then receives file
+    paths over its own queue, so per-file overhead is only the data work.
+    Jobs are held in the parent and handed to a worker only when it is free,
+    in the order chosen by a ``JobScheduler`` (priority, then fair share
+    between sites, then size, with a fast lane for small files). Every
+    change to the queue is published as a snapshot with queue positions and
+    estimated start times for the upload API, and each job's lifecycle is
+    recorded in the job store (``/jobs``).
+
+    A worker that dies (OOM killer, a crash in native code) fails the job
+    it was running and is replaced by a fresh process in the same slot.
+    """
+
+    def __init__(self, workers: int = None, on_result=print_result, config: dict = None,
+                 ready_timeout: float = 300.0):
+        self.workers = workers or os.cpu_count()
+        self.ready_timeout = ready_timeout
+        self.on_result = on_result
+        self.results = {}
+        self.config = config or load_config()
+        self.scheduler = JobScheduler(lambda site: site_concurrency(self.config, site), self.workers, self.config)
+        self._status_path = scheduler_config(self.config)["status_path"]
+        self._hints_path = scheduler_config(self.config)["priority_hints_path"]
+        self.job_store = get_job_store(self.config)
+
+        # spawn: the parent may already run watcher/web threads, which fork does not survive
+        self._context = multiprocessing.get_context("spawn")
+        self._task_queues = []
+        self._processes = []
+        self._result_queue = None
+        self._collector = None
+        self._job_ids = itertools.count(1)
+        self._unfinished = set()
+        self._running = {}  # job id -> worker
+        self._batches = {}  # batch job id -> progress counters
+        self._idle = []
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+
+    def _start_worker(self, slot: int):
+        """Start a worker process for ``slot`` (a new slot, or one whose process died)."""
+        task_queue = self._context.Queue()
+        process = self._context.Process(target=_worker_main, args=(task_queue, self._result_queue, self.config),
+                                        daemon=True)
+        process.start()
+        if slot < len(self._processes):
+            self._task_queues[slot], self._processes[slot] = task_queue, process
+        else:
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+
+    def start(self, wait_ready: bool = True):
+        """Start the workers; by default block until every worker has finished warming up.
+
+        Raises ``RuntimeError`` if a worker dies while warming up or they are
+        not all ready within ``ready_timeout`` seconds.
+        """
+        self._result_queue = self._context.Queue()
+        for slot in range(self.workers):
+            self._start_worker(slot)
+
+        ready = 0
+        deadline = time.monotonic() + self.ready_timeout
+        while wait_ready and ready < self.workers:
+            try:
+                kind, _, _ = self._result_queue.get(timeout=WORKER_POLL_SECONDS)
+                ready += kind == "ready"
+                continue
+            except queue.Empty:
+                pass
+            dead = [process.exitcode for process in self._processes if not process.is_alive()]
+            if dead or time.monotonic() > deadline:
+                for process in self._processes:
+                    process.kill()
+                self._task_queues, self._processes = [], []
+                raise RuntimeError(f"Ingestion workers exited during warm-up (exit codes {dead})" if dead else
+                                   f"Ingestion workers not ready after {self.ready_timeout} seconds")
+
+        self._idle = list(range(self.workers))
+        self._collector = threading.Thread(target=self._collect_results, name="worker-results", daemon=True)
+        self._collector.start()
+        return self
+
+    def submit(self, file_path: str, mode: str = "full", priority: str = None, batch_id: str = None) -> int:
+        """Queue a file for ingestion ('full' or 'incremental'); returns the job id.
+
+        Without an explicit ``priority`` the one requested at upload is used,
+        if any, and otherwise the file is scheduled by size. ``batch_id``
+        ties the file to the batch job of a bulk upload.
+        """
+        # Always consumed, so an explicit priority does not leave the upload's hint behind
+        hint = take_priority_hint(file_path, self._hints_path)
+        priority = priority or hint
+        if priority is not None and priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        job = {"file_path": os.path.abspath(file_path), "path": file_path, "mode": mode,
+               "site": site_of(file_path), "size_bytes": os.path.getsize(file_path)}
+        if priority is not None:
+            job["priority"] = priority
+        if batch_id is not None:
+            job["batch_id"] = batch_id
+        job["job_id"] = self.job_store.enqueue(file_path, site=job["site"], mode=mode, priority=priority,
+                                               batch_id=batch_id)
+        with self._lock:
+            job["id"] = job_id = next(self._job_ids)
+            self._unfinished.add(job_id)
+            self.scheduler.push(job)
+            self._dispatch()
+        return job_id
+
+    def submit_batch(self, manifest_path: str) -> list:
+        """Queue every file of a bulk upload; returns the job ids.
+
+        The files are scheduled like any others, and the batch job in the
+        job store tracks how many have finished until the last one does.
+        """
+        manifest = load_batch(manifest_path)
+        batch_id = manifest["batch_id"]
+        with self._lock:
+            self._batches[batch_id] = {"total": len(manifest["files"]), "done": 0, "failed": 0, "started": False}
+        self.job_store.update(batch_id, "queued")
+        return [self.submit(entry["file_path"], priority=manifest.get("priority"), batch_id=batch_id)
+                for entry in manifest["files"]]
+
+    def status(self) -> dict:
+        """Running and queued jobs with queue positions and estimated start times."""
+        with self._lock:
+            return self.scheduler.snapshot()
+
+    def _dispatch(self):
+        # Caller holds self._lock
+        while self._idle:
+            job = self.scheduler.pop()
+            if job is None:
+                break
+            worker = self._idle.pop()
+            self._running[job["id"]] = worker
+            batch = self._batches.get(job.get("batch_id"))
+            if batch is not None and not batch["started"]:
+                batch["started"] = True
+                self.job_store.batch_progress(job["batch_id"], batch["done"], batch["failed"], batch["total"])
+            self._task_queues[worker].put((job["id"], job["path"], job["mode"], job["job_id"]))
+        publish_status(self.scheduler.snapshot(), self._status_path)
+
+    def wait(self, job_ids: list = None, timeout: float = None) -> dict:
+        """Block until the given jobs (default: all submitted jobs) have finished."""
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._done:
+            while any(job_id in self._unfinished for job_id in (job_ids or list(self._unfinished))):
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    break
+                self._done.wait(remaining)
+            return {job_id: self.results.get(job_id) for job_id in (job_ids or self.results)}
+
+    def stop(self):
+        """Let workers finish queued jobs, then shut them down."""
+        if self._collector is not None:
+            self.wait()
+        with self._lock:
+            # Workers exiting from here on are shutting down, not dead
+            self._stopping = True
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join()
+        if self._collector is not None:
+            self._result_queue.put(("stop", None, None))
+            self._collector.join()
+        self._task_queues, self._processes = [], []
+
+    def _collect_results(self):
+        while True:
+            try:
+                kind, job_id, result = self._result_queue.get(timeout=WORKER_POLL_SECONDS)
+            except queue.Empty:
+                self._replace_dead_workers()
+                continue
+            if kind == "stop":
+                break
+            if kind == "done":
+                self._finish(job_id, result)
+
+    def _replace_dead_workers(self):
+        """Fail the job of every worker that died and start a replacement in its slot."""
+        failed = []
+        with self._lock:
+            if self._stopping:
+                return
+            for slot, process in enumerate(self._processes):
+                if process.is_alive():
+                    continue
+                print(f"Ingestion worker {process.pid} exited with code {process.exitcode}; restarting it")
+                self._start_worker(slot)
+                failed += [(job_id, self.scheduler.running_job(job_id)["path"])
+                           for job_id, worker in self._running.items() if worker == slot]
+        for job_id, file_path in failed:
+            self._finish(job_id, {"status": "failed", "file_path": file_path,
+                                  "error": "Worker process died while processing the file"})
+
+    def _finish(self, job_id, result: dict):
+        with self._done:
+            if job_id not in self._unfinished:
+                return
+            self.results[job_id] = result
+            self._unfinished.discard(job_id)
+            self._idle.append(self._running.pop(job_id))
+            job = self.scheduler.finish(job_id, result.get("duration_seconds"))
+            self.job_store.finish(job["job_id"], result)
+            batch = self._batches.get(job.get("batch_id"))
+            if batch is not None:
+                batch["done"] += 1
+                batch["failed"] += result["status"] != "success"
+                self.job_store.batch_progress(job["batch_id"], batch["done"], batch["failed"], batch["total"])
+                if batch["done"] == batch["total"]:
+                    del self._batches[job["batch_id"]]
+            self._dispatch()
+            self._done.notify_all()
+        if self.on_result:
+            self.on_result(result)
+
+
+def ingest_files(file_paths: list, workers: int = None, mode: str = "full") -> list:
+    """Batch-ingest files on a warm worker pool and return the flow results in input order."""
+    pool = WarmWorkerPool(workers=workers).start()
+    try:
+        job_ids = [pool.submit(file_path, mode) for file_path in file_paths]
+        results = pool.wait(job_ids)
+        return [results[job_id] for job_id in job_ids]
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    ingest_files(sys.argv[1:])
@@ -0,0 +1,72 @@
+import io
+import os
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.batch_upload import (
+    BatchLimitExceeded, is_batch_manifest, is_batch_member, land_batch, load_batch, stage_batch
+)
+
+CSV = b"footfall,fail\n1,0\n"
+
+
+def _zip(members: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar_gz(members: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+def test_files_and_archive_members_are_staged(tmp_path):
+    uploads = [
+        ("a.csv", io.BytesIO(CSV)),
+        ("more.zip", _zip({"day1/b.csv": CSV, "notes.txt": b"skip me", "nested/a.csv": CSV})),
+        ("old.tar.gz", _tar_gz({"c.parquet": b"PAR1", ".hidden.csv": CSV})),
+        ("readme.md", io.BytesIO(b"#")),
+    ]
+
+    staged, skipped = stage_batch(uploads, str(tmp_path / "staging"))
+
+    assert [os.path.basename(path) for path in staged] == ["a.csv", "b.csv", "c.parquet"]
+    assert open(staged[1], "rb").read() == CSV
+    assert [name for name, _ in skipped] == ["nested/a.csv", ".hidden.csv", "readme.md"]
+    assert skipped[0][1] == "Duplicate file name in batch: a.csv"
+
+
+@pytest.mark.parametrize("limits", [{"max_files": 1}, {"max_total_bytes": len(CSV) + 1}])
+def test_limits_stop_the_batch(tmp_path, limits):
+    uploads = [("a.csv", io.BytesIO(CSV)), ("b.zip", _zip({"b.csv": CSV}))]
+    with pytest.raises(BatchLimitExceeded):
+        stage_batch(uploads, str(tmp_path / "staging"), {"bulk_upload": limits})
+
+
+def test_batch_lands_with_its_manifest_last(tmp_path):
+    staging_dir = tmp_path / "staging" / "batch1"
+    staged, _ = stage_batch([("a.csv", io.BytesIO(CSV))], str(staging_dir))
+    landing = tmp_path / "landing" / "plant_a"
+
+    manifest_path = land_batch(str(staging_dir), str(landing),
+                               {"batch_id": "batch1", "files": [{"file_name": "a.csv", "job_id": "j1"}]})
+
+    assert is_batch_manifest(manifest_path) and not staging_dir.exists()
+    [entry] = load_batch(manifest_path)["files"]
+    assert entry["job_id"] == "j1" and open(entry["file_path"], "rb").read() == CSV
+    assert is_batch_member(entry["file_path"]) and not is_batch_member(str(landing / "a.csv"))
@@ -0,0 +1,165 @@
+import importlib
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.chunk_manifest import manifest_path
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.drift_detection import drift_config, load_baselines
+from src.prefect_flows.utils.report_sink import get_report_sink
+from src.prefect_flows.utils.rollups import load_rollups
+
+chunked = importlib.import_module("src.prefect_flows.flows.chunked_ingestion_flow")
+data_ingestion_flow = importlib.import_module("src.prefect_flows.flows.data_ingestion_flow").data_ingestion_flow
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+@pytest.fixture
+def landed_file(tmp_path, monkeypatch):
+    """A multi-chunk CSV in a scratch working directory (the flow uses relative data paths)."""
+    with open(SAMPLE_CSV) as f:
+        header, *rows = f.read().splitlines()
+    landing = tmp_path / "data" / "landing"
+    landing.mkdir(parents=True)
+    file_path = landing / "sensors.csv"
+    file_path.write_text("\n".join([header] + rows * 20) + "\n")
+    monkeypatch.chdir(tmp_path)
+    return os.path.join("data", "landing", "sensors.csv")
+
+
+@pytest.fixture
+def config():
+    config = load_config()
+    config["chunked_ingestion"]["chunk_bytes"] = 4096
+    return config
+
+
+def _run(file_path, config):
+    return chunked.chunked_ingestion_flow(file_path, config=config)
+
+
+def _output_path():
+    return os.path.join("data", "cleansed", "sensors_processed")
+
+
+def test_resume_after_crash_between_promotion_and_cleanup(landed_file, config, monkeypatch):
+    def crash(file_path):
+        raise RuntimeError("simulated crash")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(chunked, "remove_manifest", crash)
+        assert _run(landed_file, config)["status"] == "failed"
+    parts = sorted(os.listdir(_output_path()))
+    assert parts and os.path.exists(manifest_path(landed_file))
+
+    result = _run(landed_file, config)
+    assert result["status"] == "success"
+    assert sorted(os.listdir(result["output_path"])) == parts
+    assert not os.path.exists(manifest_path(landed_file))
+
+
+def test_resume_after_crash_while_replacing_previous_output(landed_file, config, monkeypatch):
+    assert _run(landed_file, config)["status"] == "success"
+    parts = sorted(os.listdir(_output_path()))
+
+    replace = os.replace
+
+    def crash_on_promotion(src, dst):
+        if os.path.abspath(dst) == os.path.abspath(_output_path()):
+            raise RuntimeError("simulated crash")
+        replace(src, dst)
+
+    # Old output already renamed aside, staged parts not yet moved in
+    with monkeypatch.context() as patched:
+        patched.setattr(chunked.os, "replace", crash_on_promotion)
+        assert _run(landed_file, config)["status"] == "failed"
+    assert not os.path.exists(_output_path())
+
+    result = _run(landed_file, config)
+    assert result["status"] == "success"
+    assert sorted(os.listdir(result["output_path"])) == parts
+    assert not os.path.exists(os.path.join("data", "cleansed", "_chunks", "sensors.previous"))
+    assert not os.path.exists(manifest_path(landed_file))
+
+
+def test_resume_does_not_fold_drift_into_baselines_twice(landed_file, config, monkeypatch):
+    config["drift_detection"]["enabled"] = True
+    calls = []
+    detect = chunked.detect_drift_moments
+
+    def counting_detect(moments, cfg, update=True):
+        calls.append(moments)
+        return detect(moments, cfg, update)
+
+    def crash(validation_results, file_path, config):
+        raise RuntimeError("simulated crash")
+
+    monkeypatch.setattr(chunked, "detect_drift_moments", counting_detect)
+    with monkeypatch.context() as patched:
+        patched.setattr(chunked, "save_validation_report", crash)
+        assert _run(landed_file, config)["status"] == "failed"
+
+    result = _run(landed_file, config)
+    assert result["status"] == "success"
+    assert len(calls) == 1
+    assert result["validation"]["drift"] is not None
+
+
+def test_metadata_is_recorded_once_for_the_whole_file(landed_file, config):
+    with open(landed_file) as f:
+        header, *rows = f.read().splitlines()
+    # One missing reading per chunk-sized stretch, so several chunks impute
+    rows = [",".join([""] + row.split(",")[1:]) if index % 40 == 0 else row for index, row in enumerate(rows)]
+    with open(landed_file, "w") as f:
+        f.write("\n".join([header] + rows) + "\n")
+
+    result = _run(landed_file, config)
+    assert result["status"] == "success" and result["chunks"] > 1
+
+    metadata = json.loads(get_report_sink(config).get(os.path.join("data", "raw", "metadata", "sensors_metadata.json")))
+    assert metadata["data_structure"]["row_count"] == len(rows)
+    assert metadata["data_structure"]["columns"] == header.split(",")
+    assert metadata["imputed_cells"] == result["imputed_cells"]
+    assert metadata["imputed_cells"]["footfall"] > 0
+
+
+def _rolled_up_rows():
+    return int(load_rollups()["row_count"].sum())
+
+
+def test_reingesting_with_other_chunking_or_layout_replaces_rollups(landed_file, config):
+    result = _run(landed_file, config)
+    assert _rolled_up_rows() == result["rows"]
+
+    config["chunked_ingestion"]["chunk_bytes"] = 8192
+    result = _run(landed_file, config)
+    assert result["status"] == "success"
+    assert _rolled_up_rows() == result["rows"]
+
+    # The single-file layout of the same file replaces the chunked parts' rollups
+    result = data_ingestion_flow(landed_file, config=config)
+    assert result["status"] == "success"
+    assert _rolled_up_rows() == len(pd.read_parquet(result["output_path"]))
+
+
+def test_only_files_passing_validation_update_drift_baselines(landed_file, config):
+    config["drift_detection"]["enabled"] = True
+    baseline_path = drift_config(config)["baseline_path"]
+    failing = {**config, "validation_rules": {"Temperature": {"min_value": 100, "max_value": 200}}}
+
+    result = _run(landed_file, failing)
+    assert result["status"] == "success" and not result["validation"]["success"]
+    assert result["validation"]["drift"] is not None
+    assert load_baselines(baseline_path) == {}
+    result = data_ingestion_flow(landed_file, config=failing)
+    assert result["status"] == "success"
+    assert load_baselines(baseline_path) == {}
+
+    assert _run(landed_file, config)["validation"]["success"]
+    assert load_baselines(baseline_path)["Temperature"]["files"] == 1
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.csv_reader import MIN_BLOCK_SIZE, _block_size_for, read_csv_frame
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_parallel_parse_keeps_file_order(tmp_path):
+    sample = pd.read_csv(SAMPLE_CSV)
+    big = pd.concat([sample] * 400, ignore_index=True)
+    big["footfall"] = range(len(big))
+    path = str(tmp_path / "big.csv")
+    big.to_csv(path, index=False)
+
+    # Small blocks force many blocks through the parser pool
+    config = {"csv_reader": {"engine": "pyarrow", "threads": 4, "block_size": 64 << 10}}
+    pd.testing.assert_frame_equal(read_csv_frame(path, config), pd.read_csv(path), check_dtype=False)
+
+
+def test_single_thread_and_pandas_engines_agree():
+    expected = pd.read_csv(SAMPLE_CSV)
+    for reader in ({"engine": "pyarrow", "threads": 1}, {"engine": "pandas"}):
+        pd.testing.assert_frame_equal(read_csv_frame(SAMPLE_CSV, {"csv_reader": reader}), expected,
+                                      check_dtype=False)
+
+
+def test_block_size_follows_file_size(tmp_path):
+    path = tmp_path / "big.csv"
+    path.write_bytes(b"a\n" * (32 << 20))
+    assert _block_size_for(str(path), 4) == (64 << 20) // 16
+    assert _block_size_for(SAMPLE_CSV, 4) == MIN_BLOCK_SIZE
+    assert _block_size_for(pa.BufferReader(b"a\n" * (8 << 20)), 2) == 2 << 20
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.drift_detection import (
+    column_moments, detect_drift_moments, drift_config, load_baselines, merge_moments
+)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    return drift_config({"drift_detection": {"columns": ["Temperature"], "warmup_files": 2,
+                                             "baseline_path": str(tmp_path / "baselines.json")}})
+
+
+def _readings(mean, n=200, seed=0):
+    return pd.DataFrame({"Temperature": np.random.default_rng(seed).normal(mean, 1.0, n)})
+
+
+def test_chunk_moments_merge_into_file_moments(cfg):
+    df = _readings(20)
+    df.loc[5, "Temperature"] = np.nan
+    merged = merge_moments(column_moments(df.iloc[:70], {}, cfg), column_moments(df.iloc[70:], {}, cfg))
+    whole = column_moments(df, {}, cfg)
+
+    assert merged["Temperature"]["count"] == whole["Temperature"]["count"] == 199
+    assert merged["Temperature"]["mean"] == pytest.approx(whole["Temperature"]["mean"])
+    assert merged["Temperature"]["m2"] == pytest.approx(whole["Temperature"]["m2"])
+
+
+def test_drift_is_flagged_once_the_baseline_is_warm(cfg):
+    for seed in range(2):
+        result = detect_drift_moments(column_moments(_readings(20, seed=seed), {}, cfg), cfg)
+        assert result["flags"] == []  # still warming up
+    assert load_baselines(cfg["baseline_path"])["Temperature"]["files"] == 2
+
+    baselines = load_baselines(cfg["baseline_path"])
+    shifted = _readings(21.5, seed=3)
+    shifted.loc[:9, "Temperature"] = 60.0
+    result = detect_drift_moments(column_moments(shifted, baselines, cfg), cfg, update=False)
+
+    entry = result["columns"]["Temperature"]
+    assert entry["drift"] and entry["outliers"] and 10 / 200 <= entry["outlier_rate"] < 0.1
+    assert len(result["flags"]) == 2
+    # Not folded in: the baseline still describes the readings before the shift
+    assert load_baselines(cfg["baseline_path"]) == baselines
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+from src.triggers.folder_watcher import NewFileHandler, watch_landing
+
+
+class RecordingPool:
+    """Stands in for the worker pool and records what the handler hands it."""
+
+    def __init__(self):
+        self.files = []
+        self.batches = []
+
+    def submit(self, file_path, **kwargs):
+        self.files.append(file_path)
+
+    def submit_batch(self, manifest_path):
+        self.batches.append(manifest_path)
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_files_in_site_and_batch_folders_are_picked_up(tmp_path):
+    landing = tmp_path / "landing"
+    (landing / "plant_a" / "_batches").mkdir(parents=True)
+    pool = RecordingPool()
+    observer = watch_landing(NewFileHandler(pool, load_config()), str(landing))
+    try:
+        site_file = landing / "plant_a" / "sensors.csv"
+        site_file.write_text("footfall,fail\n1,0\n")
+        manifest = landing / "plant_a" / "_batches" / "batch1.json"
+        manifest.write_text("{}")
+
+        assert _wait_for(lambda: str(site_file) in pool.files)
+        assert _wait_for(lambda: str(manifest) in pool.batches)
+    finally:
+        observer.stop()
+        observer.join()
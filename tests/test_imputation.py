@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.imputation import compute_stats, impute, imputation_plan, merge_stats
+
+
+@pytest.fixture
+def readings():
+    return pd.DataFrame({
+        "tempMode": [1, 1, 2, 2, 2, 1],
+        "Temperature": [10.0, np.nan, 30.0, np.nan, 50.0, 20.0],
+        "AQ": [1.0, 2.0, np.nan, 4.0, 9.0, np.nan],
+        "VOC": [5.0, np.nan, np.nan, 8.0, np.nan, 6.0],
+    })
+
+
+def test_strategies_per_column(readings):
+    config = {"default": "mean", "group_column": "tempMode",
+              "columns": {"Temperature": "group_mean", "AQ": "median", "VOC": "ffill"}}
+    df = readings.copy()
+
+    imputed = impute(df, compute_stats(df, config), config)
+
+    assert imputed == {"Temperature": 2, "AQ": 2, "VOC": 3}
+    assert df["Temperature"].tolist() == [10.0, 15.0, 30.0, 40.0, 50.0, 20.0]
+    assert df["AQ"].tolist() == [1.0, 2.0, 3.0, 4.0, 9.0, 3.0]
+    assert df["VOC"].tolist() == [5.0, 5.0, 5.0, 8.0, 8.0, 6.0]
+
+
+def test_chunk_stats_merge_into_whole_file_stats(readings):
+    config = {"columns": {"Temperature": "group_mean", "AQ": "median"}}
+    whole = compute_stats(readings, config)
+    merged = merge_stats(compute_stats(readings.iloc[:3], config), compute_stats(readings.iloc[3:], config))
+
+    first, second = readings.iloc[:3].copy(), readings.iloc[3:].copy()
+    impute(first, merged, config)
+    impute(second, merged, config)
+    expected = readings.copy()
+    impute(expected, whole, config)
+    pd.testing.assert_frame_equal(pd.concat([first, second]), expected)
+
+
+def test_forward_fill_continues_across_chunks(readings):
+    chunk = readings.iloc[1:3].copy()
+    impute(chunk, compute_stats(readings), {"default": "ffill"}, carry={"VOC": 7.0})
+    assert chunk["VOC"].tolist() == [7.0, 7.0]
+
+
+def test_unknown_strategy_and_none_are_handled(readings):
+    assert "VOC" not in imputation_plan(readings, {"columns": {"VOC": "none"}})
+    with pytest.raises(ValueError, match="Unknown imputation strategy"):
+        imputation_plan(readings, {"columns": {"VOC": "mode"}})
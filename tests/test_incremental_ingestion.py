@@ -0,0 +1,77 @@
+import importlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.offset_checkpoint import get_offset, load_offsets, save_offset
+
+incremental = importlib.import_module("src.prefect_flows.flows.incremental_ingestion_flow")
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_concurrent_offset_saves_keep_every_file(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoints" / "tail_offsets.json")
+
+    def save(index):
+        for offset in range(1, 21):
+            save_offset(f"/landing/file_{index}.csv", offset * 100, ["a", "b"], checkpoint_path)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(save, range(8)))
+
+    offsets = load_offsets(checkpoint_path)
+    assert sorted(offsets) == sorted(os.path.abspath(f"/landing/file_{index}.csv") for index in range(8))
+    assert all(entry["offset"] == 2000 for entry in offsets.values())
+    assert not [name for name in os.listdir(tmp_path / "checkpoints") if name.endswith(".tmp")]
+
+
+@pytest.fixture
+def growing_file(tmp_path, monkeypatch):
+    """A tailed CSV in a scratch working directory, with more rows held back to append later."""
+    with open(SAMPLE_CSV) as f:
+        header, *rows = f.read().splitlines()
+    landing = tmp_path / "data" / "landing"
+    landing.mkdir(parents=True)
+    file_path = landing / "sensors.csv"
+    file_path.write_text("\n".join([header] + rows[:30]) + "\n")
+    monkeypatch.chdir(tmp_path)
+    return os.path.join("data", "landing", "sensors.csv"), rows[30:]
+
+
+def test_resume_after_crash_does_not_duplicate_raw_bytes_or_drift(growing_file, monkeypatch):
+    file_path, more_rows = growing_file
+    config = load_config()
+    config["drift_detection"]["enabled"] = True
+    assert incremental.incremental_ingestion_flow(file_path, config=config)["status"] == "success"
+    with open(file_path, "a") as f:
+        f.write("\n".join(more_rows) + "\n")
+
+    calls = []
+    detect = incremental.detect_drift
+
+    def counting_detect(df, cfg, update=True):
+        calls.append(len(df))
+        return detect(df, cfg, update)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("simulated crash")
+
+    monkeypatch.setattr(incremental, "detect_drift", counting_detect)
+    # Crash once the raw copy and the baselines have the new range, before the offset moves
+    with monkeypatch.context() as patched:
+        patched.setattr(incremental, "write_part", crash)
+        assert incremental.incremental_ingestion_flow(file_path, config=config)["status"] == "failed"
+
+    result = incremental.incremental_ingestion_flow(file_path, config=config)
+    assert result["status"] == "success" and result["rows"] == len(more_rows)
+    assert calls == [len(more_rows)]
+    with open(file_path, "rb") as source, open(os.path.join("data", "raw", "sensors.csv"), "rb") as raw:
+        assert raw.read() == source.read()
+    checkpoint = get_offset(file_path)
+    assert checkpoint["offset"] == os.path.getsize(file_path) and "pending" not in checkpoint
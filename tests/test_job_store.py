@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.job_store import JobStore, set_job_stage
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs" / "jobs.db"))
+
+
+def test_job_lifecycle_is_recorded_as_events(store, tmp_path):
+    file_path = str(tmp_path / "landing" / "sensors.csv")
+    job_id = store.create(file_path, site="plant_a", priority="high")
+
+    # The watcher reuses the job the upload created instead of opening a new one
+    assert store.enqueue(file_path, mode="full") == job_id
+    store.update(job_id, "running", stage="cleanse_data")
+    store.finish(job_id, {"status": "success", "output_path": "data/cleansed/sensors_processed.parquet",
+                          "validation": {"success": True}})
+
+    job = store.get(job_id)
+    assert job["status"] == "succeeded" and job["stage"] is None
+    assert job["site"] == "plant_a" and job["priority"] == "high" and job["mode"] == "full"
+    assert job["validation_status"] == "PASS" and job["output_path"].endswith("sensors_processed.parquet")
+    events = store.events_since(0, job_id)
+    assert [(event["status"], event["stage"]) for event in events] == [
+        ("landed", None), ("queued", None), ("running", "cleanse_data"), ("succeeded", None)]
+    assert store.events_since(events[1]["seq"], job_id)[0]["status"] == "running"
+    assert store.last_seq() == events[-1]["seq"]
+
+
+def test_failed_runs_and_filters(store):
+    first = store.create("a.csv", site="plant_a")
+    second = store.enqueue("b.csv", site="plant_b")
+    store.finish(first, {"status": "error", "error": "boom"})
+
+    assert store.get(first)["status"] == "failed" and store.get(first)["error"] == "boom"
+    assert [job["id"] for job in store.list(status="queued")] == [second]
+    assert [job["id"] for job in store.list(site="plant_a")] == [first]
+    with pytest.raises(ValueError, match="Unknown job status"):
+        store.update(first, "paused")
+
+
+def test_untracked_runs_do_not_touch_the_store(store, tmp_path):
+    config = {"job_store": {"db_path": store.db_path}}
+    set_job_stage(None, "probe", config)
+    assert store.last_seq() == 0
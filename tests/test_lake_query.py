@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.parquet_dataset import write_table
+from src.query.lake_query import aggregate, count, iter_frames, to_expression
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+@pytest.fixture
+def lake(tmp_path):
+    """Two cleansed files, one of them in a site sub-folder."""
+    sample = pd.read_csv(SAMPLE_CSV)
+    lake_dir = tmp_path / "cleansed"
+    write_table(sample.iloc[:30], str(lake_dir / "a_processed.parquet"))
+    write_table(sample.iloc[30:], str(lake_dir / "plant_a" / "b_processed.parquet"))
+    return str(lake_dir), sample
+
+
+def test_filters_and_projection_are_pushed_down(lake):
+    path, sample = lake
+    filters = [("fail", "==", 1), ("Temperature", ">", 10)]
+    expected = sample[(sample["fail"] == 1) & (sample["Temperature"] > 10)]
+
+    assert count(path=path) == len(sample)
+    assert count(filters, path=path) == len(expected)
+    frames = list(iter_frames(filters, columns=["footfall", "Temperature"], path=path))
+    result = pd.concat(frames, ignore_index=True)
+    assert list(result.columns) == ["footfall", "Temperature"]
+    assert sorted(result["footfall"]) == sorted(expected["footfall"])
+
+
+def test_filters_in_dnf_are_or_ed(lake):
+    path, sample = lake
+    filters = [[("tempMode", "==", 0)], [("fail", "==", 1)]]
+    assert count(to_expression(filters), path=path) == int(((sample["tempMode"] == 0) | (sample["fail"] == 1)).sum())
+
+
+def test_aggregate_matches_pandas(lake):
+    path, sample = lake
+    result = aggregate("tempMode", ["Temperature", "AQ"], path=path)
+
+    expected = sample.groupby("tempMode").agg(row_count=("AQ", "size"), Temperature_mean=("Temperature", "mean"),
+                                              AQ_mean=("AQ", "mean")).reset_index()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ["prefect", "pandas", "pyarrow", "great_expectations"]
+
+
+def _loaded_after(code: str, cwd) -> list:
+    """Heavy modules loaded by ``code`` in a fresh interpreter (run in ``cwd``, as it may create data dirs)."""
+    probe = f"import sys\n{code}\nprint(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", probe], cwd=cwd, env={**os.environ, "PYTHONPATH": PROJECT_ROOT},
+                               capture_output=True, text=True, check=True)
+    return [name for name in completed.stdout.strip().rpartition("\n")[2].split(",") if name]
+
+
+@pytest.mark.parametrize("module", ["src.prefect_flows", "src.triggers.folder_watcher",
+                                    "src.local_web_app.upload_app", "run_pipeline"])
+def test_entry_points_defer_heavy_imports(module, tmp_path):
+    assert _loaded_after(f"import {module}", tmp_path) == []
+
+
+def test_flows_load_on_first_use(tmp_path):
+    loaded = _loaded_after("import src.prefect_flows as flows\n"
+                           "assert callable(flows.data_ingestion_flow)\n"
+                           "assert 'data_ingestion_flow' in dir(flows)", tmp_path)
+    assert "prefect" in loaded and "pandas" in loaded
@@ -0,0 +1,48 @@
+import hashlib
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.mapped_file import MappedFile
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_line_ranges_parse_back_to_the_whole_file():
+    expected = pd.read_csv(SAMPLE_CSV)
+    with MappedFile(SAMPLE_CSV) as mapped:
+        columns = mapped.header()
+        ranges = mapped.line_ranges(chunk_bytes=200)
+        chunks = [mapped.read_csv_range(start, end, columns) for start, end in ranges]
+
+        assert len(ranges) > 1 and ranges[0][0] == mapped.header_end() and ranges[-1][1] == mapped.size
+        assert all(mapped.view(end - 1, end).tobytes() == b"\n" for _, end in ranges)
+        assert mapped.sha256() == hashlib.sha256(open(SAMPLE_CSV, "rb").read()).hexdigest()
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected, check_dtype=False)
+
+
+def test_empty_file_has_no_rows(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"")
+    with MappedFile(str(path)) as mapped:
+        assert mapped.header() == [] and mapped.count_rows() == 0 and mapped.line_ranges(100) == []
+
+
+def test_columnar_files_read_like_the_csv(tmp_path):
+    expected = pd.read_csv(SAMPLE_CSV)
+    indexed = expected.set_index(pd.Index(range(100, 100 + len(expected)), name="reading"))
+    parquet_path, arrow_path = str(tmp_path / "sensors.parquet"), str(tmp_path / "sensors.arrow")
+    indexed.to_parquet(parquet_path)
+    table = pa.Table.from_pandas(expected)
+    feather.write_feather(table.set_column(1, "tempMode", table.column("tempMode").dictionary_encode()), arrow_path)
+
+    for path in (parquet_path, arrow_path):
+        with MappedFile(path) as mapped:
+            assert mapped.header() == list(expected.columns)
+            assert mapped.count_rows() == len(expected)
+            pd.testing.assert_frame_equal(mapped.read_frame(), expected)
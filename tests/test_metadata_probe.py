@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.metadata_probe import find_rejection_reason, probe_file
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_probe_reads_header_and_row_count():
+    probe = probe_file(SAMPLE_CSV, with_hash=True)
+
+    expected = pd.read_csv(SAMPLE_CSV)
+    assert probe["columns"] == list(expected.columns) and probe["row_count"] == len(expected)
+    assert probe["file_format"] == "csv" and probe["file_size_bytes"] == os.path.getsize(SAMPLE_CSV)
+    assert len(probe["sha256"]) == 64
+    assert find_rejection_reason(probe) is None
+
+
+def test_last_row_without_newline_is_counted(tmp_path):
+    path = tmp_path / "sensors.csv"
+    path.write_text("\ufeff footfall ,fail\r\n1,0\r\n2,1")
+
+    probe = probe_file(str(path))
+    assert probe["columns"] == ["footfall", "fail"] and probe["row_count"] == 2
+    assert "sha256" not in probe
+
+
+def test_unusable_files_are_rejected(tmp_path):
+    with open(SAMPLE_CSV) as f:
+        header = f.readline()
+    header_only = tmp_path / "header_only.csv"
+    header_only.write_text(header)
+    wrong_columns = tmp_path / "wrong.csv"
+    wrong_columns.write_text("footfall,fail\n1,0\n")
+
+    assert find_rejection_reason(probe_file(str(header_only))) == "File contains no data rows"
+    assert find_rejection_reason(probe_file(str(wrong_columns))).startswith("Missing required columns")
@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+from src.triggers.micro_batch import MicroBatcher
+
+COLUMNS = ["footfall", "tempMode", "AQ", "USS", "CS", "VOC", "RP", "IP", "Temperature", "fail"]
+
+
+def _record(temperature=21.5):
+    return dict(zip(COLUMNS, [162, 4, 3, 7, 1, 1, 8, 1, temperature, 0]))
+
+
+@pytest.fixture
+def batcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return MicroBatcher(batch_size=100, output_dir=str(tmp_path / "stream"), config=load_config(),
+                        quarantine_dir=str(tmp_path / "quarantine"))
+
+
+def test_valid_batch_is_committed(batcher):
+    batcher.submit([_record(), _record(30.0)])
+    output_path = batcher.flush()
+
+    metrics = batcher.metrics()
+    assert os.path.exists(output_path)
+    assert metrics["records_committed"] == 2 and metrics["records_rejected"] == 0
+    assert metrics["latency_seconds"]["max"] is not None
+
+
+def test_rejected_batch_is_quarantined_and_can_be_replayed(batcher):
+    records = [_record(), _record(temperature=500.0), _record(temperature="n/a")]
+    batcher.submit(records)
+    assert batcher.flush() is None
+
+    metrics = batcher.metrics()
+    assert metrics["records_rejected"] == 3 and metrics["last_error"]
+    quarantine_path = metrics["last_quarantine_path"]
+    with open(quarantine_path) as f:
+        quarantined = json.load(f)
+    assert quarantined["records"] == records and quarantined["reason"] == metrics["last_error"]
+
+    assert batcher.replay(quarantine_path) == 3
+    assert not os.path.exists(quarantine_path)
+    assert batcher.metrics()["buffered_records"] == 3
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.tasks.Validate import VALIDATION_RULES
+from src.prefect_flows.utils.parallel_validation import plan_shards, validate_columns
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+@pytest.fixture
+def readings():
+    df = pd.concat([pd.read_csv(SAMPLE_CSV)] * 4, ignore_index=True)
+    df.loc[7, "Temperature"] = 500
+    df.loc[123, "AQ"] = -1
+    df.loc[[5, 150], "fail"] = 2
+    df.loc[60, "VOC"] = np.nan
+    return df
+
+
+def test_plan_shards_covers_every_row():
+    assert plan_shards(10, ["a", "b"], 4) == [("a", 0, 4), ("a", 4, 8), ("a", 8, 10),
+                                              ("b", 0, 4), ("b", 4, 8), ("b", 8, 10)]
+    assert plan_shards(0, ["a"], 4) == [("a", 0, 0)]
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_sharded_validation_matches_serial(readings, backend):
+    serial = validate_columns(readings, VALIDATION_RULES, {"backend": "serial"})
+    sharded = validate_columns(readings, VALIDATION_RULES, {"backend": backend, "max_workers": 2,
+                                                            "parallel_threshold_rows": 0, "rows_per_shard": 37})
+
+    assert sharded[0] == serial[0]
+    assert sharded[1] == serial[1] and sharded[2] == serial[2]
+    np.testing.assert_array_equal(sharded[3], serial[3])
+    assert sorted(np.flatnonzero(~serial[3])) == [5, 7, 123, 150]
+    assert serial[0]["VOC"]["null_count"] == 1
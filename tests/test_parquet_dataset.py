@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.parquet_dataset import dataset_schema, write_part, write_table
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_sorted_row_groups_carry_statistics_and_page_index(tmp_path):
+    parquet_config = {**load_config()["parquet"], "row_group_size": 10}
+    path = write_table(pd.read_csv(SAMPLE_CSV), str(tmp_path / "sensors.parquet"), parquet_config)
+
+    metadata = pq.ParquetFile(path).metadata
+    fail = metadata.schema.to_arrow_schema().get_field_index("fail")
+    assert metadata.num_row_groups == 5
+    ranges = []
+    for i in range(metadata.num_row_groups):
+        column = metadata.row_group(i).column(fail)
+        assert column.has_column_index and column.statistics.has_min_max
+        ranges.append((column.statistics.min, column.statistics.max))
+    # Sorted by fail, so at most one row group holds both 0 and 1
+    assert ranges == sorted(ranges) and sum(low != high for low, high in ranges) <= 1
+
+
+def test_parts_are_cast_to_the_dataset_schema(tmp_path):
+    sample = pd.read_csv(SAMPLE_CSV)
+    dataset_dir = str(tmp_path / "stream")
+    write_part(sample.iloc[:10], dataset_dir, "part-0.parquet")
+    later = sample.iloc[10:20].astype({"footfall": "float64"})
+
+    write_part(later, dataset_dir, "part-1.parquet")
+
+    assert sorted(os.listdir(dataset_dir)) == ["part-0.parquet", "part-1.parquet"]
+    assert pq.read_schema(os.path.join(dataset_dir, "part-1.parquet")).equals(dataset_schema(dataset_dir))
@@ -0,0 +1,55 @@
+import os
+import sys
+import types
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.report_renderer import render_html_report, submit_html_report
+
+SENSOR_REPORT = {"validation_report": {
+    "file_validated": "<sensors>.csv",
+    "overall_status": "FAIL",
+    "summary": {"valid_rows": 48, "total_rows": 50},
+    "errors": ["Column 'AQ' has values below minimum 0: min=-1"],
+    "warnings": [],
+    "column_statistics": {"AQ": {"null_count": 0, "invalid_count": 2, "min_value": -1, "max_value": 7},
+                          "VOC": {"null_count": 1, "invalid_count": 0, "min_value": 0, "max_value": 9}}
+}}
+
+
+def test_report_is_streamed_row_by_row():
+    chunks = render_html_report(SENSOR_REPORT)
+    assert isinstance(chunks, types.GeneratorType)
+
+    chunks = list(chunks)
+    document = "".join(chunks)
+    assert document.startswith("<!DOCTYPE html>") and document.rstrip().endswith("</html>")
+    assert sum("<tr><td>" in chunk for chunk in chunks) == 2
+    # Values from the data are escaped
+    assert "&lt;sensors&gt;.csv" in document and "<sensors>" not in document
+    assert "Column &#x27;AQ&#x27; has values below minimum 0" in document
+
+
+def test_expectation_report_renders_each_result():
+    report = {
+        "summary": {"success": False, "successful_expectations": 1, "total_expectations": 2,
+                    "data_quality_score": 75.0},
+        "validation_results": {"results": [
+            {"success": True, "expectation_config": {"expectation_type": "expect_column_to_exist",
+                                                     "kwargs": {"column": "AQ"}}, "result": {}},
+            {"success": False, "expectation_config": {"expectation_type": "expect_column_values_to_be_between",
+                                                      "kwargs": {"column": "Temperature"}},
+             "result": {"unexpected_count": 3}},
+        ]}
+    }
+
+    document = "".join(render_html_report(report))
+    assert "Successful Expectations: 1 / 2" in document
+    assert "<td>expect_column_values_to_be_between</td><td>Temperature</td>" in document
+    assert "<td>3</td>" in document
+
+
+def test_prerendered_report_is_written_in_the_background(tmp_path):
+    report_path = submit_html_report(SENSOR_REPORT, str(tmp_path / "html")).result(timeout=30)
+    with open(report_path) as f:
+        assert "Valid Rows: 48 / 50" in f.read()
@@ -0,0 +1,64 @@
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.tasks.Validate import save_validation_report
+from src.prefect_flows.utils.report_renderer import load_report, store_report
+from src.prefect_flows.utils.report_sink import FileSink, ReportSink, get_report_sink
+
+
+def _sqlite_config(tmp_path, **settings):
+    return {"report_sink": {"backend": "sqlite", "db_path": str(tmp_path / "sink" / "documents.db"), **settings}}
+
+
+def _stored_names(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return [name for (name,) in conn.execute("SELECT name FROM documents")]
+
+
+def test_reports_go_to_the_callers_sink(tmp_path):
+    config = _sqlite_config(tmp_path, durability="commit")
+    reports_dir = str(tmp_path / "reports")
+
+    report_id = store_report({"summary": {"success": True}}, "report_1", reports_dir, config=config)
+
+    assert _stored_names(config["report_sink"]["db_path"]) == ["report_1.json"]
+    assert load_report(report_id, reports_dir, config=config) == {"summary": {"success": True}}
+    assert load_report(report_id, reports_dir, config=_sqlite_config(tmp_path / "other")) is None
+
+
+def test_validation_report_uses_the_flows_sink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = _sqlite_config(tmp_path, durability="commit")
+
+    location = save_validation_report.fn({"success": True, "summary": {"total_rows": 1}}, "sensors.csv", config)
+
+    assert location.startswith(os.path.join("sink", "documents.db#"))
+    [name] = _stored_names(config["report_sink"]["db_path"])
+    assert name.startswith("validation_sensors_")
+
+
+def test_batched_sink_commits_on_flush(tmp_path):
+    sink = ReportSink(str(tmp_path / "documents.db"), "batched", flush_interval_seconds=3600)
+    path = str(tmp_path / "reports" / "a.json")
+
+    sink.put(path, {"rows": 1})
+    # Visible in this process at once, committed only by the flush
+    assert json.loads(sink.get(path)) == {"rows": 1}
+    assert _stored_names(sink.db_path) == []
+    sink.flush()
+    assert _stored_names(sink.db_path) == ["a.json"]
+
+
+def test_file_sink_writes_through_the_configured_zone(tmp_path):
+    config = {"report_sink": {"backend": "files"}}
+    sink = get_report_sink(config)
+    assert isinstance(sink, FileSink) and sink.config is config
+
+    path = str(tmp_path / "reports" / "b.json")
+    sink.put(path, {"rows": 2})
+    assert json.loads(open(path).read()) == {"rows": 2}
+    assert [entry[0] for entry in sink.list(str(tmp_path / "reports"), ".json")] == [path]
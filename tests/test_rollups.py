@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.rollups import compute_rollup, merge_rollup, recompute_rollups, summarize_rollups
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+@pytest.fixture
+def sample():
+    return pd.read_csv(SAMPLE_CSV)
+
+
+def _expected_summary(df):
+    return df.groupby("tempMode").agg(row_count=("fail", "size"), fail_rate=("fail", "mean"),
+                                      Temperature_mean=("Temperature", "mean")).reset_index()
+
+
+def test_partial_rollups_summarize_like_the_data(tmp_path, sample):
+    rollup_path = str(tmp_path / "rollups.parquet")
+    merge_rollup(compute_rollup(sample.iloc[:20], "a.parquet"), rollup_path)
+    merge_rollup(compute_rollup(sample.iloc[20:], "b.parquet"), rollup_path)
+
+    summary = summarize_rollups(rollup_path=rollup_path)
+    pd.testing.assert_frame_equal(summary[["tempMode", "row_count", "fail_rate", "Temperature_mean"]],
+                                  _expected_summary(sample), check_dtype=False)
+
+
+def test_reingested_source_is_replaced_not_double_counted(tmp_path, sample):
+    rollup_path = str(tmp_path / "rollups.parquet")
+    merge_rollup(compute_rollup(sample, "a.parquet"), rollup_path)
+    rollups = merge_rollup(compute_rollup(sample, "a.parquet"), rollup_path)
+
+    assert rollups["row_count"].sum() == len(sample)
+
+
+def test_recompute_from_the_lake(tmp_path, sample):
+    lake = tmp_path / "cleansed"
+    (lake / "plant_a").mkdir(parents=True)
+    sample.iloc[:25].to_parquet(lake / "a.parquet", index=False)
+    sample.iloc[25:].to_parquet(lake / "plant_a" / "b.parquet", index=False)
+    rollup_path = str(tmp_path / "rollups.parquet")
+
+    rollups = recompute_rollups(str(lake), rollup_path)
+
+    assert set(rollups["source"]) == {str(lake / "a.parquet"), str(lake / "plant_a" / "b.parquet")}
+    summary = summarize_rollups(rollup_path=rollup_path)
+    pd.testing.assert_frame_equal(summary[["tempMode", "row_count", "fail_rate", "Temperature_mean"]],
+                                  _expected_summary(sample), check_dtype=False)
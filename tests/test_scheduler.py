@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.job_store import get_job_store
+from src.prefect_flows.utils.sites import site_concurrency
+from src.triggers.folder_watcher import enqueue_inline
+from src.triggers.scheduler import JobScheduler, estimate_start, save_priority_hint, take_priority_hint
+
+SMALL = 1024
+
+
+def _scheduler(config, workers=4):
+    return JobScheduler(lambda site: site_concurrency(config, site), workers, config)
+
+
+def _push(scheduler, job_id, site, size_bytes=SMALL, **fields):
+    scheduler.push({"id": job_id, "site": site, "file_path": f"/landing/{site}/{job_id}.csv",
+                    "size_bytes": size_bytes, **fields})
+
+
+def _fill_workers(scheduler):
+    """Pop a job for every free worker, as the pool does."""
+    started = []
+    while len(scheduler._running) < scheduler.workers and (job := scheduler.pop()) is not None:
+        started.append(job)
+    return started
+
+
+def test_single_site_uses_every_worker():
+    scheduler = _scheduler({}, workers=4)
+    for job_id in range(6):
+        _push(scheduler, job_id, "default")
+
+    assert len(_fill_workers(scheduler)) == 4
+    assert scheduler.running() == {"default": 4}
+
+
+def test_busy_site_is_held_to_half_while_another_site_waits():
+    scheduler = _scheduler({}, workers=4)
+    for job_id in range(6):
+        _push(scheduler, job_id, "plant_a")
+    _push(scheduler, 6, "plant_b")
+    _push(scheduler, 7, "plant_b")
+
+    _fill_workers(scheduler)
+    assert scheduler.running() == {"plant_a": 2, "plant_b": 2}
+
+
+def test_configured_site_limit_is_a_hard_cap():
+    config = {"sites": {"overrides": {"plant_a": {"max_concurrent": 1}}}}
+    scheduler = _scheduler(config, workers=4)
+    for job_id in range(3):
+        _push(scheduler, job_id, "plant_a")
+
+    assert len(_fill_workers(scheduler)) == 1
+    assert scheduler.running() == {"plant_a": 1}
+
+
+def test_estimate_start_ages_queued_jobs_like_pop():
+    scheduler = _scheduler({}, workers=1)
+    throughput = scheduler.throughput
+    # A large file queued long ago has aged ahead of a fresh small one
+    _push(scheduler, 0, "default", size_bytes=int(throughput * 5), queued_at=time.time() - 60)
+    _push(scheduler, 1, "default", size_bytes=int(throughput * 2))
+    status = scheduler.snapshot()
+
+    estimate = estimate_start(status, int(throughput * 1))
+    assert estimate["position"] == 2
+    assert scheduler.pop()["id"] == 0
+
+
+def test_inline_watcher_consumes_priority_hint(tmp_path):
+    config = {"scheduler": {"priority_hints_path": str(tmp_path / "priorities.json")},
+              "job_store": {"db_path": str(tmp_path / "jobs.db")}}
+    file_path = str(tmp_path / "sensors.csv")
+    save_priority_hint(file_path, "high", config["scheduler"]["priority_hints_path"])
+
+    job_id = enqueue_inline(file_path, "full", config)
+
+    assert get_job_store(config).get(job_id)["priority"] == "high"
+    assert take_priority_hint(file_path, config["scheduler"]["priority_hints_path"]) is None
+
+
+def test_small_files_and_high_priority_go_first():
+    scheduler = _scheduler({}, workers=2)
+    _push(scheduler, "backfill", "default", size_bytes=5 * 1024 ** 3)
+    _push(scheduler, "small", "default")
+    _push(scheduler, "urgent", "default", size_bytes=1024 ** 3, priority="high")
+
+    assert scheduler.pop()["id"] == "urgent"
+    assert scheduler.pop()["id"] == "small"
+
+
+def test_fast_lane_worker_never_takes_a_large_file():
+    scheduler = _scheduler({}, workers=2)
+    _push(scheduler, "big1", "default", size_bytes=5 * 1024 ** 3)
+    _push(scheduler, "big2", "default", size_bytes=6 * 1024 ** 3)
+
+    assert [job["id"] for job in _fill_workers(scheduler)] == ["big1"]
+    _push(scheduler, "small", "default")
+    assert scheduler.pop()["id"] == "small"
+    scheduler.finish("big1", duration_seconds=10)
+    assert scheduler.pop()["id"] == "big2"
+
+
+def test_jobs_for_the_same_file_run_in_order():
+    scheduler = _scheduler({}, workers=2)
+    for job_id in ("first", "second"):
+        scheduler.push({"id": job_id, "site": "default", "file_path": "/landing/growing.csv", "size_bytes": SMALL})
+
+    assert [job["id"] for job in _fill_workers(scheduler)] == ["first"]
+    scheduler.finish("first")
+    assert scheduler.pop()["id"] == "second"
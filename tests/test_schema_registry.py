@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.tasks.cleanse_data import cleanse_frame
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.schema_registry import get_schema_registry
+
+CLEANSED = os.path.join(os.path.dirname(__file__), '..', 'data', 'cleansed', 'data1_processed.parquet')
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_temp_mode_keeps_the_existing_files_type():
+    config = load_config()
+    df = cleanse_frame(pd.read_csv(SAMPLE_CSV), config["imputation"], schema_registry=config["schema_registry"])
+
+    written = pa.Schema.from_pandas(df, preserve_index=False)
+    existing = pq.read_schema(CLEANSED)
+    assert written.field("tempMode").type == existing.field("tempMode").type == pa.int64()
+
+
+def test_imputed_integer_column_is_rounded():
+    config = load_config()
+    df = pd.read_csv(SAMPLE_CSV).head(3)
+    df["tempMode"] = [1, np.nan, 2]
+    df.loc[0, "Temperature"] = np.nan
+
+    cleansed = cleanse_frame(df, config["imputation"], schema_registry=config["schema_registry"])
+
+    assert str(cleansed["tempMode"].dtype) == "int64"
+    assert cleansed["tempMode"].tolist() == [1, 2, 2]
+    assert cleansed.attrs["imputed_cells"] == {"tempMode": 1, "Temperature": 1}
+
+
+def test_renamed_and_added_columns_are_conformed():
+    registry = get_schema_registry({
+        "columns": {"tempMode": "int64", "Temperature": "float64", "Humidity": "float64"},
+        "versions": [{"version": 1, "columns": ["tempMode", "Temperature"], "aliases": {}},
+                     {"version": 2, "columns": ["tempMode", "Temperature", "Humidity"],
+                      "aliases": {"temp_c": "Temperature"}}]
+    })
+    v1 = pd.DataFrame({" TEMPMODE": [3], "Temperature": [20], "serial": ["a"]})
+    v2 = pd.DataFrame({"tempMode": [4], "temp_c": [21.5], "Humidity": [40.0]})
+
+    resolution = registry.resolve(v1.columns)
+    assert resolution["version"] == 1 and resolution["unknown"] == ["serial"]
+    conformed = registry.conform(registry.map_columns(v1, resolution), resolution)
+    assert list(conformed.columns) == ["tempMode", "Temperature", "Humidity"]
+    assert conformed["Humidity"].isna().all() and str(conformed["Temperature"].dtype) == "float64"
+
+    resolution = registry.resolve(v2.columns)
+    assert resolution["version"] == 2
+    assert registry.conform(registry.map_columns(v2, resolution), resolution)["Temperature"].tolist() == [21.5]
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils import storage
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Local raw zone and a cleansed zone (with a nested archive zone) mapped to a bucket."""
+    return {"storage": {"zones": {
+        "raw": {"root": str(tmp_path / "raw")},
+        "cleansed": {"root": str(tmp_path / "cleansed"), "uri": "s3://lake/cleansed/"},
+        "archive": {"root": str(tmp_path / "cleansed" / "archive"), "uri": "s3://cold/archive"},
+    }}}
+
+
+def test_paths_resolve_to_their_zone(tmp_path, config):
+    part = str(tmp_path / "cleansed" / "plant_a" / "sensors.parquet")
+    archived = str(tmp_path / "cleansed" / "archive" / "old.parquet")
+    raw = str(tmp_path / "raw" / "sensors.csv")
+
+    assert storage.location(part, config) == "s3://lake/cleansed/plant_a/sensors.parquet"
+    assert storage.location(archived, config) == "s3://cold/archive/old.parquet"
+    assert storage.zone_for(archived, config).name == "archive"
+    assert storage.is_local(raw, config) and not storage.is_local(part, config)
+    assert storage.location(raw, config) == raw
+    # Only the root itself or paths below it belong to a zone
+    assert storage.zone_for(str(tmp_path / "cleansed_old" / "x.parquet"), config) is None
+    with pytest.raises(ValueError, match="object store"):
+        storage.require_local(raw, part, config=config)
+
+
+def test_unsupported_uri_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported storage URI"):
+        storage.zones({"storage": {"zones": {"raw": {"root": str(tmp_path), "uri": "gs://bucket"}}}})
+
+
+def test_local_zone_io(tmp_path, config):
+    path = str(tmp_path / "raw" / "plant_a" / "sensors.csv")
+    storage.write_bytes(path, b"footfall\n1\n", config)
+    copy = str(tmp_path / "raw" / "plant_a" / "copy.csv")
+    storage.put_file(path, copy, config)
+
+    assert storage.exists(copy, config) and storage.read_bytes(copy, config) == b"footfall\n1\n"
+    assert sorted(os.path.basename(name) for name, _ in storage.list_files(os.path.dirname(path), ".csv", config)) \
+        == ["copy.csv", "sensors.csv"]
+    assert storage.list_files(str(tmp_path / "missing"), config=config) == []
+    with storage.open_input_file(copy, config) as f:
+        assert f.read(8) == b"footfall"
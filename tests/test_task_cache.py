@@ -0,0 +1,51 @@
+import importlib
+import os
+import shutil
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+from src.prefect_flows.utils.task_cache import TaskCache
+
+data_ingestion_flow = importlib.import_module("src.prefect_flows.flows.data_ingestion_flow").data_ingestion_flow
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def _age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_stale_and_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TaskCache(str(tmp_path / "cache"), max_bytes=10 ** 6, max_age_seconds=3600)
+    for name in ("old", "recent", "new"):
+        cache.put_json(name, {"payload": "x" * 100})
+    _age(cache._path("old", ".json"), 7200)
+    _age(cache._path("recent", ".json"), 60)
+
+    cache.put_json("another", {})
+    assert cache.get_json("old") is None
+    assert cache.get_json("recent") is not None
+
+    cache.max_bytes = os.path.getsize(cache._path("new", ".json")) * 2
+    _age(cache._path("recent", ".json"), 60)
+    cache.evict()
+    assert sorted(os.listdir(cache.cache_dir)) == ["another.json", "new.json"]
+
+
+def test_cache_is_off_unless_enabled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("data", "landing"))
+    file_path = os.path.join("data", "landing", "sensors.csv")
+    shutil.copy(SAMPLE_CSV, file_path)
+    config = load_config()
+
+    assert data_ingestion_flow(file_path, config=config)["status"] == "success"
+    assert not os.path.exists(config["task_cache"]["cache_dir"])
+
+    config["task_cache"]["enabled"] = True
+    assert data_ingestion_flow(file_path, config=config)["status"] == "success"
+    assert os.listdir(config["task_cache"]["cache_dir"])
@@ -0,0 +1,96 @@
+import importlib
+import inspect
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.batch_upload import load_batch
+from src.prefect_flows.utils.report_renderer import store_report
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+@pytest.fixture
+def upload_app(tmp_path, monkeypatch):
+    """The upload app working in a scratch directory (it uses relative data paths)."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("data", "staging"))
+    module = importlib.import_module("src.local_web_app.upload_app")
+    monkeypatch.setattr(module, "config", {**module.config, "report_sink": {"backend": "files"}})
+    monkeypatch.setattr(module, "job_store", module.get_job_store({"job_store": {"db_path": str(tmp_path / "jobs.db")}}))
+    return module
+
+
+def test_blocking_handlers_run_off_the_event_loop(upload_app):
+    for handler in (upload_app.upload_file, upload_app.show_report, upload_app.list_reports):
+        assert not inspect.iscoroutinefunction(handler)
+
+
+def test_upload_lands_in_the_site_folder(upload_app):
+    with open(SAMPLE_CSV, "rb") as f:
+        response = TestClient(upload_app.app).post("/upload", files={"file": ("sensors.csv", f, "text/csv")},
+                                                   data={"site": "plant_a", "priority": "high"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["saved_location"] == os.path.join(upload_app.LANDING_DIR, "plant_a", "sensors.csv")
+    assert os.path.exists(body["saved_location"])
+    job = upload_app.job_store.get(body["job_id"])
+    assert job["site"] == "plant_a" and job["priority"] == "high" and job["status"] == "landed"
+
+
+def test_stored_report_is_rendered(upload_app):
+    report_id = store_report({"validation_report": {"file_validated": "sensors.csv", "overall_status": "PASS",
+                                                    "summary": {"valid_rows": 1, "total_rows": 1}}},
+                             "validation_sensors", config=upload_app.config)
+    client = TestClient(upload_app.app)
+
+    response = client.get(f"/reports/{report_id}")
+    assert response.status_code == 200 and "sensors.csv" in response.text
+    assert client.get("/reports").json() == {"reports": [report_id]}
+    assert client.get("/reports/missing").status_code == 404
+
+
+def test_job_events_stream_ends_with_the_finished_job(upload_app):
+    store = upload_app.job_store
+    job_id = store.create("sensors.csv")
+    store.update(job_id, "running", stage="validate")
+    store.finish(job_id, {"status": "success", "validation": {"success": False}})
+
+    with TestClient(upload_app.app).stream("GET", "/jobs/events", params={"job_id": job_id}) as response:
+        body = "".join(response.iter_text())
+
+    events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+    assert [event["status"] for event in events] == ["landed", "running", "succeeded"]
+    assert events[-1]["job"]["validation_status"] == "FAIL"
+    assert body.splitlines()[0] == f"id: {events[0]['seq']}"
+
+
+def test_batch_upload_lands_accepted_files_together(upload_app):
+    with open(SAMPLE_CSV, "rb") as f:
+        good = f.read()
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("day1.csv", good)
+        zf.writestr("broken.csv", "footfall,fail\n1,0\n")
+
+    response = TestClient(upload_app.app).post(
+        "/upload/batch", data={"site": "plant_a"},
+        files=[("files", ("day2.csv", good, "text/csv")), ("files", ("days.zip", archive.getvalue(), "application/zip"))])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [entry["file_name"] for entry in body["files"]] == ["day2.csv", "day1.csv"]
+    assert [rejected["file"] for rejected in body["rejected"]] == ["broken.csv"]
+    manifest = load_batch(os.path.join(upload_app.LANDING_DIR, "plant_a", "_batches", f"{body['batch_id']}.json"))
+    assert all(os.path.exists(entry["file_path"]) for entry in manifest["files"])
+    assert upload_app.job_store.get(body["batch_id"])["mode"] == "batch"
+    assert len(upload_app.job_store.list(batch_id=body["batch_id"])) == 2
+    assert os.listdir(upload_app.STAGING_DIR) == []
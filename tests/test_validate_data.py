@@ -0,0 +1,51 @@
+import importlib
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+
+validate_data = importlib.import_module("src.prefect_flows.tasks.validate_data")
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_complete_is_downgraded_above_the_row_limit():
+    result_config = {"result_format": "COMPLETE", "complete_row_limit": 100, "max_unexpected_examples": 5}
+
+    assert validate_data.resolve_result_format(100, result_config)["result_format"] == "COMPLETE"
+    assert validate_data.resolve_result_format(101, result_config) == {"result_format": "SUMMARY",
+                                                                       "partial_unexpected_count": 5}
+    assert validate_data.resolve_result_format(10 ** 6, {**result_config, "result_format": "BASIC"})[
+        "result_format"] == "BASIC"
+
+
+def test_report_keeps_exact_counts_but_bounded_examples(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.read_csv(SAMPLE_CSV)
+    df["AQ"] = -1  # every row out of range
+    config = load_config()
+    config["report_sink"] = {"backend": "files"}
+    config["ge_validation"] = {"result_format": "COMPLETE", "complete_row_limit": 10, "max_unexpected_examples": 3}
+
+    report = validate_data.validate_data.fn(df, config)
+
+    [aq] = [failure for failure in report["failed_expectations"]
+            if failure["column"] == "AQ" and failure["expectation_type"] == "expect_column_values_to_be_between"]
+    assert aq["failed_count"] == len(df)
+    assert len(aq["details"]["partial_unexpected_list"]) <= 3
+    assert "unexpected_list" not in aq["details"]
+    assert report["report_id"]
+
+
+def test_per_row_lists_are_capped_and_flagged():
+    results = {"results": [{"success": False, "result": {"unexpected_count": 10, "unexpected_list": list(range(10)),
+                                                         "partial_unexpected_list": [0, 1]}}]}
+
+    details = validate_data.bound_validation_results(results, 3)["results"][0]["result"]
+    assert details["unexpected_list"] == [0, 1, 2] and details["unexpected_list_truncated"] is True
+    assert details["partial_unexpected_list"] == [0, 1] and "partial_unexpected_list_truncated" not in details
+    assert details["unexpected_count"] == 10
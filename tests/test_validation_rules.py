@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.tasks.Validate import rules_for, validate_sensor_data
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_override_adding_a_column_without_a_type():
+    df = pd.read_csv(SAMPLE_CSV)
+    df["Humidity"] = 150.0
+    df["Shift"] = "night"
+    config = {"validation_rules": {"Humidity": {"min_value": 0, "max_value": 100},
+                                   "Shift": {"allowed_values": ["day", "night"]}}}
+
+    rules = rules_for(config)
+    assert rules["Humidity"]["type"] == "numeric" and rules["Shift"]["type"] == "categorical"
+    assert rules["Temperature"] == rules_for()["Temperature"]
+
+    results = validate_sensor_data.fn(df, config)
+    assert results["column_stats"]["Humidity"]["invalid_count"] == len(df)
+    assert results["column_stats"]["Shift"]["invalid_count"] == 0
+    assert any("Humidity" in error and "above maximum 100" in error for error in results["errors"])
+
+
+@pytest.mark.parametrize("override, message", [
+    ({"Shift": {"type": "text"}}, "unknown type"),
+    ({"Shift": {"type": "categorical"}}, "needs 'allowed_values'"),
+])
+def test_override_that_cannot_be_applied_is_rejected(override, message):
+    with pytest.raises(ValueError, match=message):
+        rules_for({"validation_rules": override})
@@ -0,0 +1,32 @@
+import os
+import shutil
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prefect_flows.utils.config import load_config
+from src.triggers.worker_pool import WarmWorkerPool
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'landing', 'data1.csv')
+
+
+def test_workers_run_flows_with_the_pools_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("data", "landing"))
+    file_path = os.path.join("data", "landing", "sensors.csv")
+    shutil.copy(SAMPLE_CSV, file_path)
+    config = load_config()
+    # Only the pool's config rejects these readings; a worker loading its own would pass them
+    config["validation_rules"] = {"Temperature": {"min_value": 100, "max_value": 200}}
+    config["job_store"] = {"db_path": str(tmp_path / "jobs.db")}
+
+    pool = WarmWorkerPool(workers=1, on_result=lambda result: None, config=config).start()
+    try:
+        job_id = pool.submit(file_path)
+        result = pool.wait([job_id], timeout=120)[job_id]
+    finally:
+        pool.stop()
+
+    assert result["status"] == "success"
+    assert result["validation"]["success"] is False
+    assert pool.job_store.list()[0]["validation_status"] == "FAIL"